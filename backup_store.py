@@ -0,0 +1,237 @@
+"""
+Content-addressed backup store for the vehicle pages.
+Each backup is split into content-defined chunks (boundaries depend only on the
+text, so the header/footer boilerplate shared by every page chunks identically).
+Chunks are stored once per sha256 in a single pack file, compressed with zstd
+when the zstandard package is installed, gzip otherwise. An index records, per page,
+every version by timestamp, so disk usage grows with changed bytes rather than
+with pages x runs.
+
+Usage:
+  python backup_store.py list [PAGE]
+  python backup_store.py restore PAGE [--at TIMESTAMP] [--output PATH]
+  python backup_store.py import        # import legacy backups/*_backup_*.html copies
+  python backup_store.py stats
+"""
+
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STORE_DIR = "backups/store"
+INDEX_VERSION = 1
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# A chunk ends after a line whose crc32 has these bits clear (~1 line in 32),
+# or once it reaches MAX_CHUNK_SIZE bytes
+CHUNK_MASK = 0x1F
+MAX_CHUNK_SIZE = 16 * 1024
+
+LEGACY_BACKUP_PATTERN = re.compile(r'^(?P<stem>.+)_backup_(?P<timestamp>\d{8}_\d{6})\.html$')
+
+
+def split_chunks(data):
+    """Split bytes into content-defined chunks on line boundaries."""
+    chunks = []
+    start = 0
+    position = 0
+    while position < len(data):
+        end = data.find(b'\n', position)
+        end = len(data) if end == -1 else end + 1
+        if zlib.crc32(data[position:end]) & CHUNK_MASK == 0 or end - start >= MAX_CHUNK_SIZE:
+            chunks.append(data[start:end])
+            start = end
+        position = end
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+class BackupStore:
+    def __init__(self, root):
+        self.root = Path(root) / STORE_DIR
+        self.pack_path = self.root / "objects.pack"
+        self.index_path = self.root / "index.json"
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        if index.get('version') != INDEX_VERSION:
+            index = {'version': INDEX_VERSION, 'pages': {}, 'objects': {}, 'imported': []}
+        # Lookups rely on each page's versions being in timestamp order
+        for versions in index['pages'].values():
+            versions.sort(key=lambda v: v['timestamp'])
+        return index
+
+    def save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    # -- objects -------------------------------------------------------------
+    # Chunks are appended to a single pack file (no per-file block overhead); the
+    # index maps each chunk's sha256 to [offset, length, codec] within the pack.
+
+    def _put_object(self, chunk):
+        digest = hashlib.sha256(chunk).hexdigest()
+        if digest in self.index['objects']:
+            return digest
+        if zstandard is not None:
+            codec, payload = 'zst', zstandard.ZstdCompressor(level=19).compress(chunk)
+        else:
+            codec, payload = 'gz', gzip.compress(chunk, compresslevel=9, mtime=0)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.pack_path, 'ab') as f:
+            offset = f.tell()
+            f.write(payload)
+        self.index['objects'][digest] = [offset, len(payload), codec]
+        return digest
+
+    def _get_object(self, digest):
+        offset, length, codec = self.index['objects'][digest]
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            payload = f.read(length)
+        if codec == 'gz':
+            return gzip.decompress(payload)
+        if zstandard is None:
+            raise RuntimeError(f"Backup object {digest} is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(payload)
+
+    # -- versions ------------------------------------------------------------
+
+    def versions(self, page):
+        """All backups of a page, oldest first."""
+        return self.index['pages'].get(page, [])
+
+    def pages(self):
+        return sorted(self.index['pages'])
+
+    def save(self, page, content, timestamp=None):
+        """
+        Store a backup of `page`. Returns the version entry, or the existing latest
+        entry if the content is unchanged since the last backup. Call save_index()
+        once after a batch of saves.
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        versions = self.index['pages'].setdefault(page, [])
+        if versions and versions[-1]['sha256'] == digest:
+            return versions[-1]
+
+        entry = {
+            'timestamp': timestamp or datetime.now().strftime(TIMESTAMP_FORMAT),
+            'sha256': digest,
+            'size': len(data),
+            'chunks': [self._put_object(chunk) for chunk in split_chunks(data)],
+        }
+        versions.append(entry)
+        versions.sort(key=lambda v: v['timestamp'])
+        return entry
+
+    def oldest(self, page):
+        versions = self.versions(page)
+        return versions[0] if versions else None
+
+    def find(self, page, at=None):
+        """The newest version of `page` taken at or before `at` (default: the newest overall)."""
+        versions = self.versions(page)
+        if at is None:
+            return versions[-1] if versions else None
+        # versions are kept sorted by timestamp, and timestamps sort lexically
+        position = bisect.bisect_right([v['timestamp'] for v in versions], at)
+        return versions[position - 1] if position else None
+
+    def read(self, version):
+        data = b"".join(self._get_object(digest) for digest in version['chunks'])
+        if hashlib.sha256(data).hexdigest() != version['sha256']:
+            raise ValueError(f"Backup taken at {version['timestamp']} is corrupt (hash mismatch)")
+        return data.decode('utf-8')
+
+    def import_legacy(self, backup_dir):
+        """Import plain `<stem>_backup_<timestamp>.html` copies not yet in the store. Returns the count."""
+        imported = set(self.index['imported'])
+        count = 0
+        for path in sorted(Path(backup_dir).glob("*_backup_*.html")):
+            match = LEGACY_BACKUP_PATTERN.match(path.name)
+            if not match or path.name in imported:
+                continue
+            with open(path, 'rb') as f:
+                self.save(f"{match.group('stem')}.html", f.read(), match.group('timestamp'))
+            imported.add(path.name)
+            count += 1
+        self.index['imported'] = sorted(imported)
+        return count
+
+    def stats(self):
+        logical = sum(v['size'] for versions in self.index['pages'].values() for v in versions)
+        stored = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+        return {'logical_bytes': logical, 'stored_bytes': stored, 'objects': len(self.index['objects'])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content-addressed backup store for vehicle pages.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    list_cmd = sub.add_parser('list', help="list backed-up pages, or the versions of one page")
+    list_cmd.add_argument('page', nargs='?')
+    restore_cmd = sub.add_parser('restore', help="write a backed-up version of a page")
+    restore_cmd.add_argument('page')
+    restore_cmd.add_argument('--at', help="newest version at or before this timestamp (YYYYmmdd_HHMMSS)")
+    restore_cmd.add_argument('--output', help="where to write the page (default: the page itself)")
+    sub.add_parser('import', help="import legacy *_backup_*.html copies from backups/")
+    sub.add_parser('stats', help="show logical vs. stored size")
+    args = parser.parse_args(argv)
+
+    script_dir = Path(__file__).parent
+    store = BackupStore(script_dir)
+
+    if args.command == 'list':
+        if args.page:
+            for version in store.versions(args.page):
+                print(f"{version['timestamp']}  {version['size']:>8} bytes  {version['sha256'][:12]}")
+        else:
+            for page in store.pages():
+                versions = store.versions(page)
+                print(f"{page}: {len(versions)} versions, latest {versions[-1]['timestamp']}")
+    elif args.command == 'restore':
+        version = store.find(args.page, args.at)
+        if version is None:
+            print(f"No backup of {args.page} found" + (f" at or before {args.at}" if args.at else ""))
+            sys.exit(1)
+        output = Path(args.output) if args.output else script_dir / args.page
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            f.write(store.read(version))
+        print(f"Restored {args.page} from {version['timestamp']} to {output}")
+    elif args.command == 'import':
+        count = store.import_legacy(script_dir / "backups")
+        store.save_index()
+        print(f"Imported {count} legacy backups")
+    elif args.command == 'stats':
+        stats = store.stats()
+        print(f"Pages: {len(store.pages())}")
+        print(f"Objects: {stats['objects']}")
+        print(f"Logical size: {stats['logical_bytes']:,} bytes")
+        print(f"Stored size: {stats['stored_bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,25 @@ Automated batch update script for vehicle detail pages.
 This script updates all vehicle pages to match the reference design while preserving vehicle-specific data.
 """
 
+import argparse
+import functools
 import os
 import re
+import sys
 from pathlib import Path
-from datetime import datetime
+
+import backup_store
+import build_manifest
+import css_bundle
+import page_writer
+import vehicle_catalog
 
 # Reference file with the correct design
 REFERENCE_FILE = "vehicle-toyota-alphard-2020-sale.html"
 
+# Hashes of what each page was last rendered from (see build_manifest.py)
+MANIFEST_FILE = "build/batch-update-manifest.json"
+
 # Files that need updating
 FILES_TO_UPDATE = [
     "vehicle-bmw-5-series-2014.html",
@@ -58,38 +69,27 @@ def read_file(filepath):
         print(f"Error reading {filepath}: {e}")
         return None
 
-def write_file(filepath, content):
-    """Write content to file."""
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    except Exception as e:
-        print(f"Error writing {filepath}: {e}")
-        return False
-
-def extract_vehicle_info(content, filename):
-    """Extract vehicle-specific information from the old file."""
+def extract_vehicle_info(record):
+    """Build the vehicle-specific information from the page's catalog record."""
+    filename = record.filename
     info = {
         'filename': filename,
         'vehicle_name': '',
         'year': '',
         'model': '',
-        'price': '',
-        'mileage': '',
-        'images': [],
-        'specs': {}
+        'price': record.price,
+        'mileage': record.mileage,
+        'images': [img.replace('images/vehicles/', '', 1) for img in record.images[:4]],
+        'specs': dict(record.quick_specs)
     }
     
-    # Extract title
-    title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE)
-    if title_match:
-        title = title_match.group(1)
-        # Try to extract vehicle name from title
+    # Extract vehicle name from title
+    title = record.title
+    if title:
         parts = title.split('-')[0].strip() if '-' in title else title.split('|')[0].strip()
         info['vehicle_name'] = parts
     
-    # Extract year from filename or content
+    # Extract year from filename
     year_match = re.search(r'20\d{2}', filename)
     if year_match:
         info['year'] = year_match.group(0)
@@ -99,95 +99,97 @@ def extract_vehicle_info(content, filename):
     if len(model_parts) >= 2:
         info['model'] = ' '.join(model_parts[:-1]).title()
     
-    # Extract price
-    price_match = re.search(r'\$[\d,]+|\bUSD\s*[\d,]+|ZMW\s*[\d,]+|K[\d,]+', content)
-    if price_match:
-        info['price'] = price_match.group(0)
-    
-    # Extract mileage
-    mileage_match = re.search(r'([\d,]+)\s*km', content, re.IGNORECASE)
-    if mileage_match:
-        info['mileage'] = mileage_match.group(1)
-    
-    # Extract image paths
-    img_matches = re.findall(r'images/vehicles/([^"\']+\.(?:jpg|jpeg|png|webp))', content, re.IGNORECASE)
-    if img_matches:
-        info['images'] = list(set(img_matches))[:4]  # Get up to 4 unique images
-    
     return info
 
+class ReferenceTemplate:
+    """
+    The reference page split once into static text and the slots the batch update
+    rewrites (title, meta description, breadcrumb, h1). A single precompiled regex
+    finds every slot, so filling a page is one join instead of a re.sub per field.
+    A reference page without one of the SLOTS raises ValueError, rather than
+    leaving that field of every page as the reference's.
+    """
+    SLOTS = ('title', 'description', 'breadcrumb', 'heading')
+    SLOT_PATTERN = re.compile(
+        r'(?P<title>(?i:<title>.*?</title>))'
+        # The description meta in either attribute order, possibly across lines
+        r'|(?P<description>(?i:<meta\b(?=[^>]*\bname="description")[^>]*>))'
+        r'|(?P<breadcrumb><span class="text-navy font-medium">.*?</span>)'
+        # The vehicle title, whatever its size and colour classes; the logo's h1 has no mb-2
+        r'|(?P<heading><h1\b[^>]*\bclass="(?=[^"]*\bfont-heading\b)(?=[^"]*\bmb-2\b)[^"]*"[^>]*>).*?</h1>',
+        re.DOTALL)
+    CONTENT_PATTERN = re.compile(r'\bcontent="[^"]*"', re.IGNORECASE)
+
+    def __init__(self, reference_content):
+        self._segments = []
+        self._slots = []
+        position = 0
+        for match in self.SLOT_PATTERN.finditer(reference_content):
+            self._segments.append(reference_content[position:match.start()])
+            self._slots.append((match.lastgroup, match.group(0), match.group('heading')))
+            position = match.end()
+        self._segments.append(reference_content[position:])
+        missing = [slot for slot in self.SLOTS if slot not in {name for name, _, _ in self._slots}]
+        if missing:
+            raise ValueError(f"reference page has no {', '.join(missing)} slot")
+
+    def render(self, vehicle_info):
+        name = vehicle_info['vehicle_name']
+        model = vehicle_info['model']
+        replacements = {}
+        if name:
+            replacements['title'] = f"<title>{name} - Zamto Africa | Japanese Imported Vehicles Zambia</title>"
+            replacements['breadcrumb'] = f'<span class="text-navy font-medium">{name}</span>'
+
+        out = [self._segments[0]]
+        for (slot, original, open_tag), segment in zip(self._slots, self._segments[1:]):
+            if slot == 'description' and name:
+                # Only the content changes, so the tag keeps its attribute order
+                out.append(self.CONTENT_PATTERN.sub(
+                    lambda m: f'content="{name} available at Zamto Africa Company Ltd."', original, count=1))
+            elif slot == 'heading' and model:
+                out.append(f'{open_tag}{model}</h1>')
+            else:
+                out.append(replacements.get(slot, original))
+            out.append(segment)
+        return "".join(out)
+
+@functools.lru_cache(maxsize=4)
+def compile_reference(reference_content):
+    return ReferenceTemplate(reference_content)
+
 def update_file_with_template(old_filepath, reference_content, vehicle_info):
     """Update a file using the reference template and vehicle-specific data."""
     
-    # Read the old content to preserve any unique data
-    old_content = read_file(old_filepath)
-    if not old_content:
+    # Nothing of the old page is kept; an empty one is left alone (the backup has already read it)
+    if os.path.getsize(old_filepath) == 0:
         return False
     
-    # Start with reference content
-    new_content = reference_content
-    
-    # Update title
-    if vehicle_info['vehicle_name']:
-        new_title = f"{vehicle_info['vehicle_name']} - Zamto Africa | Japanese Imported Vehicles Zambia"
-        new_content = re.sub(
-            r'<title>.*?</title>',
-            f'<title>{new_title}</title>',
-            new_content,
-            flags=re.IGNORECASE
-        )
-    
-    # Update meta description
-    if vehicle_info['vehicle_name']:
-        new_desc = f"{vehicle_info['vehicle_name']} available at Zamto Africa Company Ltd."
-        new_content = re.sub(
-            r'<meta name="description" content=".*?"',
-            f'<meta name="description" content="{new_desc}"',
-            new_content,
-            flags=re.IGNORECASE
-        )
-    
-    # Update breadcrumb
-    if vehicle_info['vehicle_name']:
-        new_content = re.sub(
-            r'<span class="text-navy font-medium">.*?</span>',
-            f'<span class="text-navy font-medium">{vehicle_info["vehicle_name"]}</span>',
-            new_content
-        )
-    
-    # Update vehicle name in h1
-    if vehicle_info['model']:
-        new_content = re.sub(
-            r'<h1 class="text-2xl md:text-3xl lg:text-4xl font-black font-heading text-navy mb-2">.*?</h1>',
-            f'<h1 class="text-2xl md:text-3xl lg:text-4xl font-black font-heading text-navy mb-2">{vehicle_info["model"]}</h1>',
-            new_content
-        )
-    
     # Note: Image paths and detailed specs would need manual review
     # This script provides the structure; specific vehicle data should be verified
     
-    return new_content
+    return compile_reference(reference_content).render(vehicle_info)
 
-def create_backup(filepath):
-    """Create a backup of the original file."""
-    backup_dir = Path(filepath).parent / "backups"
-    backup_dir.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = backup_dir / f"{Path(filepath).stem}_backup_{timestamp}.html"
-    
+def create_backup(store, filepath):
+    """Back up the original file into the deduplicating backup store."""
     try:
         content = read_file(filepath)
         if content:
-            write_file(backup_path, content)
+            store.save(Path(filepath).name, content)
             return True
     except Exception as e:
         print(f"Error creating backup: {e}")
     return False
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch update vehicle pages to the reference design.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only update pages whose content, reference file or script changed since the last run")
+    args = parser.parse_args(argv)
+    
     script_dir = Path(__file__).parent
     reference_path = script_dir / REFERENCE_FILE
+    manifest_path = script_dir / MANIFEST_FILE
     
     print("=" * 70)
     print("VEHICLE DETAIL PAGES - BATCH UPDATE SCRIPT")
@@ -208,60 +210,103 @@ def main():
         print("ERROR: Could not read reference file!")
         return
     print("[OK] Reference file loaded")
+    # Link the built CSS bundle in place of the Tailwind CDN script, if css_bundle.py has been run
+    bundle = css_bundle.current_bundle(script_dir)
+    if bundle:
+        reference_content = css_bundle.link_stylesheet(reference_content, bundle)
+    try:
+        compile_reference(reference_content)
+    except ValueError as e:
+        print(f"ERROR: {REFERENCE_FILE}: {e}")
+        sys.exit(1)
+    
+    deps_hash = build_manifest.combine_hashes(
+        build_manifest.hash_file(reference_path),
+        build_manifest.hash_file(__file__),
+        build_manifest.hash_file(vehicle_catalog.__file__),
+        bundle or "",
+    )
+    manifest = build_manifest.load_manifest(manifest_path)
+    store = backup_store.BackupStore(script_dir)
     
     # Process each file
     updated_count = 0
     failed_count = 0
     skipped_count = 0
+    unchanged_count = 0
     
-    print(f"\nProcessing {len(FILES_TO_UPDATE)} files...")
-    print("-" * 70)
-    
+    files_to_process = []
     for filename in FILES_TO_UPDATE:
         filepath = script_dir / filename
         
         if not filepath.exists():
             print(f"[SKIP] {filename} - File not found")
             skipped_count += 1
-            continue
+        elif args.incremental and build_manifest.is_up_to_date(
+                manifest, filename, build_manifest.hash_file(filepath), deps_hash):
+            unchanged_count += 1
+        else:
+            files_to_process.append(filename)
+    
+    # Parse every page once up front (cached pages are not re-parsed)
+    print("Loading vehicle catalog...")
+    catalog = vehicle_catalog.load_catalog(script_dir, files_to_process)
+    print(f"[OK] {len(catalog)} vehicles catalogued")
+    
+    print(f"\nProcessing {len(files_to_process)} files...")
+    print("-" * 70)
+    
+    # Pages are staged and moved into place together at the end of the run
+    with page_writer.PageWriter(script_dir) as writer:
+        for filename in files_to_process:
+            filepath = script_dir / filename
         
-        print(f"\nProcessing: {filename}")
+            print(f"\nProcessing: {filename}")
         
-        # Create backup
-        print("  - Creating backup...", end=" ")
-        if create_backup(filepath):
-            print("[OK]")
-        else:
-            print("[FAILED]")
-            failed_count += 1
-            continue
+            # Create backup
+            print("  - Creating backup...", end=" ")
+            if create_backup(store, filepath):
+                print("[OK]")
+            else:
+                print("[FAILED]")
+                failed_count += 1
+                continue
         
-        # Extract vehicle info
-        print("  - Extracting vehicle data...", end=" ")
-        old_content = read_file(filepath)
-        vehicle_info = extract_vehicle_info(old_content, filename)
-        print(f"[OK] ({vehicle_info['vehicle_name']})")
+            # Extract vehicle info
+            print("  - Extracting vehicle data...", end=" ")
+            vehicle_info = extract_vehicle_info(catalog[filename])
+            print(f"[OK] ({vehicle_info['vehicle_name']})")
         
-        # Update file
-        print("  - Applying template...", end=" ")
-        new_content = update_file_with_template(filepath, reference_content, vehicle_info)
+            # Update file
+            print("  - Applying template...", end=" ")
+            new_content = update_file_with_template(filepath, reference_content, vehicle_info)
         
-        if new_content and write_file(filepath, new_content):
-            print("[OK]")
-            updated_count += 1
-        else:
-            print("[FAILED]")
-            failed_count += 1
+            if new_content:
+                writer.write(filepath, new_content)
+                print("[OK]")
+                updated_count += 1
+                build_manifest.record_output(manifest, filename, deps_hash,
+                                             build_manifest.hash_bytes(page_writer.encode(new_content)))
+            else:
+                print("[FAILED]")
+                failed_count += 1
+        
+        # Backups must be recorded before any page is replaced
+        store.save_index()
+    
+    build_manifest.save_manifest(manifest_path, manifest)
     
     # Summary
     print("\n" + "=" * 70)
     print("BATCH UPDATE COMPLETE")
     print("=" * 70)
     print(f"\nResults:")
-    print(f"  Successfully updated: {updated_count} files")
+    print(f"  Successfully updated: {updated_count} files ({len(writer.unchanged)} already matched the template)")
     print(f"  Failed: {failed_count} files")
     print(f"  Skipped (not found): {skipped_count} files")
-    print(f"\nBackups saved in: {script_dir / 'backups'}")
+    if args.incremental:
+        print(f"  Unchanged since last run: {unchanged_count} files")
+    print(f"\nBackups saved in: {store.root}")
     print("\nIMPORTANT: Please review the updated files to ensure:")
     print("  - Vehicle-specific images are correct")
     print("  - Prices and specifications are accurate")
@@ -0,0 +1,58 @@
+"""
+Benchmark for the HTML parser backends.
+Extracts vehicle data from every page in the site root and backups/ with each
+installed backend and prints the parse+extract time per backend. That every
+backend extracts the same data as html.parser is checked by
+tests/test_parser_backends.py.
+
+Usage:
+  python bench_parser_backends.py
+"""
+
+import time
+from pathlib import Path
+
+import parser_backend
+import vehicle_catalog
+
+# The baseline the speedups are measured against
+REFERENCE_BACKEND = 'html.parser'
+
+
+def get_pages(script_dir):
+    pages = [script_dir / f for f in vehicle_catalog.get_vehicle_files(script_dir)]
+    backup_dir = script_dir / "backups"
+    if backup_dir.exists():
+        pages += sorted(backup_dir.glob("*.html"))
+    return pages
+
+
+def extract_all(pages, contents, backend):
+    start = time.perf_counter()
+    for page in pages:
+        vehicle_catalog.parse_vehicle_page(contents[page], page.name, backend)
+    return time.perf_counter() - start
+
+
+def main():
+    script_dir = Path(__file__).parent
+    pages = get_pages(script_dir)
+    contents = {}
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            contents[page] = f.read()
+
+    backends = parser_backend.available_backends()
+    print(f"Timing {len(backends)} parser backends on {len(pages)} pages...")
+    print("=" * 60)
+
+    times = {backend: extract_all(pages, contents, backend) for backend in backends}
+    print(f"  {'backend':<14}{'total s':>10}{'ms/page':>10}{'speedup':>10}")
+    for backend, elapsed in times.items():
+        print(f"  {backend:<14}{elapsed:>10.2f}{elapsed / len(pages) * 1000:>10.2f}"
+              f"{times[REFERENCE_BACKEND] / elapsed:>9.1f}x")
+    print(f"\nDefault backend: {parser_backend.get_backend()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Content-hash manifest for the page-rewriting scripts.
+Records, per page, the hash of the inputs it was rendered from (template and
+script) and the hash of the output that was written, so an incremental run
+can skip pages that are already up to date without parsing them.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(filepath):
+    """sha256 of a file's bytes, or '' if it cannot be read."""
+    try:
+        with open(filepath, 'rb') as f:
+            return hash_bytes(f.read())
+    except OSError:
+        return ''
+
+
+def combine_hashes(*hashes):
+    """Fold several input hashes into one dependency hash."""
+    return hash_bytes('\0'.join(hashes))
+
+
+def load_manifest(manifest_path):
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        manifest = {'version': MANIFEST_VERSION, 'pages': {}}
+    return manifest
+
+
+def save_manifest(manifest_path, manifest):
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def is_up_to_date(manifest, filename, page_hash, deps_hash):
+    """True if the page still holds what we last wrote and its inputs are unchanged."""
+    entry = manifest['pages'].get(filename)
+    return bool(entry) and entry['deps'] == deps_hash and entry['output'] == page_hash
+
+
+def record_output(manifest, filename, deps_hash, output_hash):
+    manifest['pages'][filename] = {'deps': deps_hash, 'output': output_hash}
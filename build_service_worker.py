@@ -0,0 +1,170 @@
+"""
+Service-worker precache manifest.
+Hashes every deployable page, stylesheet, script and data file in the site root,
+the shared site images and the small responsive image variants, and writes the
+list of (url, revision) pairs into service-worker.js between the
+@generated:precache-manifest markers. The cache name is derived from the digest
+of that list, so it changes exactly when some precached asset changes; the
+worker copies entries whose revision is unchanged out of the previous cache
+instead of refetching them.
+
+The same block carries the runtime route table (ROUTES below): which URL paths
+use which caching strategy, with their cache limits. Every route is checked
+against the files actually in the site, so a pattern that no longer matches
+anything fails the build instead of silently doing nothing.
+
+Run it last, after the scripts that rewrite pages, images or vehicle-data.json.
+
+Usage:
+  python build_service_worker.py            # update service-worker.js
+  python build_service_worker.py --list     # also print the manifest entries
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import build_manifest
+import image_pipeline
+from page_writer import PageWriter
+
+SERVICE_WORKER_FILE = "service-worker.js"
+START_MARKER = "// @generated:precache-manifest"
+END_MARKER = "// @end:precache-manifest"
+
+PAGE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg')
+SITE_IMAGES = ('logo.png', 'favicon.ico', 'Back-ground-image.jpg')
+
+# Root files that are not part of the live site (drafts, backups, internal docs, the unlinked
+# vehicle-details.html, the unloaded zamto-africa-script.js); build_sitemap.py and minify_site.py
+# leave out the same pages
+EXCLUDE_PATTERNS = (
+    SERVICE_WORKER_FILE, 'inventory-listing.json', 'test-*.html', '*backup*', '*-old.html',
+    'temp_*.html', 'new_vehicle_grid.html', '*-summary.html', '*-enhancements.html',
+    '*-documentation.html', '*-plan.html', 'vehicle-details.html', 'zamto-africa-script.js',
+)
+
+# Variants up to this width (thumbnails and cards) are precached; larger ones are cached on demand
+PRECACHE_MAX_WIDTH = 320
+
+# Runtime caching per URL path, first match wins (patterns must also be valid JavaScript regexes).
+# Precached files outside these routes are served straight from the precache.
+#   stale-while-revalidate  cached copy at once, refreshed from the network for the next visit
+#   network-first           network, falling back to the cached copy when offline or after `timeout` ms
+#   cache-first             cached copy if present; an LRU bounded by `maxEntries` and `maxBytes`
+ROUTES = (
+    {'pattern': r'^/(?:vehicle-[^/]+|inventory)\.html$', 'strategy': 'stale-while-revalidate', 'cache': 'pages'},
+    {'pattern': r'^/contact\.html$', 'strategy': 'network-first', 'cache': 'pages', 'timeout': 4000},
+    {'pattern': r'^/images/vehicles/', 'strategy': 'cache-first', 'cache': 'images',
+     'maxEntries': 120, 'maxBytes': 30 * 1024 * 1024},
+)
+STRATEGIES = ('stale-while-revalidate', 'network-first', 'cache-first')
+
+# Revisions are truncated sha256 digests; 16 hex digits is plenty to tell versions apart
+REVISION_LENGTH = 16
+
+SITE_ROOT = Path(__file__).parent
+
+
+def _excluded(name):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDE_PATTERNS)
+
+
+def precache_files(root=SITE_ROOT):
+    """Site-relative paths of every file to precache, sorted."""
+    root = Path(root)
+    files = [p.name for p in root.iterdir()
+             if p.is_file() and p.suffix.lower() in PAGE_EXTENSIONS and not _excluded(p.name)]
+    files += [name for name in SITE_IMAGES if (root / name).is_file()]
+    for entry in image_pipeline.load_manifest(root)['images'].values():
+        files += [v['path'] for v in entry['variants']
+                  if v['width'] <= PRECACHE_MAX_WIDTH and v['path'].startswith(image_pipeline.VARIANT_DIR + '/')]
+    return sorted(set(files))
+
+
+def site_paths(root=SITE_ROOT):
+    """URL path of every file under the site root (hidden directories and backups/ skipped)."""
+    root = Path(root)
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(('.', '_')) and d not in ('backups', 'build')]
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        prefix = "/" if rel_dir == "." else f"/{rel_dir}/"
+        paths += [prefix + quote(name) for name in filenames]
+    return sorted(paths)
+
+
+def check_routes(routes, paths):
+    """Number of site paths each route handles (first match wins). Raises ValueError for a route that handles none."""
+    counts = [0] * len(routes)
+    compiled = [re.compile(route['pattern']) for route in routes]
+    for path in paths:
+        for i, regex in enumerate(compiled):
+            if regex.search(path):
+                counts[i] += 1
+                break
+    for route, count in zip(routes, counts):
+        if route['strategy'] not in STRATEGIES:
+            raise ValueError(f"Route {route['pattern']}: unknown strategy {route['strategy']!r}")
+        if count == 0:
+            raise ValueError(f"Route {route['pattern']} matches no file in the site")
+    return counts
+
+
+def build_precache_manifest(root=SITE_ROOT):
+    """[(url, revision), ...] for the precached files, plus the digest of the whole list."""
+    root = Path(root)
+    entries = [("/" + quote(path), build_manifest.hash_file(root / path)[:REVISION_LENGTH])
+               for path in precache_files(root)]
+    digest = build_manifest.hash_bytes(json.dumps(entries))
+    return entries, digest
+
+
+def render_manifest(entries, digest, routes=ROUTES):
+    lines = [f"const PRECACHE_VERSION = '{digest[:REVISION_LENGTH]}';", "const PRECACHE_MANIFEST = ["]
+    lines += [f"  ['{url}', '{revision}']," for url, revision in entries]
+    lines += ["];", "const ROUTES = ["]
+    lines += [f"  {json.dumps(route)}," for route in routes]
+    lines.append("];")
+    return "\n".join(lines) + "\n"
+
+
+def update_service_worker(content, entries, digest, routes=ROUTES):
+    """service-worker.js source with the generated block replaced."""
+    start = content.find(START_MARKER)
+    end = content.find(END_MARKER, start)
+    if start == -1 or end == -1:
+        raise ValueError(f"{SERVICE_WORKER_FILE} is missing the {START_MARKER} / {END_MARKER} markers")
+    end_line = content.rfind('\n', 0, end) + 1
+    return content[:start + len(START_MARKER)] + "\n" + render_manifest(entries, digest, routes) + content[end_line:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the precache manifest and route table into service-worker.js.")
+    parser.add_argument('--list', action='store_true', help="print every precached URL with its revision")
+    args = parser.parse_args(argv)
+
+    route_counts = check_routes(ROUTES, site_paths(SITE_ROOT))
+    entries, digest = build_precache_manifest(SITE_ROOT)
+    sw_path = SITE_ROOT / SERVICE_WORKER_FILE
+    content = update_service_worker(sw_path.read_text(encoding='utf-8'), entries, digest)
+
+    with PageWriter(SITE_ROOT) as writer:
+        changed = writer.write(sw_path, content)
+
+    if args.list:
+        for url, revision in entries:
+            print(f"  {revision}  {url}")
+    total_bytes = sum((SITE_ROOT / unquote(url.lstrip('/'))).stat().st_size for url, _ in entries)
+    print(f"Precache manifest: {len(entries)} files, ~{total_bytes / 1e6:.1f} MB, version {digest[:REVISION_LENGTH]}")
+    for route, count in zip(ROUTES, route_counts):
+        print(f"  {route['strategy']:<22} {route['pattern']:<40} {count} files")
+    print(f"  {SERVICE_WORKER_FILE} {'updated' if changed else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+sitemap.xml for every live page.
+Lists each HTML page in the site root that is not a draft, backup or internal
+doc (the same exclusions as the service-worker precache), skipping pages whose
+<link rel="canonical"> points at another page. URLs are built on the domain in
+CNAME.
+
+<lastmod> is the date the page's content last changed. The content hash covers
+the title, meta description, visible text, links and images, but not the
+asset links, inline styles or scripts, so a new CSS bundle hash does not make
+every page look new. Hashes and dates are kept in build/sitemap-state.json.
+That file is not committed, so a page without a recorded hash is dated from its
+git history instead: the commit since which its content hash has been the one
+it has now, however many commits touched only its markup after that (or today
+when the current content is not committed yet, or outside a checkout).
+
+Up to URLS_PER_SITEMAP URLs go into sitemap.xml itself. Beyond that the pages
+are split into sitemap-1.xml, sitemap-2.xml, ... and sitemap.xml becomes a
+sitemap index pointing at them, so robots.txt never needs to change.
+
+Usage:
+  python build_sitemap.py                 # write sitemap.xml (and its parts)
+  python build_sitemap.py --list          # also print every URL with its lastmod
+  python build_sitemap.py --max-urls 20   # split into an index above 20 URLs
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import re
+import subprocess
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import quote, urlparse
+from xml.sax.saxutils import escape
+
+import build_manifest
+import build_service_worker
+from page_writer import PageWriter
+
+SITEMAP_FILE = "sitemap.xml"
+PART_FILE = "sitemap-{n}.xml"
+PART_PATTERN = re.compile(r'^sitemap-\d+\.xml$')
+STATE_FILE = "build/sitemap-state.json"
+STATE_VERSION = 1
+
+# The sitemaps protocol allows 50,000 URLs per file
+URLS_PER_SITEMAP = 50000
+
+# (file pattern, changefreq, priority), first match wins
+PAGE_RULES = (
+    ('index.html', 'weekly', '1.0'),
+    ('inventory.html', 'weekly', '0.9'),
+    ('vehicle-*.html', 'weekly', '0.8'),
+    ('blog.html', 'weekly', '0.7'),
+    ('blog-*.html', 'monthly', '0.6'),
+    ('contact.html', 'yearly', '0.6'),
+    ('*.html', 'monthly', '0.7'),
+)
+
+SKIPPED_ELEMENTS = ('script', 'style', 'noscript', 'template')
+
+SITE_ROOT = Path(__file__).parent
+
+
+class ContentParser(HTMLParser):
+    """What a crawler indexes: title, meta description, visible text, link targets and image sources."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.canonical = None
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in SKIPPED_ELEMENTS:
+            self._skipping += 1
+        elif tag == 'meta' and attrs.get('name') == 'description':
+            self.parts.append(f"description:{attrs.get('content', '')}")
+        elif tag == 'link' and attrs.get('rel') == 'canonical':
+            self.canonical = attrs.get('href')
+        elif tag == 'a' and attrs.get('href'):
+            self.parts.append(f"href:{attrs['href']}")
+        elif tag == 'img' and attrs.get('src'):
+            self.parts.append(f"src:{attrs['src']}")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_ELEMENTS and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            text = ' '.join(data.split())
+            if text:
+                self.parts.append(text)
+
+
+def parse_page(html):
+    """(content hash, canonical href or None) of a page."""
+    parser = ContentParser()
+    parser.feed(html)
+    parser.close()
+    return build_manifest.hash_bytes('\n'.join(parser.parts)), parser.canonical
+
+
+def site_url(root=SITE_ROOT):
+    cname = Path(root) / 'CNAME'
+    domain = cname.read_text(encoding='utf-8').strip() if cname.exists() else 'zamtoafrica.com'
+    return f"https://{domain}"
+
+
+def page_path(name):
+    return "/" if name == "index.html" else "/" + quote(name)
+
+
+def sitemap_pages(root=SITE_ROOT):
+    """Names of the live HTML pages in the site root, sorted."""
+    return sorted(p.name for p in Path(root).glob('*.html')
+                  if not any(fnmatch.fnmatch(p.name, pattern) for pattern in build_service_worker.EXCLUDE_PATTERNS))
+
+
+def page_rule(name):
+    return next((freq, priority) for pattern, freq, priority in PAGE_RULES if fnmatch.fnmatch(name, pattern))
+
+
+def load_state(root=SITE_ROOT):
+    try:
+        state = json.loads((Path(root) / STATE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        state = {}
+    if state.get('version') != STATE_VERSION:
+        state = {'version': STATE_VERSION, 'pages': {}}
+    return state
+
+
+def save_state(root, state):
+    path = Path(root) / STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=1, sort_keys=True) + "\n", encoding='utf-8')
+
+
+def content_change_date(root, name, digest):
+    """
+    Date of the commit that gave `name` the content hash `digest`, walking back
+    through the commits that touched it while its content stayed the same; None
+    when the committed page has other content or outside a git checkout.
+    """
+    try:
+        log = subprocess.run(['git', 'log', '--format=%H %cs', '--', name], cwd=root,
+                             capture_output=True, text=True, timeout=30).stdout.split('\n')
+        commits = [line.split() for line in log if line]
+        if not commits:
+            return None
+        blobs = subprocess.run(['git', 'cat-file', '--batch'], cwd=root, capture_output=True, timeout=120,
+                               input=''.join(f"{sha}:{name}\n" for sha, _ in commits).encode()).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    changed = None
+    for _, date in commits:
+        header, _, blobs = blobs.partition(b'\n')
+        if header.endswith(b' missing'):
+            break
+        size = int(header.split()[2])
+        html, blobs = blobs[:size], blobs[size + 1:]
+        if parse_page(html.decode('utf-8', errors='replace'))[0] != digest:
+            break
+        changed = date
+    return changed
+
+
+def collect_entries(root=SITE_ROOT, state=None, today=None):
+    """
+    [(name, path, lastmod, changefreq, priority), ...] for the sitemap, updating
+    `state` with each page's content hash and lastmod. Also returns the pages
+    left out because their canonical URL is another page.
+    """
+    root = Path(root)
+    state = state if state is not None else load_state(root)
+    today = today or datetime.date.today().isoformat()
+    entries, duplicates, seen = [], [], {}
+    for name in sitemap_pages(root):
+        digest, canonical = parse_page((root / name).read_text(encoding='utf-8', errors='replace'))
+        path = page_path(name)
+        if canonical and urlparse(canonical).path not in ('', path):
+            duplicates.append((name, canonical))
+            continue
+        recorded = state['pages'].get(name)
+        if recorded and recorded['hash'] == digest:
+            lastmod = recorded['lastmod']
+        elif recorded:
+            lastmod = today
+        else:
+            lastmod = content_change_date(root, name, digest) or today
+        seen[name] = {'hash': digest, 'lastmod': lastmod}
+        entries.append((name, path, lastmod) + page_rule(name))
+    state['pages'] = seen
+    return entries, duplicates
+
+
+def render_urlset(base_url, entries):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for _, path, lastmod, changefreq, priority in entries:
+        lines += ['  <url>',
+                  f'    <loc>{escape(base_url + path)}</loc>',
+                  f'    <lastmod>{lastmod}</lastmod>',
+                  f'    <changefreq>{changefreq}</changefreq>',
+                  f'    <priority>{priority}</priority>',
+                  '  </url>']
+    lines.append('</urlset>')
+    return "\n".join(lines) + "\n"
+
+
+def render_index(base_url, parts):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for name, lastmod in parts:
+        lines += ['  <sitemap>',
+                  f'    <loc>{escape(base_url + "/" + name)}</loc>',
+                  f'    <lastmod>{lastmod}</lastmod>',
+                  '  </sitemap>']
+    lines.append('</sitemapindex>')
+    return "\n".join(lines) + "\n"
+
+
+def build_sitemaps(base_url, entries, max_urls=URLS_PER_SITEMAP):
+    """{file name: xml}: one urlset, or an index plus one urlset per `max_urls` pages."""
+    if len(entries) <= max_urls:
+        return {SITEMAP_FILE: render_urlset(base_url, entries)}
+    files, parts = {}, []
+    for n, start in enumerate(range(0, len(entries), max_urls), 1):
+        chunk = entries[start:start + max_urls]
+        name = PART_FILE.format(n=n)
+        files[name] = render_urlset(base_url, chunk)
+        parts.append((name, max(lastmod for _, _, lastmod, _, _ in chunk)))
+    files[SITEMAP_FILE] = render_index(base_url, parts)
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write sitemap.xml with content-based lastmod dates.")
+    parser.add_argument('--list', action='store_true', help="print every URL with its lastmod")
+    parser.add_argument('--max-urls', type=int, default=URLS_PER_SITEMAP,
+                        help=f"URLs per sitemap file before splitting into an index (default: {URLS_PER_SITEMAP})")
+    args = parser.parse_args(argv)
+
+    state = load_state(SITE_ROOT)
+    previous = {name: page['lastmod'] for name, page in state['pages'].items()}
+    entries, duplicates = collect_entries(SITE_ROOT, state)
+    base_url = site_url(SITE_ROOT)
+    files = build_sitemaps(base_url, entries, args.max_urls)
+    stale = [p for p in SITE_ROOT.iterdir() if PART_PATTERN.match(p.name) and p.name not in files]
+
+    with PageWriter(SITE_ROOT) as writer:
+        for name, xml in files.items():
+            writer.write(name, xml)
+    for path in stale:
+        path.unlink()
+    save_state(SITE_ROOT, state)
+
+    if args.list:
+        for name, path, lastmod, _, _ in entries:
+            print(f"  {lastmod}  {base_url}{path}")
+    changed = sum(1 for name, _, lastmod, _, _ in entries if previous.get(name) not in (None, lastmod))
+    print(f"Sitemap: {len(entries)} URLs in {len(files)} file{'s' if len(files) > 1 else ''}"
+          f"{' (sitemap.xml is an index)' if len(files) > 1 else ''}")
+    print(f"  {changed} pages with new content since the last run, {len(writer.written)} files written")
+    for name, canonical in duplicates:
+        print(f"  Left out {name}: canonical URL is {canonical}")
+
+
+if __name__ == "__main__":
+    main()
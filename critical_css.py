@@ -0,0 +1,225 @@
+"""
+Critical CSS for the vehicle pages.
+Every vehicle page shares the layout of vehicle-subaru-forester-2019.html, so the
+CSS needed for its first screen (header and navigation, breadcrumbs, status
+banner, gallery, title, price and quick specs: everything above the
+<!-- Vehicle Tabs --> comment) is the same for all of them. This stage collects
+the class names used in that region of the template, leaving out subtrees that
+start hidden (the mobile menu), and generates preflight plus those utilities
+with css_bundle. The result is inlined as a <style data-critical> in place of
+the bundle's <link>, and the full bundle is loaded without blocking render:
+
+  <style data-critical="site.<hash>.css">...</style>
+  <link rel="preload" href="site.<hash>.css" as="style" onload="this.onload=null;this.rel='stylesheet'">
+  <noscript><link rel="stylesheet" href="site.<hash>.css"></noscript>
+
+Both sit where the bundle link was, so the cascade against the page's own
+<style> is unchanged once the bundle has loaded. Re-running replaces the block.
+
+A page only gets the block if its first screen is built like the template's:
+the same top-level elements before the fold, and no class there that the
+critical CSS lacks. Pages that differ are reported and keep the blocking link,
+since inlining the template's CSS would render them unstyled until the bundle
+arrives.
+
+Run it after css_bundle.py (and again whenever the bundle changes).
+
+Usage:
+  python critical_css.py            # inline critical CSS into every matching vehicle page
+  python critical_css.py --check    # report pages whose first screen differs; exit 1 if any
+"""
+
+import argparse
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+import css_bundle
+from page_writer import PageWriter
+
+TEMPLATE_FILE = "vehicle-subaru-forester-2019.html"
+PAGE_PATTERN = "vehicle-*.html"
+# Everything in <body> before this comment is on the first screen of a vehicle page
+FOLD_MARKER = "<!-- Vehicle Tabs -->"
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+# A responsive variant that shows an element the `hidden` class hides on small screens
+SHOWN_VARIANT_PATTERN = re.compile(r'^\w+:(?:block|flex|grid|inline|inline-block|inline-flex|table|contents)$')
+
+STYLESHEET_PATTERN = re.compile(r'<link\b(?=[^>]*\brel="stylesheet")[^>]*\bhref="site\.[0-9a-f]{10}\.css"[^>]*>')
+CRITICAL_STYLE_PATTERN = re.compile(r'<style data-critical="(site\.[0-9a-f]{10}\.css)">.*?</style>[ \t]*\n?[ \t]*',
+                                    re.DOTALL)
+# Matched by attributes in any order: pages re-serialized by BeautifulSoup reorder them
+PRELOAD_PATTERN = re.compile(r'<link\b(?=[^>]*\brel="preload")[^>]*\bhref="(site\.[0-9a-f]{10}\.css)"[^>]*>')
+NOSCRIPT_PATTERN = re.compile(r'[ \t]*\n?[ \t]*<noscript><link\b[^>]*\bhref="site\.[0-9a-f]{10}\.css"[^>]*></noscript>')
+
+SITE_ROOT = Path(__file__).parent
+
+
+class FirstScreenParser(HTMLParser):
+    """
+    Collects the classes of visible elements and the top-level skeleton
+    (tag and class of each child of <body>) of a first-screen fragment.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.classes = set()
+        self.skeleton = []
+        self.open_tags = []
+        self.hidden_depth = None
+
+    def _element(self, tag, attrs):
+        classes = (dict(attrs).get('class') or '').split()
+        depth = len(self.open_tags)
+        if depth == 1:
+            self.skeleton.append((tag, ' '.join(classes)))
+        if self.hidden_depth is None:
+            self.classes.update(classes)
+            if 'hidden' in classes and not any(SHOWN_VARIANT_PATTERN.match(c) for c in classes):
+                self.hidden_depth = depth
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            self.handle_startendtag(tag, attrs)
+            return
+        self._element(tag, attrs)
+        self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._element(tag, attrs)
+        self._close_hidden()
+
+    def handle_endtag(self, tag):
+        # Like a browser: close up to the matching open element, ignore a stray end tag
+        if tag not in self.open_tags:
+            return
+        while self.open_tags.pop() != tag:
+            pass
+        self._close_hidden()
+
+    def _close_hidden(self):
+        if self.hidden_depth is not None and len(self.open_tags) <= self.hidden_depth:
+            self.hidden_depth = None
+
+
+def first_screen(html):
+    """(visible classes, top-level skeleton) of the page's first screen, or None if it has no fold marker."""
+    start = html.find('<body')
+    fold = html.find(FOLD_MARKER, start)
+    if start == -1 or fold == -1:
+        return None
+    parser = FirstScreenParser()
+    parser.feed(html[start:fold])
+    parser.close()
+    return parser.classes, parser.skeleton
+
+
+def critical_css(template_html):
+    """(minified critical CSS, classes it covers) for the template's first screen."""
+    classes, _ = first_screen(template_html)
+    css, _ = css_bundle.generate_css(classes)
+    return css, classes
+
+
+def structure_differences(html, template_classes, template_skeleton):
+    """Reasons the page's first screen cannot use the template's critical CSS (empty if it can)."""
+    screen = first_screen(html)
+    if screen is None:
+        return [f"no {FOLD_MARKER} marker"]
+    classes, skeleton = screen
+    problems = []
+    if skeleton != template_skeleton:
+        for i, (ours, theirs) in enumerate(zip(skeleton + [None] * len(template_skeleton),
+                                               template_skeleton + [None] * len(skeleton))):
+            if ours != theirs:
+                problems.append(f"top-level element {i + 1} is {_describe(ours)}, template has {_describe(theirs)}")
+                break
+    # Classes the template does not use would be unstyled until the bundle loads
+    missing = sorted(c for c in classes - template_classes if css_bundle.compile_candidate(c))
+    if missing:
+        problems.append(f"classes not in the critical CSS: {' '.join(missing)}")
+    return problems
+
+
+def _describe(element):
+    if element is None:
+        return "nothing"
+    tag, classes = element
+    return f'<{tag} class="{classes}">' if classes else f"<{tag}>"
+
+
+def remove_critical(html):
+    """`html` with any inlined critical CSS undone, back to the plain bundle link."""
+    html = CRITICAL_STYLE_PATTERN.sub('', html)
+    html = NOSCRIPT_PATTERN.sub('', html)
+    return PRELOAD_PATTERN.sub(lambda m: f'<link rel="stylesheet" href="{m.group(1)}">', html)
+
+
+def _critical_style(bundle, css):
+    return f'<style data-critical="{bundle}">{css.strip()}</style>'
+
+
+def inline_critical(html, css):
+    """`html` with the bundle link replaced by the inlined `css` and an asynchronous load of the bundle."""
+    inlined, preload = CRITICAL_STYLE_PATTERN.search(html), PRELOAD_PATTERN.search(html)
+    if inlined and preload and inlined.group(1) == preload.group(1) and \
+            inlined.group(0).startswith(_critical_style(preload.group(1), css)):
+        # Already up to date, possibly re-serialized by standardize_to_subaru.py; leave the markup alone
+        return html
+    html = remove_critical(html)
+    match = STYLESHEET_PATTERN.search(html)
+    if not match:
+        return html
+    bundle = re.search(r'href="([^"]+)"', match.group(0)).group(1)
+    line_start = html[html.rfind('\n', 0, match.start()) + 1:match.start()]
+    indent = line_start if not line_start.strip() else ''
+    block = (f'{_critical_style(bundle, css)}\n'
+             f'{indent}<link rel="preload" href="{bundle}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+             f'{indent}<noscript><link rel="stylesheet" href="{bundle}"></noscript>')
+    return html[:match.start()] + block + html[match.end():]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inline critical CSS into the vehicle pages.")
+    parser.add_argument('--check', action='store_true',
+                        help="only report pages whose first screen differs from the template; exit 1 if any")
+    args = parser.parse_args(argv)
+
+    template_html = (SITE_ROOT / TEMPLATE_FILE).read_text(encoding='utf-8')
+    screen = first_screen(template_html)
+    if screen is None:
+        raise ValueError(f"{TEMPLATE_FILE} has no {FOLD_MARKER} marker")
+    template_classes, template_skeleton = screen
+    css, _ = critical_css(template_html)
+
+    pages = sorted(SITE_ROOT.glob(PAGE_PATTERN))
+    flagged = {}
+    with PageWriter(SITE_ROOT) as writer:
+        inlined = 0
+        for page in pages:
+            html = page.read_text(encoding='utf-8')
+            problems = structure_differences(html, template_classes, template_skeleton)
+            if problems:
+                flagged[page.name] = problems
+                new_html = remove_critical(html)
+            else:
+                new_html = inline_critical(html, css)
+                inlined += 1
+            if not args.check and new_html != html:
+                writer.write(page, new_html)
+
+    print(f"Critical CSS: {len(css.encode('utf-8')) / 1024:.1f} KB for {len(template_classes)} first-screen classes")
+    if not args.check:
+        print(f"  Pages inlined: {inlined}, rewritten: {len(writer.written)}")
+    print(f"  Pages whose first screen differs from {TEMPLATE_FILE}: {len(flagged)}")
+    for name, problems in sorted(flagged.items()):
+        for problem in problems:
+            print(f"    {name}: {problem}")
+    if args.check and flagged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
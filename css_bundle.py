@@ -0,0 +1,888 @@
+"""
+Build-time replacement for the Tailwind Play CDN.
+The pages loaded https://cdn.tailwindcss.com, which compiles utility classes in
+the browser on every page view. This stage does that work once: it scans the
+pages, scripts and page-generating templates for class-name candidates (the same
+over-approximating scan Tailwind's own purge uses), generates CSS for the ones
+that are Tailwind utilities (default theme, Tailwind v3 output), and writes
+preflight plus those utilities as one minified, content-hashed file, site.<hash>.css.
+
+Every page that loaded the CDN script gets a <link> to the bundle instead, placed
+at the end of <head> where the CDN injected its <style>, so the cascade against
+the page's own stylesheets is unchanged. Re-running the stage swaps the link for
+the new hash and deletes the stale bundle.
+
+Utilities outside the default theme (bg-navy, font-heading, animate-fade-in...)
+are still defined by each page's inline <style>, as before.
+
+The Tailwind CLI cannot be fetched in the build environment, so tests/test_css_bundle.py
+holds this stage to Tailwind itself: it compiles every class the site uses with
+the vendored Tailwind v3.4.5 (vendor/tailwindcss/, run under node) and expects
+the same rules, declarations and order.
+
+Usage:
+  python css_bundle.py            # build the bundle and relink the pages
+  python css_bundle.py --list     # also print every generated utility
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+import build_manifest
+from page_writer import PageWriter
+
+BUNDLE_PREFIX = "site"
+BUNDLE_PATTERN = re.compile(r'^site\.[0-9a-f]{10}\.css$')
+# Files whose markup ends up in pages without being a page themselves
+TEMPLATE_SOURCES = ('generate_inventory.py', 'standardize_to_subaru.py')
+
+CDN_SCRIPT_PATTERN = re.compile(r'^([ \t]*)<script src="https://cdn\.tailwindcss\.com"[^>]*></script>[ \t]*\n', re.MULTILINE)
+# Matched by the href alone: pages re-serialized by BeautifulSoup reorder the link's attributes
+BUNDLE_HREF_PATTERN = re.compile(r'(?<=href=")site\.[0-9a-f]{10}\.css(?=")')
+
+SITE_ROOT = Path(__file__).parent
+
+# ===== Theme (Tailwind v3 defaults) =====
+
+BREAKPOINTS = {'sm': 640, 'md': 768, 'lg': 1024, 'xl': 1280, '2xl': 1536}
+
+# Pseudo-class variants in Tailwind's variant order (group-* after the element's own);
+# group-hover is handled separately
+PSEUDO_VARIANTS = {
+    'first': ':first-child', 'last': ':last-child', 'focus-within': ':focus-within', 'hover': ':hover',
+    'focus': ':focus', 'focus-visible': ':focus-visible', 'active': ':active', 'disabled': ':disabled',
+    'group-hover': None,
+}
+
+PALETTE = {
+    'slate': ('f8fafc', 'f1f5f9', 'e2e8f0', 'cbd5e1', '94a3b8', '64748b', '475569', '334155', '1e293b', '0f172a', '020617'),
+    'gray': ('f9fafb', 'f3f4f6', 'e5e7eb', 'd1d5db', '9ca3af', '6b7280', '4b5563', '374151', '1f2937', '111827', '030712'),
+    'red': ('fef2f2', 'fee2e2', 'fecaca', 'fca5a5', 'f87171', 'ef4444', 'dc2626', 'b91c1c', '991b1b', '7f1d1d', '450a0a'),
+    'orange': ('fff7ed', 'ffedd5', 'fed7aa', 'fdba74', 'fb923c', 'f97316', 'ea580c', 'c2410c', '9a3412', '7c2d12', '431407'),
+    'amber': ('fffbeb', 'fef3c7', 'fde68a', 'fcd34d', 'fbbf24', 'f59e0b', 'd97706', 'b45309', '92400e', '78350f', '451a03'),
+    'yellow': ('fefce8', 'fef9c3', 'fef08a', 'fde047', 'facc15', 'eab308', 'ca8a04', 'a16207', '854d0e', '713f12', '422006'),
+    'green': ('f0fdf4', 'dcfce7', 'bbf7d0', '86efac', '4ade80', '22c55e', '16a34a', '15803d', '166534', '14532d', '052e16'),
+    'emerald': ('ecfdf5', 'd1fae5', 'a7f3d0', '6ee7b7', '34d399', '10b981', '059669', '047857', '065f46', '064e3b', '022c22'),
+    'teal': ('f0fdfa', 'ccfbf1', '99f6e4', '5eead4', '2dd4bf', '14b8a6', '0d9488', '0f766e', '115e59', '134e4a', '042f2e'),
+    'cyan': ('ecfeff', 'cffafe', 'a5f3fc', '67e8f9', '22d3ee', '06b6d4', '0891b2', '0e7490', '155e75', '164e63', '083344'),
+    'blue': ('eff6ff', 'dbeafe', 'bfdbfe', '93c5fd', '60a5fa', '3b82f6', '2563eb', '1d4ed8', '1e40af', '1e3a8a', '172554'),
+    'indigo': ('eef2ff', 'e0e7ff', 'c7d2fe', 'a5b4fc', '818cf8', '6366f1', '4f46e5', '4338ca', '3730a3', '312e81', '1e1b4b'),
+    'purple': ('faf5ff', 'f3e8ff', 'e9d5ff', 'd8b4fe', 'c084fc', 'a855f7', '9333ea', '7e22ce', '6b21a8', '581c87', '3b0764'),
+    'pink': ('fdf2f8', 'fce7f3', 'fbcfe8', 'f9a8d4', 'f472b6', 'ec4899', 'db2777', 'be185d', '9d174d', '831843', '500724'),
+}
+SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950')
+COLORS = {f"{name}-{shade}": f"#{hexes[i]}" for name, hexes in PALETTE.items() for i, shade in enumerate(SHADES)}
+COLORS.update({'black': '#000', 'white': '#fff'})
+SPECIAL_COLORS = {'transparent': 'transparent', 'current': 'currentColor', 'inherit': 'inherit'}
+
+SPACING_STEPS = ('0', '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8', '9', '10', '11', '12',
+                 '14', '16', '20', '24', '28', '32', '36', '40', '44', '48', '52', '56', '60', '64', '72', '80', '96')
+SPACING = {step: f"{float(step) * 0.25:g}rem" if step != '0' else '0px' for step in SPACING_STEPS}
+SPACING['px'] = '1px'
+FRACTIONS = {f"{n}/{d}": f"{n / d * 100:.6f}".rstrip('0').rstrip('.') + '%'
+             for d in (2, 3, 4, 5, 6, 12) for n in range(1, d)}
+FRACTIONS['full'] = '100%'
+
+OPACITY = {str(n): f"{n / 100:g}" for n in (0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100)}
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'), '6xl': ('3.75rem', '1'),
+    '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+FONT_WEIGHTS = {'thin': 100, 'extralight': 200, 'light': 300, 'normal': 400, 'medium': 500,
+                'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900}
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", '
+            '"Noto Color Emoji"',
+    'serif': 'ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+    'mono': 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em',
+            'wider': '0.05em', 'widest': '0.1em'}
+MAX_WIDTHS = {'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+              '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem',
+              'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content', 'prose': '65ch'}
+RADII = {'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem',
+         '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+RADIUS_SIDES = {'': ('top-left', 'top-right', 'bottom-right', 'bottom-left'), 't': ('top-left', 'top-right'),
+                'r': ('top-right', 'bottom-right'), 'b': ('bottom-right', 'bottom-left'),
+                'l': ('top-left', 'bottom-left'), 'tl': ('top-left',), 'tr': ('top-right',),
+                'br': ('bottom-right',), 'bl': ('bottom-left',)}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+    'none': '0 0 #0000',
+}
+DROP_SHADOWS = {
+    'sm': 'drop-shadow(0 1px 1px rgb(0 0 0 / 0.05))',
+    '': 'drop-shadow(0 1px 2px rgb(0 0 0 / 0.1)) drop-shadow(0 1px 1px rgb(0 0 0 / 0.06))',
+    'md': 'drop-shadow(0 4px 3px rgb(0 0 0 / 0.07)) drop-shadow(0 2px 2px rgb(0 0 0 / 0.06))',
+    'lg': 'drop-shadow(0 10px 8px rgb(0 0 0 / 0.04)) drop-shadow(0 4px 3px rgb(0 0 0 / 0.1))',
+    'xl': 'drop-shadow(0 20px 13px rgb(0 0 0 / 0.03)) drop-shadow(0 8px 5px rgb(0 0 0 / 0.08))',
+    '2xl': 'drop-shadow(0 25px 25px rgb(0 0 0 / 0.15))',
+    'none': 'drop-shadow(0 0 #0000)',
+}
+BLURS = {'none': '0', 'sm': '4px', '': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px', '2xl': '40px', '3xl': '64px'}
+SCALES = {str(n): f"{n / 100:g}" for n in (0, 50, 75, 90, 95, 100, 105, 110, 125, 150)}
+DURATIONS = ('0', '75', '100', '150', '200', '300', '500', '700', '1000')
+EASINGS = {'linear': 'linear', 'in': 'cubic-bezier(0.4, 0, 1, 1)', 'out': 'cubic-bezier(0, 0, 0.2, 1)',
+           'in-out': 'cubic-bezier(0.4, 0, 0.2, 1)'}
+Z_INDEX = ('0', '10', '20', '30', '40', '50', 'auto')
+GRADIENT_DIRECTIONS = {'t': 'top', 'tr': 'top right', 'r': 'right', 'br': 'bottom right', 'b': 'bottom',
+                       'bl': 'bottom left', 'l': 'left', 'tl': 'top left'}
+
+TRANSFORM = ("transform:translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) "
+             "skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))")
+FILTER = ("filter:var(--tw-blur) var(--tw-brightness) var(--tw-contrast) var(--tw-grayscale) var(--tw-hue-rotate) "
+          "var(--tw-invert) var(--tw-saturate) var(--tw-sepia) var(--tw-drop-shadow)")
+BACKDROP_STACK = ("var(--tw-backdrop-blur) var(--tw-backdrop-brightness) var(--tw-backdrop-contrast) "
+                  "var(--tw-backdrop-grayscale) var(--tw-backdrop-hue-rotate) var(--tw-backdrop-invert) "
+                  "var(--tw-backdrop-opacity) var(--tw-backdrop-saturate) var(--tw-backdrop-sepia)")
+BACKDROP_FILTER = f"-webkit-backdrop-filter:{BACKDROP_STACK};backdrop-filter:{BACKDROP_STACK}"
+SHADOW_STACK = "box-shadow:var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)"
+TRANSITION_DEFAULTS = "transition-timing-function:cubic-bezier(0.4, 0, 0.2, 1);transition-duration:150ms"
+TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, '
+        'transform, filter, backdrop-filter',
+    'all': 'all',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+ANIMATIONS = {
+    'spin': ('1s linear infinite', '@keyframes spin{to{transform:rotate(360deg)}}'),
+    'ping': ('1s cubic-bezier(0, 0, 0.2, 1) infinite', '@keyframes ping{75%,100%{transform:scale(2);opacity:0}}'),
+    'pulse': ('2s cubic-bezier(0.4, 0, 0.6, 1) infinite', '@keyframes pulse{50%{opacity:.5}}'),
+    'bounce': ('1s infinite', '@keyframes bounce{0%,100%{transform:translateY(-25%);'
+                              'animation-timing-function:cubic-bezier(0.8,0,1,1)}50%{transform:none;'
+                              'animation-timing-function:cubic-bezier(0,0,0.2,1)}}'),
+}
+
+# Tailwind v3.4 preflight, plus the defaults of the custom properties the utilities compose
+PREFLIGHT = (
+    '*,::after,::before{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}'
+    "::after,::before{--tw-content:''}"
+    ':host,html{line-height:1.5;-webkit-text-size-adjust:100%;-moz-tab-size:4;tab-size:4;font-family:ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji";font-feature-settings:normal;font-variation-settings:normal;-webkit-tap-highlight-color:transparent}'
+    'body{margin:0;line-height:inherit}'
+    'hr{height:0;color:inherit;border-top-width:1px}'
+    'abbr:where([title]){-webkit-text-decoration:underline dotted;text-decoration:underline dotted}'
+    'h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}'
+    'a{color:inherit;text-decoration:inherit}'
+    'b,strong{font-weight:bolder}'
+    'code,kbd,pre,samp{font-family:ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;font-feature-settings:normal;font-variation-settings:normal;font-size:1em}'
+    'small{font-size:80%}'
+    'sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}'
+    'sub{bottom:-.25em}'
+    'sup{top:-.5em}'
+    'table{text-indent:0;border-color:inherit;border-collapse:collapse}'
+    'button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}'
+    'button,select{text-transform:none}'
+    'button,input:where([type=button]),input:where([type=reset]),input:where([type=submit]){-webkit-appearance:button;background-color:transparent;background-image:none}'
+    ':-moz-focusring{outline:auto}'
+    ':-moz-ui-invalid{box-shadow:none}'
+    'progress{vertical-align:baseline}'
+    '::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}'
+    '[type=search]{-webkit-appearance:textfield;outline-offset:-2px}'
+    '::-webkit-search-decoration{-webkit-appearance:none}'
+    '::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}'
+    'summary{display:list-item}'
+    'blockquote,dd,dl,figure,h1,h2,h3,h4,h5,h6,hr,p,pre{margin:0}'
+    'fieldset{margin:0;padding:0}'
+    'legend{padding:0}'
+    'menu,ol,ul{list-style:none;margin:0;padding:0}'
+    'dialog{padding:0}'
+    'textarea{resize:vertical}'
+    'input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}'
+    '[role=button],button{cursor:pointer}'
+    ':disabled{cursor:default}'
+    'audio,canvas,embed,iframe,img,object,svg,video{display:block;vertical-align:middle}'
+    'img,video{max-width:100%;height:auto}'
+    '[hidden]{display:none}'
+    '*, ::before, ::after{--tw-border-spacing-x:0;--tw-border-spacing-y:0;--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-skew-x:0;--tw-skew-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-pan-x: ;--tw-pan-y: ;--tw-pinch-zoom: ;--tw-scroll-snap-strictness:proximity;--tw-gradient-from-position: ;--tw-gradient-via-position: ;--tw-gradient-to-position: ;--tw-ordinal: ;--tw-slashed-zero: ;--tw-numeric-figure: ;--tw-numeric-spacing: ;--tw-numeric-fraction: ;--tw-ring-inset: ;--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;--tw-ring-color:rgb(59 130 246 / 0.5);--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000;--tw-shadow-colored:0 0 #0000;--tw-blur: ;--tw-brightness: ;--tw-contrast: ;--tw-grayscale: ;--tw-hue-rotate: ;--tw-invert: ;--tw-saturate: ;--tw-sepia: ;--tw-drop-shadow: ;--tw-backdrop-blur: ;--tw-backdrop-brightness: ;--tw-backdrop-contrast: ;--tw-backdrop-grayscale: ;--tw-backdrop-hue-rotate: ;--tw-backdrop-invert: ;--tw-backdrop-opacity: ;--tw-backdrop-saturate: ;--tw-backdrop-sepia: ;--tw-contain-size: ;--tw-contain-layout: ;--tw-contain-paint: ;--tw-contain-style: }'
+    '::backdrop{--tw-border-spacing-x:0;--tw-border-spacing-y:0;--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-skew-x:0;--tw-skew-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-pan-x: ;--tw-pan-y: ;--tw-pinch-zoom: ;--tw-scroll-snap-strictness:proximity;--tw-gradient-from-position: ;--tw-gradient-via-position: ;--tw-gradient-to-position: ;--tw-ordinal: ;--tw-slashed-zero: ;--tw-numeric-figure: ;--tw-numeric-spacing: ;--tw-numeric-fraction: ;--tw-ring-inset: ;--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;--tw-ring-color:rgb(59 130 246 / 0.5);--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000;--tw-shadow-colored:0 0 #0000;--tw-blur: ;--tw-brightness: ;--tw-contrast: ;--tw-grayscale: ;--tw-hue-rotate: ;--tw-invert: ;--tw-saturate: ;--tw-sepia: ;--tw-drop-shadow: ;--tw-backdrop-blur: ;--tw-backdrop-brightness: ;--tw-backdrop-contrast: ;--tw-backdrop-grayscale: ;--tw-backdrop-hue-rotate: ;--tw-backdrop-invert: ;--tw-backdrop-opacity: ;--tw-backdrop-saturate: ;--tw-backdrop-sepia: ;--tw-contain-size: ;--tw-contain-layout: ;--tw-contain-paint: ;--tw-contain-style: }'
+)
+
+# Single-class utilities with fixed declarations, by rule group
+STATIC_UTILITIES = {
+    'sr-only': ('accessibility', 'position:absolute;width:1px;height:1px;padding:0;margin:-1px;overflow:hidden;'
+                                 'clip:rect(0, 0, 0, 0);white-space:nowrap;border-width:0'),
+    'pointer-events-none': ('pointer-events', 'pointer-events:none'),
+    'pointer-events-auto': ('pointer-events', 'pointer-events:auto'),
+    'visible': ('visibility', 'visibility:visible'),
+    'invisible': ('visibility', 'visibility:hidden'),
+    'collapse': ('visibility', 'visibility:collapse'),
+    'static': ('position', 'position:static'),
+    'fixed': ('position', 'position:fixed'),
+    'absolute': ('position', 'position:absolute'),
+    'relative': ('position', 'position:relative'),
+    'sticky': ('position', 'position:sticky'),
+    'block': ('display', 'display:block'),
+    'inline-block': ('display', 'display:inline-block'),
+    'inline': ('display', 'display:inline'),
+    'flex': ('display', 'display:flex'),
+    'inline-flex': ('display', 'display:inline-flex'),
+    'table': ('display', 'display:table'),
+    'grid': ('display', 'display:grid'),
+    'inline-grid': ('display', 'display:inline-grid'),
+    'contents': ('display', 'display:contents'),
+    'hidden': ('display', 'display:none'),
+    'aspect-auto': ('aspect-ratio', 'aspect-ratio:auto'),
+    'aspect-square': ('aspect-ratio', 'aspect-ratio:1 / 1'),
+    'aspect-video': ('aspect-ratio', 'aspect-ratio:16 / 9'),
+    'flex-1': ('flex', 'flex:1 1 0%'),
+    'flex-auto': ('flex', 'flex:1 1 auto'),
+    'flex-initial': ('flex', 'flex:0 1 auto'),
+    'flex-none': ('flex', 'flex:none'),
+    'flex-shrink': ('flex-shrink', 'flex-shrink:1'),
+    'flex-shrink-0': ('flex-shrink', 'flex-shrink:0'),
+    'shrink': ('flex-shrink', 'flex-shrink:1'),
+    'shrink-0': ('flex-shrink', 'flex-shrink:0'),
+    'flex-grow': ('flex-grow', 'flex-grow:1'),
+    'flex-grow-0': ('flex-grow', 'flex-grow:0'),
+    'grow': ('flex-grow', 'flex-grow:1'),
+    'grow-0': ('flex-grow', 'flex-grow:0'),
+    'transform': ('transform', TRANSFORM),
+    'transform-none': ('transform', 'transform:none'),
+    'cursor-auto': ('cursor', 'cursor:auto'),
+    'cursor-default': ('cursor', 'cursor:default'),
+    'cursor-pointer': ('cursor', 'cursor:pointer'),
+    'cursor-not-allowed': ('cursor', 'cursor:not-allowed'),
+    'select-none': ('user-select', '-webkit-user-select:none;user-select:none'),
+    'resize-none': ('resize', 'resize:none'),
+    'resize-y': ('resize', 'resize:vertical'),
+    'resize-x': ('resize', 'resize:horizontal'),
+    'resize': ('resize', 'resize:both'),
+    'list-inside': ('list-style-position', 'list-style-position:inside'),
+    'list-none': ('list-style-type', 'list-style-type:none'),
+    'list-disc': ('list-style-type', 'list-style-type:disc'),
+    'list-decimal': ('list-style-type', 'list-style-type:decimal'),
+    'flex-row': ('flex-direction', 'flex-direction:row'),
+    'flex-row-reverse': ('flex-direction', 'flex-direction:row-reverse'),
+    'flex-col': ('flex-direction', 'flex-direction:column'),
+    'flex-col-reverse': ('flex-direction', 'flex-direction:column-reverse'),
+    'flex-wrap': ('flex-wrap', 'flex-wrap:wrap'),
+    'flex-nowrap': ('flex-wrap', 'flex-wrap:nowrap'),
+    'items-start': ('align-items', 'align-items:flex-start'),
+    'items-end': ('align-items', 'align-items:flex-end'),
+    'items-center': ('align-items', 'align-items:center'),
+    'items-baseline': ('align-items', 'align-items:baseline'),
+    'items-stretch': ('align-items', 'align-items:stretch'),
+    'justify-start': ('justify-content', 'justify-content:flex-start'),
+    'justify-end': ('justify-content', 'justify-content:flex-end'),
+    'justify-center': ('justify-content', 'justify-content:center'),
+    'justify-between': ('justify-content', 'justify-content:space-between'),
+    'justify-around': ('justify-content', 'justify-content:space-around'),
+    'justify-evenly': ('justify-content', 'justify-content:space-evenly'),
+    'self-auto': ('align-self', 'align-self:auto'),
+    'self-start': ('align-self', 'align-self:flex-start'),
+    'self-end': ('align-self', 'align-self:flex-end'),
+    'self-center': ('align-self', 'align-self:center'),
+    'self-stretch': ('align-self', 'align-self:stretch'),
+    'overflow-auto': ('overflow', 'overflow:auto'),
+    'overflow-hidden': ('overflow', 'overflow:hidden'),
+    'overflow-visible': ('overflow', 'overflow:visible'),
+    'overflow-scroll': ('overflow', 'overflow:scroll'),
+    'overflow-x-auto': ('overflow', 'overflow-x:auto'),
+    'overflow-y-auto': ('overflow', 'overflow-y:auto'),
+    'overflow-x-hidden': ('overflow', 'overflow-x:hidden'),
+    'overflow-y-hidden': ('overflow', 'overflow-y:hidden'),
+    'scroll-smooth': ('scroll-behavior', 'scroll-behavior:smooth'),
+    'truncate': ('text-overflow', 'overflow:hidden;text-overflow:ellipsis;white-space:nowrap'),
+    'whitespace-normal': ('whitespace', 'white-space:normal'),
+    'whitespace-nowrap': ('whitespace', 'white-space:nowrap'),
+    'break-words': ('word-break', 'overflow-wrap:break-word'),
+    'border-solid': ('border-style', 'border-style:solid'),
+    'border-dashed': ('border-style', 'border-style:dashed'),
+    'border-dotted': ('border-style', 'border-style:dotted'),
+    'border-none': ('border-style', 'border-style:none'),
+    'bg-fixed': ('background-attachment', 'background-attachment:fixed'),
+    'bg-clip-text': ('background-clip', '-webkit-background-clip:text;background-clip:text'),
+    'bg-none': ('background-image', 'background-image:none'),
+    'bg-auto': ('background-size', 'background-size:auto'),
+    'bg-cover': ('background-size', 'background-size:cover'),
+    'bg-contain': ('background-size', 'background-size:contain'),
+    'bg-center': ('background-position', 'background-position:center'),
+    'bg-top': ('background-position', 'background-position:top'),
+    'bg-bottom': ('background-position', 'background-position:bottom'),
+    'bg-repeat': ('background-repeat', 'background-repeat:repeat'),
+    'bg-no-repeat': ('background-repeat', 'background-repeat:no-repeat'),
+    'fill-current': ('fill', 'fill:currentColor'),
+    'stroke-current': ('stroke', 'stroke:currentColor'),
+    'object-contain': ('object-fit', 'object-fit:contain'),
+    'object-cover': ('object-fit', 'object-fit:cover'),
+    'object-fill': ('object-fit', 'object-fit:fill'),
+    'object-none': ('object-fit', 'object-fit:none'),
+    'object-center': ('object-position', 'object-position:center'),
+    'object-top': ('object-position', 'object-position:top'),
+    'object-bottom': ('object-position', 'object-position:bottom'),
+    'text-left': ('text-align', 'text-align:left'),
+    'text-center': ('text-align', 'text-align:center'),
+    'text-right': ('text-align', 'text-align:right'),
+    'text-justify': ('text-align', 'text-align:justify'),
+    'align-top': ('vertical-align', 'vertical-align:top'),
+    'align-middle': ('vertical-align', 'vertical-align:middle'),
+    'uppercase': ('text-transform', 'text-transform:uppercase'),
+    'lowercase': ('text-transform', 'text-transform:lowercase'),
+    'capitalize': ('text-transform', 'text-transform:capitalize'),
+    'normal-case': ('text-transform', 'text-transform:none'),
+    'italic': ('font-style', 'font-style:italic'),
+    'not-italic': ('font-style', 'font-style:normal'),
+    'underline': ('text-decoration', '-webkit-text-decoration-line:underline;text-decoration-line:underline'),
+    'line-through': ('text-decoration', '-webkit-text-decoration-line:line-through;text-decoration-line:line-through'),
+    'no-underline': ('text-decoration', '-webkit-text-decoration-line:none;text-decoration-line:none'),
+    'antialiased': ('font-smoothing', '-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale'),
+    'outline-none': ('outline', 'outline:2px solid transparent;outline-offset:2px'),
+    'ring-inset': ('ring-width', '--tw-ring-inset:inset'),
+    'filter': ('filter', FILTER),
+    'backdrop-filter': ('backdrop-filter', BACKDROP_FILTER),
+    'filter-none': ('filter', 'filter:none'),
+}
+
+# Rule groups in output order (Tailwind's core plugin order), later groups win on equal specificity
+GROUP_ORDER = (
+    'container', 'accessibility', 'pointer-events', 'visibility', 'position', 'inset', 'inset-axis', 'inset-side',
+    'z-index', 'grid-column', 'margin', 'margin-axis', 'margin-side', 'display', 'aspect-ratio', 'height',
+    'max-height', 'min-height', 'width', 'min-width', 'max-width', 'flex', 'flex-shrink', 'flex-grow',
+    'translate', 'scale', 'transform', 'animation', 'cursor', 'user-select', 'resize', 'list-style-position',
+    'list-style-type', 'grid-template-columns', 'flex-direction', 'flex-wrap', 'align-items', 'justify-content',
+    'gap', 'space', 'align-self', 'overflow', 'scroll-behavior', 'text-overflow', 'whitespace', 'word-break',
+    'border-radius', 'border-radius-side', 'border-width', 'border-width-axis', 'border-width-side', 'border-style', 'border-color',
+    'background-color', 'background-opacity', 'background-image', 'gradient-from', 'gradient-via', 'gradient-to',
+    'background-size', 'background-attachment', 'background-clip', 'background-position', 'background-repeat',
+    'fill', 'stroke', 'object-fit', 'object-position', 'padding', 'padding-axis', 'padding-side', 'text-align',
+    'vertical-align', 'font-family', 'font-size', 'font-weight', 'text-transform', 'font-style', 'line-height',
+    'letter-spacing', 'text-color', 'text-opacity', 'text-decoration', 'font-smoothing', 'opacity', 'box-shadow',
+    'outline', 'ring-width', 'ring-color', 'blur', 'drop-shadow', 'filter', 'backdrop-blur', 'backdrop-filter',
+    'transition', 'duration', 'ease',
+)
+GROUP_INDEX = {group: i for i, group in enumerate(GROUP_ORDER)}
+# Groups Tailwind generates from theme values; like its other utilities, these sort by class name
+THEMED_GROUPS = ('aspect-ratio', 'flex', 'flex-shrink', 'flex-grow', 'cursor', 'list-style-type', 'background-size',
+                 'background-position', 'object-position')
+STATIC_RANK = {name: i for i, (name, (group, _)) in enumerate(STATIC_UTILITIES.items()) if group not in THEMED_GROUPS}
+
+SIDES = {'t': ('top',), 'r': ('right',), 'b': ('bottom',), 'l': ('left',),
+         'x': ('left', 'right'), 'y': ('top', 'bottom')}
+
+# ===== Utility resolution =====
+
+
+def _arbitrary(value):
+    """The CSS value of an arbitrary `[...]` value, or None."""
+    if len(value) > 2 and value[0] == '[' and value[-1] == ']':
+        return value[1:-1].replace('_', ' ')
+    return None
+
+
+def _length(value, *scales, negative=False):
+    """A length from the given scales (or an arbitrary value), negated for `-` utilities."""
+    for scale in scales:
+        if value in scale:
+            result = scale[value]
+            break
+    else:
+        result = _arbitrary(value)
+        if result is None:
+            return None
+    if negative:
+        if result in ('0px', '0', 'auto'):
+            return result if result != 'auto' else None
+        result = f"calc({result} * -1)" if result.startswith('calc(') else f"-{result}"
+    return result
+
+
+def _rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = ''.join(c * 2 for c in hex_color)
+    return ' '.join(str(int(hex_color[i:i + 2], 16)) for i in (0, 2, 4))
+
+
+def _color(value):
+    """(hex, alpha) for a palette colour with an optional /opacity modifier, ('special', None), or None."""
+    name, _, modifier = value.partition('/')
+    if name in SPECIAL_COLORS and not modifier:
+        return SPECIAL_COLORS[name], None
+    if name not in COLORS:
+        return None
+    if not modifier:
+        return COLORS[name], None
+    alpha = OPACITY.get(modifier) or _arbitrary(modifier)
+    return (COLORS[name], alpha) if alpha is not None else None
+
+
+def _color_declarations(prop, opacity_var, value):
+    color = _color(value)
+    if color is None:
+        return None
+    hex_color, alpha = color
+    if not hex_color.startswith('#'):
+        return f"{prop}:{hex_color}"
+    if alpha is not None:
+        return f"{prop}:rgb({_rgb(hex_color)} / {alpha})"
+    return f"{opacity_var}:1;{prop}:rgb({_rgb(hex_color)} / var({opacity_var}))"
+
+
+def _gradient_stop(kind, value):
+    color = _color(value)
+    if color is None:
+        return None
+    hex_color, alpha = color
+    if hex_color.startswith('#'):
+        stop = hex_color if alpha is None else f"rgb({_rgb(hex_color)} / {alpha})"
+        transparent = f"rgb({_rgb(hex_color)} / 0)"
+    else:
+        stop, transparent = hex_color, 'rgb(255 255 255 / 0)'
+    if kind == 'from':
+        return (f"--tw-gradient-from:{stop} var(--tw-gradient-from-position);"
+                f"--tw-gradient-to:{transparent} var(--tw-gradient-to-position);"
+                "--tw-gradient-stops:var(--tw-gradient-from), var(--tw-gradient-to)")
+    if kind == 'via':
+        return (f"--tw-gradient-to:{transparent} var(--tw-gradient-to-position);"
+                f"--tw-gradient-stops:var(--tw-gradient-from), {stop} var(--tw-gradient-via-position), "
+                "var(--tw-gradient-to)")
+    return f"--tw-gradient-to:{stop} var(--tw-gradient-to-position)"
+
+
+def _sided(group, props, side, value):
+    """(group, declarations) for a utility on all sides, an axis or a single side."""
+    if side == '':
+        return group, ';'.join(f"{p}:{value}" for p in props(None))
+    if side in ('x', 'y'):
+        return f"{group}-axis", ';'.join(f"{p}:{value}" for s in SIDES[side] for p in props(s))
+    return f"{group}-side", ';'.join(f"{p}:{value}" for p in props(SIDES[side][0]))
+
+
+def resolve_utility(name):
+    """
+    (group, declarations, selector suffix, keyframes) for one utility without
+    variants, or None if `name` is not a Tailwind utility.
+    """
+    if name in STATIC_UTILITIES:
+        group, declarations = STATIC_UTILITIES[name]
+        return group, declarations, '', None
+    if name == 'container':
+        return 'container', 'width:100%', '', None
+
+    negative = name.startswith('-')
+    base = name[1:] if negative else name
+
+    match = re.fullmatch(r'(inset-x|inset-y|inset|top|right|bottom|left)-(.+)', base)
+    if match:
+        kind, value = match.groups()
+        length = _length(value, SPACING, FRACTIONS, {'auto': 'auto'}, negative=negative)
+        if length is None:
+            return None
+        if kind == 'inset':
+            return 'inset', f"inset:{length}", '', None
+        if kind in ('inset-x', 'inset-y'):
+            return 'inset-axis', ';'.join(f"{s}:{length}" for s in SIDES[kind[-1]]), '', None
+        return 'inset-side', f"{kind}:{length}", '', None
+
+    match = re.fullmatch(r'(m|p)([xytrbl]?)-(.+)', base)
+    if match:
+        kind, side, value = match.groups()
+        if kind == 'p' and negative:
+            return None
+        scales = (SPACING, {'auto': 'auto'}) if kind == 'm' else (SPACING,)
+        length = _length(value, *scales, negative=negative)
+        if length is None:
+            return None
+        prop = 'margin' if kind == 'm' else 'padding'
+        group, declarations = _sided(prop, lambda s: [f"{prop}-{s}" if s else prop], side, length)
+        return group, declarations, '', None
+
+    match = re.fullmatch(r'space-([xy])-(.+)', base)
+    if match:
+        axis, value = match.groups()
+        length = _length(value, SPACING, negative=negative)
+        if length is None:
+            return None
+        reverse = f"--tw-space-{axis}-reverse"
+        if axis == 'x':
+            declarations = (f"{reverse}:0;margin-right:calc({length} * var({reverse}));"
+                            f"margin-left:calc({length} * calc(1 - var({reverse})))")
+        else:
+            declarations = (f"{reverse}:0;margin-top:calc({length} * calc(1 - var({reverse})));"
+                            f"margin-bottom:calc({length} * var({reverse}))")
+        return 'space', declarations, ' > :not([hidden]) ~ :not([hidden])', None
+
+    match = re.fullmatch(r'translate-([xy])-(.+)', base)
+    if match:
+        axis, value = match.groups()
+        length = _length(value, SPACING, FRACTIONS, negative=negative)
+        if length is None:
+            return None
+        return 'translate', f"--tw-translate-{axis}:{length};{TRANSFORM}", '', None
+
+    if negative:
+        return None
+
+    match = re.fullmatch(r'z-(.+)', name)
+    if match and match.group(1) in Z_INDEX:
+        return 'z-index', f"z-index:{match.group(1)}", '', None
+
+    match = re.fullmatch(r'col-span-(\d+|full)', name)
+    if match:
+        span = match.group(1)
+        value = '1 / -1' if span == 'full' else f"span {span} / span {span}"
+        return 'grid-column', f"grid-column:{value}", '', None
+
+    match = re.fullmatch(r'grid-cols-(\d+|none)', name)
+    if match:
+        count = match.group(1)
+        value = 'none' if count == 'none' else f"repeat({count}, minmax(0, 1fr))"
+        return 'grid-template-columns', f"grid-template-columns:{value}", '', None
+
+    match = re.fullmatch(r'(w|h)-(.+)', name)
+    if match:
+        kind, value = match.groups()
+        screen = {'screen': '100vw' if kind == 'w' else '100vh'}
+        length = _length(value, SPACING, FRACTIONS, screen,
+                         {'auto': 'auto', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'})
+        if length is None:
+            return None
+        return ('width', f"width:{length}", '', None) if kind == 'w' else ('height', f"height:{length}", '', None)
+
+    match = re.fullmatch(r'(min-w|min-h|max-w|max-h)-(.+)', name)
+    if match:
+        kind, value = match.groups()
+        scales = {
+            'min-w': ({'0': '0px', 'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'},),
+            'min-h': ({'0': '0px', 'full': '100%', 'screen': '100vh'},),
+            'max-w': (MAX_WIDTHS,),
+            'max-h': (SPACING, {'full': '100%', 'screen': '100vh', 'none': 'none'}),
+        }[kind]
+        length = _length(value, *scales)
+        if length is None:
+            return None
+        prop = {'min-w': 'min-width', 'min-h': 'min-height', 'max-w': 'max-width', 'max-h': 'max-height'}[kind]
+        return prop, f"{prop}:{length}", '', None
+
+    match = re.fullmatch(r'gap(-[xy])?-(.+)', name)
+    if match:
+        axis, value = match.groups()
+        length = _length(value, SPACING)
+        if length is None:
+            return None
+        prop = {None: 'gap', '-x': 'column-gap', '-y': 'row-gap'}[axis]
+        return 'gap', f"{prop}:{length}", '', None
+
+    match = re.fullmatch(r'scale-(\d+)', name)
+    if match and match.group(1) in SCALES:
+        scale = SCALES[match.group(1)]
+        return 'scale', f"--tw-scale-x:{scale};--tw-scale-y:{scale};{TRANSFORM}", '', None
+
+    match = re.fullmatch(r'animate-(\w+)', name)
+    if match:
+        if match.group(1) == 'none':
+            return 'animation', 'animation:none', '', None
+        if match.group(1) in ANIMATIONS:
+            timing, keyframes = ANIMATIONS[match.group(1)]
+            return 'animation', f"animation:{match.group(1)} {timing}", '', keyframes
+        return None
+
+    match = re.fullmatch(r'rounded(?:-(t|r|b|l|tl|tr|br|bl))?(?:-(.+))?', name)
+    if match:
+        side, size = match.group(1) or '', match.group(2) or ''
+        if size not in RADII:
+            return None
+        group = 'border-radius' if side == '' else 'border-radius-side'
+        if not side:
+            return group, f"border-radius:{RADII[size]}", '', None
+        return group, ';'.join(f"border-{corner}-radius:{RADII[size]}" for corner in RADIUS_SIDES[side]), '', None
+
+    match = re.fullmatch(r'border(?:-([xytrbl]))?(?:-(0|2|4|8))?', name)
+    if match:
+        side, width = match.group(1) or '', match.group(2) or '1'
+        group, declarations = _sided('border-width', lambda s: [f"border-{s}-width" if s else 'border-width'],
+                                     side, f"{width}px")
+        return group, declarations, '', None
+
+    match = re.fullmatch(r'border-(.+)', name)
+    if match:
+        declarations = _color_declarations('border-color', '--tw-border-opacity', match.group(1))
+        return ('border-color', declarations, '', None) if declarations else None
+
+    match = re.fullmatch(r'bg-opacity-(\d+)', name)
+    if match and match.group(1) in OPACITY:
+        return 'background-opacity', f"--tw-bg-opacity:{OPACITY[match.group(1)]}", '', None
+
+    match = re.fullmatch(r'bg-gradient-to-(\w+)', name)
+    if match and match.group(1) in GRADIENT_DIRECTIONS:
+        direction = GRADIENT_DIRECTIONS[match.group(1)]
+        return 'background-image', f"background-image:linear-gradient(to {direction}, var(--tw-gradient-stops))", '', None
+
+    match = re.fullmatch(r'bg-(.+)', name)
+    if match:
+        value = match.group(1)
+        arbitrary = _arbitrary(value)
+        if arbitrary is not None:
+            if arbitrary.startswith('url('):
+                return 'background-image', f"background-image:{arbitrary}", '', None
+            if arbitrary.startswith(('#', 'rgb', 'hsl')):
+                return 'background-color', f"background-color:{arbitrary}", '', None
+            return None
+        declarations = _color_declarations('background-color', '--tw-bg-opacity', value)
+        return ('background-color', declarations, '', None) if declarations else None
+
+    match = re.fullmatch(r'(from|via|to)-(.+)', name)
+    if match:
+        kind, value = match.groups()
+        declarations = _gradient_stop(kind, value)
+        return (f"gradient-{kind}", declarations, '', None) if declarations else None
+
+    match = re.fullmatch(r'font-(\w+)', name)
+    if match:
+        value = match.group(1)
+        if value in FONT_WEIGHTS:
+            return 'font-weight', f"font-weight:{FONT_WEIGHTS[value]}", '', None
+        if value in FONT_FAMILIES:
+            return 'font-family', f"font-family:{FONT_FAMILIES[value]}", '', None
+        return None
+
+    match = re.fullmatch(r'text-(.+)', name)
+    if match:
+        value = match.group(1)
+        if value in FONT_SIZES:
+            size, line_height = FONT_SIZES[value]
+            return 'font-size', f"font-size:{size};line-height:{line_height}", '', None
+        if value.startswith('opacity-') and value[8:] in OPACITY:
+            return 'text-opacity', f"--tw-text-opacity:{OPACITY[value[8:]]}", '', None
+        declarations = _color_declarations('color', '--tw-text-opacity', value)
+        return ('text-color', declarations, '', None) if declarations else None
+
+    match = re.fullmatch(r'leading-(\w+)', name)
+    if match and match.group(1) in LEADING:
+        return 'line-height', f"line-height:{LEADING[match.group(1)]}", '', None
+
+    match = re.fullmatch(r'tracking-(\w+)', name)
+    if match and match.group(1) in TRACKING:
+        return 'letter-spacing', f"letter-spacing:{TRACKING[match.group(1)]}", '', None
+
+    match = re.fullmatch(r'opacity-(\d+)', name)
+    if match and match.group(1) in OPACITY:
+        return 'opacity', f"opacity:{OPACITY[match.group(1)]}", '', None
+
+    match = re.fullmatch(r'shadow(?:-(\w+))?', name)
+    if match and (match.group(1) or '') in SHADOWS:
+        shadow = SHADOWS[match.group(1) or '']
+        # Each shadow again with its colour left to shadow-<color>, as Tailwind emits it
+        colored = re.sub(r'rgb\(0 0 0 / [\d.]+\)', 'var(--tw-shadow-color)', shadow)
+        return 'box-shadow', f"--tw-shadow:{shadow};--tw-shadow-colored:{colored};{SHADOW_STACK}", '', None
+
+    match = re.fullmatch(r'ring(?:-(0|1|2|4|8))?', name)
+    if match:
+        width = match.group(1) if match.group(1) is not None else '3'
+        declarations = ("--tw-ring-offset-shadow:var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) "
+                        "var(--tw-ring-offset-color);"
+                        f"--tw-ring-shadow:var(--tw-ring-inset) 0 0 0 calc({width}px + var(--tw-ring-offset-width)) "
+                        "var(--tw-ring-color);"
+                        "box-shadow:var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)")
+        return 'ring-width', declarations, '', None
+
+    match = re.fullmatch(r'ring-(.+)', name)
+    if match:
+        declarations = _color_declarations('--tw-ring-color', '--tw-ring-opacity', match.group(1))
+        return ('ring-color', declarations, '', None) if declarations else None
+
+    match = re.fullmatch(r'blur(?:-(\w+))?', name)
+    if match and (match.group(1) or '') in BLURS:
+        return 'blur', f"--tw-blur:blur({BLURS[match.group(1) or '']});{FILTER}", '', None
+
+    match = re.fullmatch(r'drop-shadow(?:-(\w+))?', name)
+    if match and (match.group(1) or '') in DROP_SHADOWS:
+        return 'drop-shadow', f"--tw-drop-shadow:{DROP_SHADOWS[match.group(1) or '']};{FILTER}", '', None
+
+    match = re.fullmatch(r'backdrop-blur(?:-(\w+))?', name)
+    if match and (match.group(1) or '') in BLURS:
+        return 'backdrop-blur', f"--tw-backdrop-blur:blur({BLURS[match.group(1) or '']});{BACKDROP_FILTER}", '', None
+
+    match = re.fullmatch(r'transition(?:-(\w+))?', name)
+    if match and (match.group(1) or '') in TRANSITIONS:
+        return 'transition', f"transition-property:{TRANSITIONS[match.group(1) or '']};{TRANSITION_DEFAULTS}", '', None
+    if name == 'transition-none':
+        return 'transition', 'transition-property:none', '', None
+
+    match = re.fullmatch(r'duration-(\d+)', name)
+    if match and match.group(1) in DURATIONS:
+        return 'duration', f"transition-duration:{match.group(1)}ms", '', None
+
+    match = re.fullmatch(r'ease-([\w-]+)', name)
+    if match and match.group(1) in EASINGS:
+        return 'ease', f"transition-timing-function:{EASINGS[match.group(1)]}", '', None
+
+    return None
+
+
+# ===== Candidates and output =====
+
+# Plain class-like tokens, and tokens with an arbitrary [...] value (which may contain quotes and parentheses)
+CANDIDATE_PATTERN = re.compile(r"[\w:/.-]*\[[^\]\s\"<>]+\][\w/.-]*|[\w:/.-]+")
+
+
+def candidates(text):
+    return set(CANDIDATE_PATTERN.findall(text))
+
+
+def split_variants(candidate):
+    """(variants, utility) split at the colons outside [...] values."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(candidate):
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == ':' and depth == 0:
+            parts.append(candidate[start:i])
+            start = i + 1
+    return parts, candidate[start:]
+
+
+def escape_class(name):
+    return re.sub(r'([^\w-])', r'\\\1', name)
+
+
+def compile_candidate(candidate):
+    """
+    (sort key, media width or None, rule, keyframes) for a candidate that is a
+    Tailwind utility with known variants, else None.
+    """
+    variants, utility = split_variants(candidate)
+    if not utility:
+        return None
+    resolved = resolve_utility(utility)
+    if resolved is None:
+        return None
+    group, declarations, suffix, keyframes = resolved
+
+    media = None
+    pseudo = []
+    for variant in variants:
+        if variant in BREAKPOINTS and media is None and not pseudo:
+            media = BREAKPOINTS[variant]
+        elif variant in PSEUDO_VARIANTS and variant not in pseudo:
+            pseudo.append(variant)
+        else:
+            return None
+    if group == 'container' and (media or pseudo):
+        return None
+
+    selector = '.' + escape_class(candidate)
+    for variant in pseudo:
+        if variant == 'group-hover':
+            selector = '.group:hover ' + selector
+        else:
+            selector += PSEUDO_VARIANTS[variant]
+    selector += suffix
+
+    variant_rank = max((list(PSEUDO_VARIANTS).index(v) + 1 for v in pseudo), default=0)
+    # Within a group, fixed utilities keep Tailwind's value order (static, fixed, absolute...)
+    value_rank = STATIC_RANK.get(utility, len(STATIC_RANK))
+    key = (media or 0, variant_rank, GROUP_INDEX[group], value_rank, candidate)
+    return key, media, f"{selector}{{{declarations}}}", keyframes
+
+
+def generate_css(classes):
+    """Minified preflight plus a rule for every utility in `classes`. Returns (css, utilities used)."""
+    compiled = sorted(filter(None, (compile_candidate(c) for c in classes)))
+    keyframes = sorted({k for _, _, _, k in compiled if k})
+
+    out = [PREFLIGHT]
+    if any(key[-1] == 'container' for key, _, _, _ in compiled):
+        out.append('.container{width:100%}')
+        out += [f"@media (min-width:{width}px){{.container{{max-width:{width}px}}}}" for width in BREAKPOINTS.values()]
+    current_media = None
+    for key, media, rule, _ in compiled:
+        if key[-1] == 'container':
+            continue
+        if media != current_media:
+            if current_media is not None:
+                out.append('}')
+            if media is not None:
+                out.append(f"@media (min-width:{media}px){{")
+            current_media = media
+        out.append(rule)
+    if current_media is not None:
+        out.append('}')
+    out += keyframes
+    return ''.join(out) + '\n', [key[-1] for key, _, _, _ in compiled]
+
+
+def content_files(root=SITE_ROOT):
+    """Pages, scripts and templates scanned for class names."""
+    root = Path(root)
+    files = sorted(p for p in root.iterdir() if p.is_file() and p.suffix in ('.html', '.js'))
+    return files + [root / name for name in TEMPLATE_SOURCES if (root / name).exists()]
+
+
+def build_bundle(root=SITE_ROOT):
+    """(bundle file name, css, utilities) for the classes used across the site."""
+    classes = set()
+    for path in content_files(root):
+        classes |= candidates(path.read_text(encoding='utf-8', errors='replace'))
+    css, utilities = generate_css(classes)
+    digest = build_manifest.hash_bytes(css)[:10]
+    return f"{BUNDLE_PREFIX}.{digest}.css", css, utilities
+
+
+def current_bundle(root=SITE_ROOT):
+    """File name of the bundle in the site root, or None if the stage has not run."""
+    bundles = sorted(p.name for p in Path(root).iterdir() if BUNDLE_PATTERN.match(p.name))
+    return bundles[-1] if bundles else None
+
+
+def link_stylesheet(html, bundle):
+    """`html` with the Tailwind CDN script (or an older bundle link) replaced by a link to `bundle`."""
+    if BUNDLE_HREF_PATTERN.search(html):
+        return BUNDLE_HREF_PATTERN.sub(bundle, html)
+    link = f'<link rel="stylesheet" href="{bundle}">'
+    match = CDN_SCRIPT_PATTERN.search(html)
+    head_end = html.find('</head>')
+    if not match or head_end == -1:
+        return html
+    # The CDN appended its <style> to the end of <head>; the link goes in the same place
+    html = html[:head_end] + f"{match.group(1)}{link}\n" + html[head_end:]
+    return html[:match.start()] + html[match.end():]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the purged Tailwind CSS bundle and link it from every page.")
+    parser.add_argument('--list', action='store_true', help="print every utility class in the bundle")
+    args = parser.parse_args(argv)
+
+    bundle, css, utilities = build_bundle(SITE_ROOT)
+    stale = [name for name in [p.name for p in SITE_ROOT.iterdir()] if BUNDLE_PATTERN.match(name) and name != bundle]
+    pages = sorted(p for p in SITE_ROOT.glob('*.html'))
+
+    with PageWriter(SITE_ROOT) as writer:
+        writer.write(bundle, css)
+        relinked = 0
+        for page in pages:
+            html = page.read_text(encoding='utf-8')
+            new_html = link_stylesheet(html, bundle)
+            if new_html != html:
+                writer.write(page, new_html)
+                relinked += 1
+    for name in stale:
+        (SITE_ROOT / name).unlink()
+
+    if args.list:
+        print(' '.join(utilities))
+    print(f"CSS bundle {bundle}: {len(utilities)} utilities, {len(css.encode('utf-8')) / 1024:.1f} KB")
+    print(f"  Pages relinked: {relinked}")
+    print(f"  Stale bundles removed: {len(stale)}")
+
+
+if __name__ == "__main__":
+    main()
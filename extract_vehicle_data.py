@@ -6,7 +6,8 @@ This script extracts vehicle-specific data and applies the standard template.
 import os
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+import vehicle_catalog
 
 # Files that need updating (from our check script)
 FILES_TO_UPDATE = [
@@ -46,38 +47,21 @@ FILES_TO_UPDATE = [
     "vehicle-details.html",
 ]
 
-def extract_vehicle_data(filepath):
-    """Extract vehicle-specific data from an HTML file."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Extract title
-            title_tag = soup.find('title')
-            title = title_tag.text if title_tag else "Vehicle Details"
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', {'name': 'description'})
-            description = meta_desc['content'] if meta_desc and 'content' in meta_desc.attrs else ""
-            
-            # Try to extract vehicle name from title or h1
-            h1_tag = soup.find('h1')
-            vehicle_name = h1_tag.text.strip() if h1_tag else title.split('-')[0].strip()
-            
-            print(f"Extracted data from {os.path.basename(filepath)}:")
-            print(f"  Title: {title[:60]}...")
-            print(f"  Vehicle: {vehicle_name}")
-            
-            return {
-                'title': title,
-                'description': description,
-                'vehicle_name': vehicle_name,
-                'filepath': filepath
-            }
-    except Exception as e:
-        print(f"Error extracting data from {filepath}: {e}")
-        return None
+def extract_vehicle_data(record, filepath):
+    """Extract vehicle-specific data from a page's catalog record."""
+    title = record.title or "Vehicle Details"
+    vehicle_name = record.vehicle_name or title.split('-')[0].strip()
+    
+    print(f"Extracted data from {os.path.basename(filepath)}:")
+    print(f"  Title: {title[:60]}...")
+    print(f"  Vehicle: {vehicle_name}")
+    
+    return {
+        'title': title,
+        'description': record.description_meta,
+        'vehicle_name': vehicle_name,
+        'filepath': filepath
+    }
 
 def main():
     script_dir = Path(__file__).parent
@@ -86,11 +70,13 @@ def main():
     print("=" * 60)
     
     vehicle_data_list = []
+    files = FILES_TO_UPDATE[:5]  # Process first 5 for testing
+    catalog = vehicle_catalog.load_catalog(script_dir, files)
     
-    for filename in FILES_TO_UPDATE[:5]:  # Process first 5 for testing
+    for filename in files:
         filepath = script_dir / filename
-        if filepath.exists():
-            data = extract_vehicle_data(filepath)
+        if filename in catalog:
+            data = extract_vehicle_data(catalog[filename], filepath)
             if data:
                 vehicle_data_list.append(data)
         else:
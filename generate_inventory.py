@@ -0,0 +1,483 @@
+"""
+Build-time generator for the inventory page and the client-side vehicle data.
+inventory-listing.json says which vehicles are listed, in what order, and holds
+the few things a detail page does not (sale/hire/sold, body type, condition,
+card subtitle). Everything else comes from the vehicle catalog, so the cards can
+no longer drift from the vehicle-*.html pages. The script writes:
+  inventory.html     the vehicle card grid and the stats block, between their
+                     @generated markers
+  vehicle-data.json  a compact copy of the listing with pre-normalized fields
+                     (lowercased search keys, numeric price/year/mileage), plus
+                     a prefix-searchable inverted index and numeric year/price
+                     columns for the client-side filters
+
+Usage:
+  python generate_inventory.py
+  python generate_inventory.py --import-cards   # one-time: seed the listing from the hand-written cards
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+
+from bs4 import BeautifulSoup
+
+import icon_sprite
+import page_writer
+import vehicle_catalog
+
+INVENTORY_FILE = "inventory.html"
+LISTING_FILE = "inventory-listing.json"
+DATA_FILE = "vehicle-data.json"
+
+CARDS_START = "<!-- @generated:vehicle-cards -->"
+CARDS_END = "<!-- @end:vehicle-cards -->"
+STATS_START = "<!-- @generated:inventory-stats -->"
+STATS_END = "<!-- @end:inventory-stats -->"
+
+PHONE_NUMBER = "+260572213038"
+WHATSAPP_URL = "https://wa.me/260572213038"
+
+# Number of gallery images the card's lightbox opens with
+CARD_GALLERY_SIZE = 5
+
+# Body type (the data-type used by the type filter buttons) -> pill label and classes
+BODY_TYPES = {
+    'HATCHBACKS': ("Hatchbacks", "bg-purple-100 text-purple-700 px-2 py-1 rounded-full text-xs font-medium"),
+    'SEDANS': ("Sedans", "bg-blue-100 text-blue-700 px-2 py-1 rounded-full text-xs font-medium"),
+    'SUV': ("SUVs & Crossovers", "bg-blue-600 text-white px-2 py-1 rounded-full text-xs font-heading"),
+    'PICKUP TRUCKS': ("Pickups & Trucks", "bg-green-100 text-green-700 px-2 py-1 rounded-full text-xs font-semibold"),
+    'VANS & MPVS': ("Vans & MPVs", "bg-indigo-600 text-white px-2 py-1 rounded-full text-xs font-medium"),
+}
+
+# Words that make a quick-spec value a transmission or fuel, whatever the wording ("6-Speed Manual",
+# "Gasoline"), checked in this order. Some pages fill the slot with something else ("Driver & Insurance ✓").
+TRANSMISSIONS = {'automatic': "Automatic", 'manual': "Manual", 'cvt': "CVT"}
+FUEL_TYPES = {'hybrid': "Hybrid", 'electric': "Electric", 'diesel': "Diesel", 'petrol': "Petrol", 'gasoline': "Petrol"}
+
+# Status -> (badge label, badge colour, lucide icon)
+BADGES = {
+    'sale': ("FOR SALE", "bg-green-600", "check-circle"),
+    'hire': ("FOR HIRE", "bg-blue-600", "users"),
+    'sold': ("SOLD", "bg-red-600", "x-circle"),
+}
+
+# Rate used to put USD prices on the ZMW price-range slider; matches the dual
+# USD/ZMW prices quoted on the vehicle pages (e.g. USD 36,000 / ZMW 800,000)
+ZMW_PER_USD = 22.2
+
+# "ZMW 197,000", "K855,000", "USD 36,000", "$29,500" -> currency and amount of the first price
+PRICE_PATTERN = re.compile(r'(ZMW|K|USD|\$)\s*(\d[\d,]*(?:\.\d+)?)', re.IGNORECASE)
+CURRENCIES = {'zmw': 'ZMW', 'k': 'ZMW', 'usd': 'USD', '$': 'USD'}
+
+CARD_TEMPLATE = """\
+        <!-- {name} ({badge}) -->
+        <div
+          class="vehicle-card group bg-white rounded-2xl shadow-lg hover:shadow-xl transition-all duration-300 overflow-hidden"
+          data-category="{listing}" data-name="{name}" data-type="{body_type}" data-fuel="{fuel}"
+          data-transmission="{transmission}" data-year="{year}" data-search="{search}">
+
+          <!-- Vehicle Image -->
+          <div class="relative h-48 overflow-hidden cursor-pointer" onclick="window.openLightbox({gallery}, 0)">
+            <img src="{image}" alt="{alt}"
+              class="w-full h-full object-cover transition-transform duration-300 group-hover:scale-105{image_class}" loading="lazy">
+            <div class="absolute top-3 left-3 z-20">
+              <span
+                class="{badge_class} text-white px-2 py-1 rounded-full text-xs font-bold shadow-md flex items-center gap-1">
+                <i data-lucide="{badge_icon}" class="w-3 h-3"></i>
+                {badge}
+              </span>
+            </div>
+            <div
+              class="absolute bottom-3 left-3 right-3 transform translate-y-full group-hover:translate-y-0 transition-transform duration-300">
+              <div class="bg-white/90 backdrop-blur-sm rounded px-2 py-1 flex items-center gap-2 text-xs font-medium">
+                <i data-lucide="maximize-2" class="w-3 h-3"></i>
+                View Gallery
+              </div>
+            </div>
+          </div>
+
+          <div class="p-4">
+            <!-- Vehicle Header -->
+            <div class="flex items-start justify-between mb-3">
+              <div>
+                <h3 class="text-lg font-bold text-navy mb-1">{name}</h3>
+                <p class="text-xs text-gray-500">{subtitle}</p>
+              </div>
+              <span class="{type_class}">{type_label}</span>
+            </div>
+
+            <!-- Specifications -->
+            <div class="space-y-1 mb-3">
+              <div class="flex items-center gap-2 text-xs text-gray-600">
+                <i data-lucide="users" class="w-3 h-3 text-gray-400"></i>
+                <span>{seats}</span>
+                <span class="text-gray-300">•</span>
+                <i data-lucide="car" class="w-3 h-3 text-gray-400"></i>
+                <span>{doors}</span>
+              </div>
+              <div class="flex items-center gap-2 text-xs text-gray-600">
+                <i data-lucide="zap" class="w-3 h-3 text-gray-400"></i>
+                <span>{engine}</span>
+                <span class="text-gray-300">•</span>
+                <i data-lucide="settings" class="w-3 h-3 text-gray-400"></i>
+                <span>{transmission}</span>
+              </div>
+            </div>
+
+            <!-- Condition & Price -->
+            <div class="flex items-center justify-between pt-3 border-t border-gray-100">
+              <span class="text-xs text-gray-500 font-medium">{condition}</span>
+              <div class="text-right">
+                <span class="text-lg font-black {price_class}">{price}</span>{price_note}
+              </div>
+            </div>
+
+            <!-- Action Buttons -->
+            <div class="flex gap-2 mt-3">
+              {primary_action}
+              <a href="{whatsapp_url}" target="_blank"
+                class="flex-1 bg-green-500 hover:bg-green-600 text-white px-3 py-2 rounded-lg text-xs font-bold transition-colors flex items-center justify-center gap-1">
+                <i data-lucide="message-circle" class="w-3 h-3"></i>
+                WhatsApp
+              </a>
+            </div>
+          </div>
+        </div>
+"""
+
+ACTION_TEMPLATE = """<a href="{href}"
+                class="flex-1 bg-navy hover:bg-blue-900 text-white px-3 py-2 rounded-lg text-xs font-bold transition-colors flex items-center justify-center gap-1">
+                <i data-lucide="{icon}" class="w-3 h-3"></i>
+                {label}
+              </a>"""
+
+STAT_TEMPLATE = """\
+              <div class="flex justify-between items-center">
+                <span class="text-white/80">{label}</span>
+                <span class="font-bold text-xl">{value}</span>
+              </div>
+"""
+
+
+def load_listing(path=LISTING_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_price(price):
+    """(currency, amount) of the first price in a display string, or (None, None) for e.g. "Price on Request"."""
+    match = PRICE_PATTERN.search(price or "")
+    if not match:
+        return None, None
+    amount = float(match.group(2).replace(',', ''))
+    return CURRENCIES[match.group(1).lower()], int(amount) if amount.is_integer() else amount
+
+
+def spec_term(text, terms):
+    """The canonical name of the first of `terms` found in `text` ("5-Speed Automatic" -> "Automatic"), or None."""
+    for word, name in terms.items():
+        if re.search(rf'\b{word}\b', text or "", re.IGNORECASE):
+            return name
+    return None
+
+
+def _leading_int(text):
+    match = re.search(r'\d[\d,]*', text or "")
+    return int(match.group().replace(',', '')) if match else None
+
+
+def _status(entry):
+    return 'sold' if entry.get('sold') else entry.get('listing', 'sale')
+
+
+def build_vehicle(entry, catalog):
+    """Merge a listing entry with its page's catalog record into the flat card/data fields."""
+    record = catalog.get(entry['page']) if entry.get('page') else None
+    specs = dict(record.quick_specs) if record else {}
+    vehicle = {
+        'name': entry['name'],
+        'page': entry.get('page'),
+        'listing': entry.get('listing', 'sale'),
+        'sold': bool(entry.get('sold')),
+        'body_type': entry.get('body_type', 'SUV'),
+        'year': specs.get('Year', ''),
+        'mileage': f"{record.mileage} km" if record and record.mileage else "",
+        'fuel': specs['Fuel'] if spec_term(specs.get('Fuel'), FUEL_TYPES) else '',
+        'transmission': specs['Transmission'] if spec_term(specs.get('Transmission'), TRANSMISSIONS) else '',
+        'seats': specs.get('Seats', ''),
+        'doors': specs.get('Doors', ''),
+        'engine': specs.get('Engine', ''),
+        'price': record.price if record else "",
+        'image': record.main_image if record else "",
+        'gallery': list((record.thumbnails or record.images) if record else [])[:CARD_GALLERY_SIZE],
+        'condition': "Excellent Condition",
+        'subtitle': "",
+        'price_note': "Per day hire rate" if entry.get('listing') == 'hire' else "",
+    }
+    # Anything set in the listing wins (and is all there is for vehicles without a page)
+    vehicle.update({key: value for key, value in entry.items() if key in vehicle})
+    if not vehicle['gallery'] and vehicle['image']:
+        vehicle['gallery'] = [vehicle['image']]
+    if not vehicle['subtitle']:
+        vehicle['subtitle'] = " • ".join(part for part in (
+            f"{vehicle['year']} Model" if vehicle['year'] else "",
+            vehicle['mileage'] or vehicle['transmission']) if part)
+    vehicle['type_label'] = entry.get('type_label') or BODY_TYPES.get(vehicle['body_type'], (vehicle['body_type'].title(),))[0]
+    # Pre-normalized once here instead of on every keystroke in the browser
+    words = " ".join((vehicle['name'], vehicle['body_type'], vehicle['type_label'], vehicle['fuel'],
+                      vehicle['transmission'], str(vehicle['year']))).lower().split()
+    vehicle['search'] = " ".join(dict.fromkeys(words))
+    return vehicle
+
+
+def _attr(value):
+    return html.escape(str(value), quote=True)
+
+
+def _js_list(items):
+    """A JS array literal of strings, safe inside a double-quoted HTML attribute."""
+    quoted = ("'" + item.replace('\\', '\\\\').replace("'", "\\'") + "'" for item in items)
+    return html.escape("[" + ", ".join(quoted) + "]", quote=False).replace('"', '&quot;')
+
+
+def render_card(vehicle):
+    status = _status(vehicle)
+    badge, badge_class, badge_icon = BADGES[status]
+    type_class = BODY_TYPES.get(vehicle['body_type'], (None, BODY_TYPES['SUV'][1]))[1]
+    if status == 'sold':
+        primary_action = ACTION_TEMPLATE.format(href=f"tel:{PHONE_NUMBER}", icon="phone", label="Call Now")
+    else:
+        primary_action = ACTION_TEMPLATE.format(href=_attr(vehicle['page'] or f"tel:{PHONE_NUMBER}"),
+                                                icon="eye", label="View Details")
+    price_note = ""
+    if vehicle['price_note'] and status != 'sold':
+        price_note = f'\n                <span class="text-xs text-gray-500 block">{html.escape(vehicle["price_note"])}</span>'
+    return CARD_TEMPLATE.format(
+        name=_attr(vehicle['name']),
+        listing=_attr(vehicle['listing']),
+        body_type=_attr(vehicle['body_type']),
+        fuel=_attr(vehicle['fuel']),
+        transmission=_attr(vehicle['transmission']),
+        year=_attr(vehicle['year']),
+        search=_attr(vehicle['search']),
+        gallery=_js_list(vehicle['gallery']),
+        image=_attr(vehicle['image']),
+        alt=_attr(f"{vehicle['name']} {vehicle['year']}".strip()),
+        image_class=" opacity-70" if status == 'sold' else "",
+        badge=badge,
+        badge_class=badge_class,
+        badge_icon=badge_icon,
+        subtitle=html.escape(vehicle['subtitle']),
+        type_class=type_class,
+        type_label=html.escape(vehicle['type_label']),
+        seats=html.escape(vehicle['seats']),
+        doors=html.escape(vehicle['doors']),
+        engine=html.escape(vehicle['engine']),
+        condition=html.escape(vehicle['condition']),
+        price_class="text-red-600" if status == 'sold' else "text-red",
+        price="SOLD" if status == 'sold' else html.escape(vehicle['price']),
+        price_note=price_note,
+        primary_action=primary_action,
+        whatsapp_url=WHATSAPP_URL,
+    )
+
+
+def render_stats(vehicles):
+    stats = (
+        ("Total Vehicles", len(vehicles)),
+        ("For Sale", sum(1 for v in vehicles if v['listing'] == 'sale')),
+        ("For Hire", sum(1 for v in vehicles if v['listing'] == 'hire')),
+        ("Available Now", sum(1 for v in vehicles if not v['sold'])),
+    )
+    return "".join(STAT_TEMPLATE.format(label=label, value=value) for label, value in stats)
+
+
+def vehicle_data(vehicles):
+    """The client-side records: display fields plus pre-normalized search/sort keys."""
+    data = []
+    for index, vehicle in enumerate(vehicles, 1):
+        currency, amount = parse_price(vehicle['price'])
+        data.append({
+            'id': index,
+            'name': vehicle['name'],
+            'page': vehicle['page'],
+            'category': vehicle['body_type'],
+            'type': vehicle['listing'],
+            'sold': vehicle['sold'],
+            'year': _leading_int(str(vehicle['year'])),
+            'mileage': _leading_int(vehicle['mileage']),
+            'fuel': vehicle['fuel'],
+            'transmission': vehicle['transmission'],
+            'seats': _leading_int(vehicle['seats']),
+            'doors': _leading_int(vehicle['doors']),
+            'price': vehicle['price'],
+            'priceValue': amount,
+            'currency': currency,
+            'image': vehicle['image'],
+            'search': vehicle['search'],
+        })
+    return data
+
+
+def _tokens(text):
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+
+def search_index(vehicles):
+    """
+    Inverted index over the vehicle rows, for prefix search by binary search on the
+    client. `tokens` is sorted and `postings[i]` holds the ascending row numbers
+    (positions in `vehicles`, and so in the inventory cards) containing tokens[i].
+    Free-text tokens come from make, model, year, fuel, transmission, body type and
+    listing type (the cards' data-search words and more); "category:" and "type:" keys
+    support the exact-match dropdown filters. `year` and `priceZmw` are numeric
+    columns, aligned with the rows, for the range filters.
+    """
+    postings = {}
+    year_column = []
+    price_column = []
+    for row, vehicle in enumerate(vehicles):
+        words = _tokens(" ".join((vehicle['name'], str(vehicle['year']), vehicle['fuel'], vehicle['transmission'],
+                                  vehicle['body_type'], vehicle['type_label'], vehicle['listing'])))
+        keys = set(words) | {f"category:{vehicle['body_type'].lower()}", f"type:{vehicle['listing']}"}
+        for key in keys:
+            postings.setdefault(key, []).append(row)
+
+        currency, amount = parse_price(vehicle['price'])
+        year_column.append(_leading_int(str(vehicle['year'])))
+        price_column.append(round(amount * ZMW_PER_USD) if currency == 'USD' else amount)
+
+    tokens = sorted(postings)
+    return {
+        'tokens': tokens,
+        'postings': [postings[token] for token in tokens],
+        'year': year_column,
+        'priceZmw': price_column,
+    }
+
+
+def replace_between(content, start_marker, end_marker, replacement):
+    """Replace the lines between two marker comments, keeping the markers themselves."""
+    start = content.find(start_marker)
+    end = content.find(end_marker, start)
+    if start == -1 or end == -1:
+        raise ValueError(f"{INVENTORY_FILE} is missing the {start_marker} / {end_marker} markers "
+                         f"(run with --import-cards once to add them)")
+    end_line = content.rfind('\n', 0, end) + 1
+    return content[:start + len(start_marker)] + "\n" + replacement + content[end_line:]
+
+
+def import_cards(inventory_html, catalog):
+    """
+    Seed the listing from the hand-written cards and put the @generated markers
+    around the card grid and the stats block. Returns (listing, marked-up html).
+    """
+    soup = BeautifulSoup(inventory_html, 'html.parser')
+    listing = []
+    for card in soup.find_all('div', class_='vehicle-card'):
+        link = card.find('a', href=re.compile(r'^vehicle-.*\.html$'))
+        page = link['href'] if link else None
+        price_spans = card.select('div.text-right > span')
+        subtitle = card.find('p', class_='text-xs text-gray-500')
+        pill = card.find('h3').find_parent('div').find_next_sibling('span')
+        badge = card.find('span', class_=re.compile(r'shadow-md'))
+        entry = {
+            'page': page,
+            'name': card['data-name'],
+            'listing': card['data-category'],
+            'sold': bool(badge and 'SOLD' in badge.get_text()),
+            'body_type': card['data-type'],
+            'condition': card.find('span', class_='text-xs text-gray-500 font-medium').get_text(strip=True),
+            'subtitle': subtitle.get_text(" ", strip=True) if subtitle else "",
+            'price_note': price_spans[1].get_text(strip=True) if len(price_spans) > 1 else "",
+        }
+        label = " ".join(pill.get_text().split()) if pill else ""
+        if label and label != BODY_TYPES.get(entry['body_type'], ("",))[0]:
+            entry['type_label'] = label
+
+        # Card values are only kept where the detail page has nothing to offer
+        specs = card.select('div.space-y-1 span:not(.text-gray-300)')
+        image = card.find('img')
+        card_fields = {
+            'year': card.get('data-year', ''),
+            'fuel': card.get('data-fuel', ''),
+            'transmission': card.get('data-transmission', ''),
+            'seats': specs[0].get_text(strip=True) if len(specs) > 0 else "",
+            'doors': specs[1].get_text(strip=True) if len(specs) > 1 else "",
+            'engine': specs[2].get_text(strip=True) if len(specs) > 2 else "",
+            'price': price_spans[0].get_text(strip=True) if price_spans else "",
+            'image': image['src'] if image else "",
+        }
+        from_page = build_vehicle({**entry, 'price_note': ""}, catalog) if page in catalog else {}
+        entry.update({key: value for key, value in card_fields.items() if value and not from_page.get(key)})
+        # A secondary price the page's own price line already shows would be printed twice
+        note_amount = re.sub(r'\D', '', entry['price_note'])
+        if note_amount and note_amount in re.sub(r'\D', '', from_page.get('price', '')):
+            entry['price_note'] = ""
+        listing.append(entry)
+
+    content = inventory_html
+    first_card = content.index('\n        <!-- Vehicle 1 - ')
+    last_card_end = content.rfind('\n        </div>\n      </div>', 0, content.index('<!-- Load More Button -->'))
+    grid_close = last_card_end + len('\n        </div>')
+    content = (content[:first_card] + "\n        " + CARDS_START + content[first_card:grid_close]
+               + "\n        " + CARDS_END + content[grid_close:])
+    stats = re.search(r'(Inventory Stats\s*</h3>\s*<div class="space-y-3">\n)(.*?)(\s*</div>\s*</div>\s*</div>\s*<!-- Results Counter)',
+                      content, re.DOTALL)
+    content = (content[:stats.start(2)] + "              " + STATS_START + "\n" + stats.group(2)
+               + "\n              " + STATS_END + content[stats.end(2):])
+    return listing, content
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the inventory cards and vehicle-data.json from the catalog.")
+    parser.add_argument('--import-cards', action='store_true',
+                        help=f"seed {LISTING_FILE} from the hand-written cards in {INVENTORY_FILE} and add the markers")
+    args = parser.parse_args(argv)
+
+    root = vehicle_catalog.SITE_ROOT
+    catalog = vehicle_catalog.load_catalog(root)
+    with open(root / INVENTORY_FILE, 'r', encoding='utf-8') as f:
+        inventory_html = f.read()
+
+    if args.import_cards:
+        if (root / LISTING_FILE).exists():
+            print(f"{LISTING_FILE} already exists; edit it instead of re-importing")
+            sys.exit(1)
+        listing, inventory_html = import_cards(inventory_html, catalog)
+        with open(root / LISTING_FILE, 'w', encoding='utf-8') as f:
+            json.dump(listing, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Imported {len(listing)} cards into {LISTING_FILE}")
+    else:
+        listing = load_listing(root / LISTING_FILE)
+
+    missing = [entry['page'] for entry in listing if entry.get('page') and entry['page'] not in catalog]
+    if missing:
+        print(f"Listing refers to missing vehicle pages: {', '.join(missing)}")
+        sys.exit(1)
+
+    vehicles = [build_vehicle(entry, catalog) for entry in listing]
+    inventory_html = replace_between(inventory_html, CARDS_START, CARDS_END,
+                                     "\n".join(render_card(vehicle) for vehicle in vehicles))
+    inventory_html = replace_between(inventory_html, STATS_START, STATS_END, render_stats(vehicles))
+    # The cards' icons point at the sprite, if icon_sprite.py has been run
+    sprite = icon_sprite.current_sprite(root)
+    if sprite:
+        inventory_html = icon_sprite.link_icons(inventory_html, *sprite)
+    data = json.dumps({'vehicles': vehicle_data(vehicles), 'index': search_index(vehicles)},
+                      ensure_ascii=False, separators=(',', ':'))
+
+    with page_writer.PageWriter(root) as writer:
+        writer.write(INVENTORY_FILE, inventory_html)
+        writer.write(DATA_FILE, data + "\n")
+
+    print(f"Generated {len(vehicles)} inventory cards and {DATA_FILE} ({len(data):,} bytes)")
+    print(f"  {len(writer.written)} files written, {len(writer.unchanged)} unchanged")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Build-time replacement for the Lucide runtime.
+The pages loaded https://unpkg.com/lucide@latest and called lucide.createIcons()
+to turn every <i data-lucide="name"> into an inline SVG on each page view. This
+stage scans the pages, scripts and page-generating templates for the icon names
+in use and writes:
+  icons.<hash>.svg  one sprite with a <symbol> per icon, cached across pages
+  icons.<hash>.js   a few lines that stand in for window.lucide: createIcons()
+                    converts <i data-lucide> markup inserted by page scripts
+Static <i data-lucide> tags are rewritten to <svg><use href="icons.<hash>.svg#name">
+with the attributes Lucide would have given them, and the unpkg script tag is
+replaced by the small icons.<hash>.js. Re-running swaps the hash everywhere and
+deletes the stale pair.
+
+Icons are read from the copies of the pinned lucide-static release vendored
+in vendor/lucide-static/ (one <name>.svg per icon the site uses), so the build
+needs no network. --vendor downloads the used icons from the release into that
+directory; --icons reads another local icons directory instead. Names that
+Lucide does not have are reported and left as they are; the runtime rendered
+nothing for them either.
+
+Usage:
+  python icon_sprite.py                    # build the sprite and rewrite the pages
+  python icon_sprite.py --vendor           # first download the used icons into vendor/lucide-static/
+  python icon_sprite.py --icons DIR        # read <name>.svg files from DIR instead of the vendored copies
+"""
+
+import argparse
+import json
+import re
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import build_manifest
+import generate_inventory
+from page_writer import PageWriter
+
+LUCIDE_VERSION = "0.263.1"
+ICON_URL = "https://unpkg.com/lucide-static@{version}/icons/{name}.svg"
+VENDOR_DIR = "vendor/lucide-static"
+
+SPRITE_PATTERN = re.compile(r'^icons\.[0-9a-f]{10}\.(svg|js)$')
+# Files whose markup ends up in pages without being a page themselves
+TEMPLATE_SOURCES = ('generate_inventory.py', 'standardize_to_subaru.py')
+
+ICON_NAME_PATTERN = re.compile(r'data-lucide="([a-z0-9-]+)"')
+# generate_inventory fills data-lucide="{icon}" placeholders from keyword arguments like icon="eye"
+TEMPLATE_ICON_PATTERN = re.compile(r'\bicon="([a-z0-9-]+)"')
+ICON_TAG_PATTERN = re.compile(r'<i\b([^>]*?)\sdata-lucide="([a-z0-9-]+)"([^>]*)>\s*</i>')
+ATTRIBUTE_PATTERN = re.compile(r'([\w:-]+)="([^"]*)"')
+SCRIPT_BLOCK_PATTERN = re.compile(r'<script\b.*?</script>', re.DOTALL | re.IGNORECASE)
+LUCIDE_SCRIPT_PATTERN = re.compile(r'<script src="https://unpkg\.com/lucide@[^"]*"[^>]*></script>')
+# Matched by the URL alone: pages re-serialized by BeautifulSoup reorder attributes
+SPRITE_URL_PATTERN = re.compile(r'(?<=")icons\.[0-9a-f]{10}\.(svg|js)(?=[#"])')
+
+# The attributes lucide.createIcons() puts on every icon
+SVG_ATTRIBUTES = (('xmlns', 'http://www.w3.org/2000/svg'), ('width', '24'), ('height', '24'),
+                  ('viewBox', '0 0 24 24'), ('fill', 'none'), ('stroke', 'currentColor'),
+                  ('stroke-width', '2'), ('stroke-linecap', 'round'), ('stroke-linejoin', 'round'))
+
+SHIM_TEMPLATE = """// Generated by icon_sprite.py: stands in for the lucide runtime on pages that build markup with
+// <i data-lucide="..."> and then call lucide.createIcons()
+(() => {{
+  const SPRITE = '{sprite}';
+  const ICONS = new Set({names});
+  const ATTRIBUTES = {attributes};
+  const SVG_NS = 'http://www.w3.org/2000/svg';
+
+  function createIcons() {{
+    document.querySelectorAll('i[data-lucide]').forEach(element => {{
+      const name = element.getAttribute('data-lucide');
+      if (!ICONS.has(name)) {{
+        return;
+      }}
+      const svg = document.createElementNS(SVG_NS, 'svg');
+      ATTRIBUTES.forEach(([attr, value]) => svg.setAttribute(attr, value));
+      Array.from(element.attributes).forEach(attr => svg.setAttribute(attr.name, attr.value));
+      svg.setAttribute('class', `lucide lucide-${{name}} ${{element.getAttribute('class') || ''}}`.trim());
+      svg.setAttribute('aria-hidden', 'true');
+      const use = document.createElementNS(SVG_NS, 'use');
+      use.setAttribute('href', `${{SPRITE}}#${{name}}`);
+      svg.appendChild(use);
+      element.replaceWith(svg);
+    }});
+  }}
+
+  window.lucide = {{ createIcons }};
+}})();
+"""
+
+SITE_ROOT = Path(__file__).parent
+
+
+def content_files(root=SITE_ROOT):
+    """Pages, scripts and templates scanned for icon names."""
+    root = Path(root)
+    files = sorted(p for p in root.iterdir()
+                   if p.is_file() and p.suffix in ('.html', '.js') and not SPRITE_PATTERN.match(p.name))
+    return files + [root / name for name in TEMPLATE_SOURCES if (root / name).exists()]
+
+
+def used_icons(root=SITE_ROOT):
+    """Every icon name referenced anywhere, including the ones generate_inventory fills into its card template."""
+    names = set()
+    for path in content_files(root):
+        text = path.read_text(encoding='utf-8', errors='replace')
+        names.update(ICON_NAME_PATTERN.findall(text))
+        if path.name in TEMPLATE_SOURCES:
+            names.update(TEMPLATE_ICON_PATTERN.findall(text))
+    names.update(icon for _, _, icon in generate_inventory.BADGES.values())
+    return sorted(names)
+
+
+def load_icon(name, icons_dir=None, root=SITE_ROOT):
+    """The SVG source of one icon, or None if there is no such icon in the icons directory."""
+    path = Path(icons_dir if icons_dir is not None else Path(root) / VENDOR_DIR) / f"{name}.svg"
+    return path.read_text(encoding='utf-8') if path.exists() else None
+
+
+def download_icon(name):
+    """The SVG source of one icon from the pinned release, or None if Lucide has no such icon."""
+    url = ICON_URL.format(version=LUCIDE_VERSION, name=name)
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    except urllib.error.URLError as e:
+        raise RuntimeError(f"Could not download {url} ({e.reason})") from e
+
+
+def vendor_icons(names, root=SITE_ROOT):
+    """Download `names` from the pinned release into VENDOR_DIR; returns the names Lucide does not have."""
+    vendor_dir = Path(root) / VENDOR_DIR
+    vendor_dir.mkdir(parents=True, exist_ok=True)
+    missing = []
+    for name in names:
+        svg = download_icon(name)
+        if svg is None:
+            missing.append(name)
+        else:
+            (vendor_dir / f"{name}.svg").write_text(svg, encoding='utf-8')
+    return missing
+
+
+def symbol(name, svg):
+    """A <symbol> with the icon's shapes, comments and whitespace stripped."""
+    inner = svg[svg.index('>', svg.index('<svg')) + 1:svg.rindex('</svg>')]
+    inner = re.sub(r'<!--.*?-->', '', inner, flags=re.DOTALL)
+    inner = re.sub(r'>\s+<', '><', inner.strip())
+    inner = re.sub(r'\s*/>', '/>', inner)
+    return f'<symbol id="{name}" viewBox="0 0 24 24">{inner}</symbol>'
+
+
+def build_sprite(names, icons_dir=None, root=SITE_ROOT):
+    """(sprite svg, icons included, names Lucide does not have)."""
+    symbols, included, missing = [], [], []
+    for name in names:
+        svg = load_icon(name, icons_dir, root)
+        if svg is None:
+            missing.append(name)
+            continue
+        symbols.append(symbol(name, svg))
+        included.append(name)
+    sprite = (f'<svg xmlns="http://www.w3.org/2000/svg">'
+              f'<!-- lucide-static - ISC -->{"".join(symbols)}</svg>\n')
+    return sprite, included, missing
+
+
+def render_shim(sprite_name, names):
+    return SHIM_TEMPLATE.format(sprite=sprite_name, names=json.dumps(names),
+                                attributes=json.dumps([list(pair) for pair in SVG_ATTRIBUTES]))
+
+
+def current_sprite(root=SITE_ROOT):
+    """(sprite file name, icon names in it) for the built sprite, or None if the stage has not run."""
+    sprites = sorted(p for p in Path(root).glob('icons.*.svg') if SPRITE_PATTERN.match(p.name))
+    if not sprites:
+        return None
+    return sprites[-1].name, set(re.findall(r'<symbol id="([a-z0-9-]+)"', sprites[-1].read_text(encoding='utf-8')))
+
+
+def _svg_tag(name, attributes, sprite_name):
+    attrs = dict(SVG_ATTRIBUTES)
+    attrs.update(ATTRIBUTE_PATTERN.findall(attributes))
+    attrs['class'] = f"lucide lucide-{name} {attrs.get('class', '')}".strip()
+    attrs['data-lucide'] = name
+    attrs['aria-hidden'] = 'true'
+    rendered = ' '.join(f'{key}="{value}"' for key, value in attrs.items())
+    return f'<svg {rendered}><use href="{sprite_name}#{name}"></use></svg>'
+
+
+def link_icons(html, sprite_name, names):
+    """
+    `html` with static icons pointing at `sprite_name` and the lucide script swapped
+    for the shim. Markup inside <script> blocks is left for the shim to convert.
+    """
+    html = SPRITE_URL_PATTERN.sub(lambda m: sprite_name[:-3] + m.group(1), html)
+    shim_name = sprite_name[:-3] + 'js'
+    html = LUCIDE_SCRIPT_PATTERN.sub(f'<script src="{shim_name}"></script>', html)
+
+    def replace_icon(match):
+        before, name, after = match.groups()
+        if name not in names:
+            return match.group(0)
+        return _svg_tag(name, before + after, sprite_name)
+
+    out, position = [], 0
+    for script in SCRIPT_BLOCK_PATTERN.finditer(html):
+        out.append(ICON_TAG_PATTERN.sub(replace_icon, html[position:script.start()]))
+        out.append(script.group(0))
+        position = script.end()
+    out.append(ICON_TAG_PATTERN.sub(replace_icon, html[position:]))
+    return ''.join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Lucide icon sprite and rewrite the pages to use it.")
+    parser.add_argument('--icons', metavar='DIR',
+                        help=f"directory of lucide-static <name>.svg files (default: {VENDOR_DIR})")
+    parser.add_argument('--vendor', action='store_true',
+                        help=f"download the used icons from lucide-static {LUCIDE_VERSION} into {VENDOR_DIR} first")
+    args = parser.parse_args(argv)
+
+    names = used_icons(SITE_ROOT)
+    if args.vendor:
+        vendor_icons(names, SITE_ROOT)
+    sprite, included, missing = build_sprite(names, args.icons, SITE_ROOT)
+    digest = build_manifest.hash_bytes(sprite)[:10]
+    sprite_name = f"icons.{digest}.svg"
+    shim_name = f"icons.{digest}.js"
+    stale = [p for p in SITE_ROOT.iterdir() if SPRITE_PATTERN.match(p.name) and p.name not in (sprite_name, shim_name)]
+
+    with PageWriter(SITE_ROOT) as writer:
+        writer.write(sprite_name, sprite)
+        writer.write(shim_name, render_shim(sprite_name, included))
+        rewritten = 0
+        for page in sorted(SITE_ROOT.glob('*.html')):
+            html = page.read_text(encoding='utf-8')
+            new_html = link_icons(html, sprite_name, set(included))
+            if new_html != html:
+                writer.write(page, new_html)
+                rewritten += 1
+    for path in stale:
+        path.unlink()
+
+    print(f"Icon sprite {sprite_name}: {len(included)} icons, {len(sprite.encode('utf-8')) / 1024:.1f} KB")
+    print(f"  Pages rewritten: {rewritten}")
+    print(f"  Stale sprites removed: {len(stale)}")
+    if missing:
+        print(f"  Not in lucide-static (left as empty <i>): {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+// Generated by icon_sprite.py: stands in for the lucide runtime on pages that build markup with
+// <i data-lucide="..."> and then call lucide.createIcons()
+(() => {
+  const SPRITE = 'icons.c61fd14984.svg';
+  const ICONS = new Set(["alert-circle", "alert-triangle", "arrow-right", "award", "bar-chart", "battery", "battery-charging", "briefcase", "building", "calendar", "car", "check", "check-circle", "chevron-right", "clock", "cloud-rain", "credit-card", "disc", "dollar-sign", "droplet", "eye", "facebook", "file-text", "filter", "fuel", "gauge", "gavel", "globe", "grid", "headphones", "heart", "home", "info", "instagram", "key", "leaf", "lightbulb", "loader", "lock", "mail", "map", "map-pin", "maximize-2", "menu", "message-circle", "minus", "mountain", "music", "newspaper", "package", "palette", "percent", "phone", "plus", "radio", "rotate-ccw", "search", "send", "settings", "shield", "shield-check", "ship", "smartphone", "star", "tag", "thermometer", "trending-down", "trending-up", "truck", "twitter", "umbrella", "user", "users", "video", "wind", "wrench", "x", "x-circle", "zap"]);
+  const ATTRIBUTES = [["xmlns", "http://www.w3.org/2000/svg"], ["width", "24"], ["height", "24"], ["viewBox", "0 0 24 24"], ["fill", "none"], ["stroke", "currentColor"], ["stroke-width", "2"], ["stroke-linecap", "round"], ["stroke-linejoin", "round"]];
+  const SVG_NS = 'http://www.w3.org/2000/svg';
+
+  function createIcons() {
+    document.querySelectorAll('i[data-lucide]').forEach(element => {
+      const name = element.getAttribute('data-lucide');
+      if (!ICONS.has(name)) {
+        return;
+      }
+      const svg = document.createElementNS(SVG_NS, 'svg');
+      ATTRIBUTES.forEach(([attr, value]) => svg.setAttribute(attr, value));
+      Array.from(element.attributes).forEach(attr => svg.setAttribute(attr.name, attr.value));
+      svg.setAttribute('class', `lucide lucide-${name} ${element.getAttribute('class') || ''}`.trim());
+      svg.setAttribute('aria-hidden', 'true');
+      const use = document.createElementNS(SVG_NS, 'use');
+      use.setAttribute('href', `${SPRITE}#${name}`);
+      svg.appendChild(use);
+      element.replaceWith(svg);
+    });
+  }
+
+  window.lucide = { createIcons };
+})();
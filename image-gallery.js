@@ -119,7 +119,7 @@ class ImageGallery {
                 thumb.style.cursor = 'pointer';
                 thumb.addEventListener('click', function() {
                     // Update main image
-                    mainImage.src = this.src.replace('thumb', 'main');
+                    setMainImage(mainImage, this.src.replace('thumb', 'main'), this);
                     
                     // Update active thumbnail styling
                     thumbnails.forEach(t => t.classList.remove('ring-2', 'ring-blue-500'));
@@ -150,6 +150,40 @@ class ImageGallery {
     }
 }
 
+// Swap the main image. Pages built with responsive variants carry srcset on the
+// <img> and typed <source>s in its <picture>, which take precedence over src, so
+// those are copied from the clicked thumbnail (or cleared if it has none)
+function setMainImage(mainImage, src, thumb) {
+    const thumbPicture = thumb ? thumb.closest('picture') : null;
+    const mainPicture = mainImage.closest('picture');
+    if (mainPicture) {
+        mainPicture.querySelectorAll('source').forEach(source => {
+            const match = source.type && thumbPicture ?
+                thumbPicture.querySelector(`source[type="${source.type}"]`) : null;
+            if (match) {
+                source.srcset = match.srcset;
+            } else {
+                source.remove();
+            }
+        });
+    }
+    if (thumb && thumb.srcset) {
+        mainImage.srcset = thumb.srcset;
+    } else {
+        mainImage.removeAttribute('srcset');
+    }
+    mainImage.src = src;
+}
+
+// Used by the thumbnail containers' onclick handlers on the standardized vehicle pages
+window.changeMainImage = function(src) {
+    const mainImage = document.querySelector('.main-vehicle-image');
+    if (!mainImage) return;
+    const thumb = Array.from(document.querySelectorAll('.thumbnail-image'))
+        .find(t => t.getAttribute('src') === src);
+    setMainImage(mainImage, src, thumb);
+};
+
 // Initialize gallery when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
     new ImageGallery();
@@ -0,0 +1,215 @@
+"""
+Responsive image build stage for images/vehicles/.
+Every source photo is resized to a set of widths and encoded as JPEG, WebP and
+(when Pillow supports it) AVIF, across a process pool. Variants are written to
+images/vehicles/variants/ and listed in a manifest keyed by the source's sha256,
+so unchanged photos are skipped on the next run. standardize_to_subaru reads the
+manifest to emit <picture> sources and srcset/sizes for the gallery images.
+
+A photo that cannot be decoded (truncated, corrupt) is reported and left out of
+the manifest, so its pages keep the original; the other photos are still built
+and the manifest saved. Any file in the variant directory that the manifest does
+not list, such as the leftovers of a run that was interrupted, is removed.
+
+Requires Pillow (pip install Pillow).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+SOURCE_DIR = "images/vehicles"
+VARIANT_DIR = "images/vehicles/variants"
+MANIFEST_FILE = "images/vehicles/variants/manifest.json"
+MANIFEST_VERSION = 1
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Thumbnails render ~80-150px wide, the main gallery image up to ~640px (1280px on 2x screens)
+WIDTHS = (160, 320, 640, 1280)
+
+# (format, extension, MIME type, save options), smallest first; <picture> lists them in this order
+FORMATS = (
+    ('AVIF', 'avif', 'image/avif', {'quality': 50}),
+    ('WEBP', 'webp', 'image/webp', {'quality': 75, 'method': 6}),
+    ('JPEG', 'jpg', 'image/jpeg', {'quality': 80, 'optimize': True, 'progressive': True}),
+)
+
+SITE_ROOT = Path(__file__).parent
+
+
+def supported_formats():
+    """The FORMATS entries the installed Pillow can encode."""
+    if Image is None:
+        return []
+    checks = {'AVIF': 'avif', 'WEBP': 'webp'}
+    return [fmt for fmt in FORMATS if fmt[0] not in checks or features.check(checks[fmt[0]])]
+
+
+def hash_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def variant_stem(source_path, digest):
+    """URL-safe variant name: lowercased slug of the file name plus a hash prefix (sources differ only by case or spaces)."""
+    slug = re.sub(r'[^a-z0-9]+', '-', Path(source_path).stem.lower()).strip('-')
+    return f"{slug}-{digest[:8]}"
+
+
+def load_manifest(root=SITE_ROOT):
+    try:
+        with open(Path(root) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        manifest = {'version': MANIFEST_VERSION, 'images': {}}
+    return manifest
+
+
+def save_manifest(manifest, root=SITE_ROOT):
+    path = Path(root) / MANIFEST_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _encode_image(root, source, digest, formats):
+    """Worker: write every width/format variant of one source image. Returns its manifest entry."""
+    root = Path(root)
+    stem = variant_stem(source, digest)
+    variants = []
+    with Image.open(root / source) as original:
+        original.load()
+        image = original.convert('RGB')
+    widths = [w for w in WIDTHS if w < image.width] + [min(image.width, WIDTHS[-1])]
+    for width in sorted(set(widths)):
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt, ext, mime, options in formats:
+            if fmt == 'JPEG' and width == image.width:
+                # Re-encoding the original at full size only loses quality; the fallback is the source itself
+                variants.append({'width': width, 'type': mime, 'path': source})
+                continue
+            rel_path = f"{VARIANT_DIR}/{stem}-{width}w.{ext}"
+            tmp_path = root / f"{rel_path}.tmp"
+            resized.save(tmp_path, fmt, **options)
+            os.replace(tmp_path, root / rel_path)
+            variants.append({'width': width, 'type': mime, 'path': rel_path})
+    return {'sha256': digest, 'width': image.width, 'height': image.height, 'variants': variants}
+
+
+def _encode_one(args):
+    """Worker: (source, manifest entry, None), or (source, None, error) when the source cannot be decoded."""
+    root, source, digest, formats = args
+    try:
+        return source, _encode_image(root, source, digest, formats), None
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        return source, None, f"{type(e).__name__}: {e}"
+
+
+def build_images(root=SITE_ROOT, jobs=1, force=False):
+    """
+    Bring the variants and manifest up to date. Returns (manifest, rebuilt,
+    skipped, removed, failed), failed being {source: error} for the sources
+    that could not be decoded.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required for the image build (pip install Pillow)")
+    root = Path(root)
+    formats = supported_formats()
+    format_key = ','.join(fmt[1] for fmt in formats)
+    manifest = load_manifest(root)
+    old_entries = manifest['images']
+    (root / VARIANT_DIR).mkdir(parents=True, exist_ok=True)
+
+    sources = sorted(f"{SOURCE_DIR}/{p.name}" for p in (root / SOURCE_DIR).iterdir()
+                     if p.is_file() and p.suffix.lower() in SOURCE_EXTENSIONS)
+    entries = {}
+    todo = []
+    for source in sources:
+        digest = hash_file(root / source)
+        entry = old_entries.get(source)
+        up_to_date = (not force and entry and entry['sha256'] == digest and entry.get('formats') == format_key
+                      and all((root / v['path']).exists() for v in entry['variants']))
+        if up_to_date:
+            entries[source] = entry
+        else:
+            todo.append((source, digest))
+
+    tasks = [(root, source, digest, formats) for source, digest in todo]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_encode_one, tasks))
+    else:
+        results = [_encode_one(task) for task in tasks]
+    failed = {}
+    for source, entry, error in results:
+        if error:
+            failed[source] = error
+            continue
+        entry['formats'] = format_key
+        entries[source] = entry
+
+    # Drop every variant no current entry refers to: changed, deleted or undecodable sources, interrupted runs
+    live = {v['path'] for entry in entries.values() for v in entry['variants']} | {MANIFEST_FILE}
+    removed = 0
+    for path in sorted((root / VARIANT_DIR).iterdir()):
+        if path.is_file() and f"{VARIANT_DIR}/{path.name}" not in live:
+            path.unlink()
+            removed += 1
+
+    manifest['images'] = entries
+    save_manifest(manifest, root)
+    return manifest, len(todo) - len(failed), len(sources) - len(todo), removed, failed
+
+
+def srcsets(manifest, src):
+    """{MIME type: srcset string} for an image path as referenced from a page, or {} if it has no variants."""
+    entry = manifest['images'].get(src)
+    if not entry:
+        return {}
+    by_type = {}
+    for variant in entry['variants']:
+        by_type.setdefault(variant['type'], []).append(f"{variant['path']} {variant['width']}w")
+    return {mime: ", ".join(candidates) for mime, candidates in by_type.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build responsive variants of the vehicle photos.")
+    parser.add_argument('--jobs', type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument('--force', action='store_true', help="re-encode every image, even if unchanged")
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    print(f"Building responsive images ({', '.join(fmt[1] for fmt in supported_formats())}) with {jobs} workers...")
+    manifest, rebuilt, skipped, removed, failed = build_images(SITE_ROOT, jobs, args.force)
+
+    source_bytes = sum((SITE_ROOT / src).stat().st_size for src in manifest['images'])
+    variant_bytes = sum((SITE_ROOT / v['path']).stat().st_size
+                        for entry in manifest['images'].values() for v in entry['variants']
+                        if v['path'].startswith(VARIANT_DIR + '/'))
+    print(f"  Encoded: {rebuilt} images")
+    print(f"  Unchanged (skipped): {skipped} images")
+    print(f"  Stale variants removed: {removed}")
+    print(f"  Failed (kept the original): {len(failed)} images")
+    for source, error in failed.items():
+        print(f"    {source}: {error}")
+    print(f"  Originals: {source_bytes / 1e6:.1f} MB, all variants: {variant_bytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
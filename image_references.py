@@ -0,0 +1,173 @@
+"""
+Image reference index for the site.
+Streams every page and script in the site root once, line by line, and records
+which images each file references (src, srcset, data-gallery, onclick strings,
+CSS url()...) and, in reverse, which files reference each image. The report lists:
+  orphaned  image files under images/ that nothing references (dead deploy weight)
+  dangling  references to images that do not exist (exact, case-sensitive match,
+            as on the web server); the responsive variants in image_pipeline.py's
+            manifest count as existing, since that stage writes them at build time
+  spaces    image file names containing whitespace, which must be %20-escaped in URLs
+
+Usage:
+  python image_references.py                  # report
+  python image_references.py --backups        # also count backups/*.html as references
+  python image_references.py --json PATH      # also write the index as JSON
+  python image_references.py --strict         # exit 1 if any reference is dangling
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import unquote
+
+import image_pipeline
+
+IMAGE_DIR = "images"
+PAGE_EXTENSIONS = ('.html', '.js', '.css')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif', '.svg')
+
+# A path under images/ up to its image extension; file names may contain spaces,
+# so the match stops only at quotes, markup, commas (srcset, data-gallery) and parentheses
+IMAGE_REF_PATTERN = re.compile(
+    r'(?:\./|/)?(images/[^"\'<>,()\n]*?\.(?:jpe?g|png|webp|avif|gif|svg))(?![\w.])', re.IGNORECASE)
+
+SITE_ROOT = Path(__file__).parent
+
+
+@dataclass
+class ImageIndex:
+    # image path (relative to the site root) -> files that reference it
+    image_pages: dict = field(default_factory=dict)
+    # referencing file -> images it references
+    page_images: dict = field(default_factory=dict)
+    # image files present on disk -> size in bytes
+    image_files: dict = field(default_factory=dict)
+    # responsive variants image_pipeline.py's manifest lists
+    variant_files: set = field(default_factory=set)
+
+    def orphaned(self):
+        return sorted(image for image in self.image_files if image not in self.image_pages)
+
+    def dangling(self):
+        return sorted(image for image in self.image_pages
+                      if image not in self.image_files and image not in self.variant_files)
+
+    def with_spaces(self):
+        return sorted(image for image in self.image_files if re.search(r'\s', image))
+
+
+def get_pages(root, include_backups=False):
+    root = Path(root)
+    pages = sorted(p.name for p in root.iterdir() if p.is_file() and p.suffix.lower() in PAGE_EXTENSIONS)
+    if include_backups and (root / "backups").is_dir():
+        pages += sorted(f"backups/{p.name}" for p in (root / "backups").glob("*.html"))
+    return pages
+
+
+def get_image_files(root):
+    """Every image under images/ with its size, except the generated responsive variants."""
+    root = Path(root)
+    images = {}
+    for dirpath, dirnames, filenames in os.walk(root / IMAGE_DIR):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        # image_pipeline.py owns the variants directory and prunes it itself
+        dirnames[:] = [d for d in dirnames if f"{rel_dir}/{d}" != image_pipeline.VARIANT_DIR]
+        for filename in filenames:
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                images[f"{rel_dir}/{filename}"] = (Path(dirpath) / filename).stat().st_size
+    return images
+
+
+def get_variant_files(root):
+    """Paths of every responsive variant in image_pipeline.py's manifest."""
+    return {variant['path'] for entry in image_pipeline.load_manifest(root)['images'].values()
+            for variant in entry['variants'] if variant['path'].startswith(image_pipeline.VARIANT_DIR + '/')}
+
+
+def scan_references(path):
+    """The set of image paths referenced by one file, read a line at a time."""
+    found = set()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if 'images/' not in line:
+                continue
+            for match in IMAGE_REF_PATTERN.finditer(line):
+                found.add(unquote(match.group(1)))
+    return found
+
+
+def build_index(root=SITE_ROOT, include_backups=False):
+    root = Path(root)
+    index = ImageIndex(image_files=get_image_files(root), variant_files=get_variant_files(root))
+    for page in get_pages(root, include_backups):
+        images = scan_references(root / page)
+        index.page_images[page] = sorted(images)
+        for image in images:
+            index.image_pages.setdefault(image, []).append(page)
+    return index
+
+
+def _case_match(image, image_files):
+    """An existing file whose path differs from `image` only by case, if any."""
+    lowered = image.lower()
+    return next((existing for existing in image_files if existing.lower() == lowered), None)
+
+
+def print_report(index):
+    orphaned = index.orphaned()
+    dangling = index.dangling()
+    spaced = index.with_spaces()
+
+    print(f"Scanned {len(index.page_images)} files: {len(index.image_pages)} distinct images referenced, "
+          f"{len(index.image_files)} image files on disk")
+    print("=" * 60)
+
+    orphaned_bytes = sum(index.image_files[image] for image in orphaned)
+    print(f"\nOrphaned images ({len(orphaned)}, {orphaned_bytes / 1e6:.2f} MB):")
+    for image in orphaned:
+        print(f"  {index.image_files[image]:>10,}  {image}")
+
+    print(f"\nDangling references ({len(dangling)}):")
+    for image in dangling:
+        pages = index.image_pages[image]
+        case_match = _case_match(image, index.image_files)
+        hint = f" (case differs from {case_match})" if case_match else ""
+        print(f"  {image}{hint}")
+        print(f"      referenced by {', '.join(pages[:5])}" + (f" and {len(pages) - 5} more" if len(pages) > 5 else ""))
+
+    print(f"\nImage file names containing spaces ({len(spaced)}):")
+    for image in spaced:
+        print(f"  {image!r}  ({len(index.image_pages.get(image, []))} referencing files)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index image references and report orphaned/dangling images.")
+    parser.add_argument('--backups', action='store_true', help="also scan backups/*.html for references")
+    parser.add_argument('--json', metavar='PATH', help="write the image->pages and page->images index to PATH")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 if any reference is dangling")
+    args = parser.parse_args(argv)
+
+    index = build_index(SITE_ROOT, args.backups)
+    print_report(index)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'images': {image: sorted(pages) for image, pages in sorted(index.image_pages.items())},
+                'pages': index.page_images,
+                'orphaned': {image: index.image_files[image] for image in index.orphaned()},
+                'dangling': index.dangling(),
+            }, f, indent=1)
+        print(f"\nIndex written to {args.json}")
+
+    if args.strict and index.dangling():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
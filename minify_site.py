@@ -0,0 +1,437 @@
+"""
+Minified, precompressed copy of the site for deployment.
+Writes every deployable file into build/dist/ (or --out): pages with comments
+and indentation stripped and their inline <style>/<script> blocks minified,
+standalone stylesheets and scripts minified, JSON compacted, and everything
+else copied as is. Each text file also gets precompressed siblings, name.gz
+(gzip -9) and name.br (brotli, quality 11), so the host can send compressed
+bytes straight from disk instead of compressing per request. A sibling is only
+written when it is smaller than the file itself; the rewrite rules in
+.htaccess (deployed with the site) hand them to clients whose Accept-Encoding
+allows it, with the original file's Content-Type and Vary: Accept-Encoding.
+
+Drafts, internal docs and vehicle-details.html stay behind: a page is left out
+when it matches the exclusions the sitemap and the service-worker precache
+apply (PAGE_EXCLUDE_PATTERNS), so what is deployed is what they list.
+
+The minifiers are deliberately conservative: HTML whitespace is only dropped
+next to block-level tags (elsewhere it is collapsed to one space) and left
+alone inside <pre> and <textarea>; scripts keep a line break wherever one might
+end a statement. Files are processed across a process pool, and files whose
+output bytes are unchanged are not rewritten, so their mtimes stay put for
+rsync-style deploys.
+
+Brotli output needs the brotli package (pip install brotli); without it only
+.gz siblings are written.
+
+Usage:
+  python minify_site.py                  # build build/dist/ and print the savings per file
+  python minify_site.py --out DIR        # write somewhere else
+  python minify_site.py --jobs 4         # worker processes (default: one per CPU)
+"""
+
+import argparse
+import fnmatch
+import gzip
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_service_worker
+from page_writer import PageWriter
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+OUTPUT_DIR = "build/dist"
+
+# Files the site serves; everything else in the repository (scripts, docs, backups) stays behind
+DEPLOY_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.xml', '.txt', '.ico', '.png', '.jpg', '.jpeg',
+                     '.webp', '.avif', '.gif')
+DEPLOY_FILES = ('CNAME', '.htaccess')
+# zamto-africa-script.js is an old site script that no page loads
+EXCLUDE_PATTERNS = ('*backup*', '*.bak', 'requests.jsonl', 'zamto-africa-script.js')
+# Pages left out of the sitemap and the precache: drafts, test pages and internal docs
+PAGE_EXCLUDE_PATTERNS = build_service_worker.EXCLUDE_PATTERNS
+SKIP_DIRS = ('backups', 'build', 'tests', 'vendor')
+# Already-compressed formats gain nothing from gzip or brotli
+COMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.xml', '.txt', '.ico')
+
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'title', 'meta', 'link', 'style', 'script', 'noscript', 'base',
+    'header', 'footer', 'main', 'nav', 'section', 'article', 'aside', 'div', 'p', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'pre', 'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th',
+    'form', 'fieldset', 'legend', 'figure', 'figcaption', 'blockquote', 'hr', 'br', 'picture', 'source',
+    'iframe', 'video', 'audio', 'option', 'select', 'details', 'summary', 'template', '!doctype',
+}
+JS_TYPES = ('', 'text/javascript', 'application/javascript', 'module')
+JSON_TYPES = ('application/ld+json', 'application/json')
+
+HTML_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style|pre|textarea)\b[^>]*>.*?</\1\s*>'
+    r'|<[!/]?[a-zA-Z][^>]*>',
+    re.DOTALL | re.IGNORECASE)
+TAG_NAME_PATTERN = re.compile(r'<[/!]?([a-zA-Z][\w-]*)')
+QUOTED_OR_SPACE_PATTERN = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+TYPE_ATTRIBUTE_PATTERN = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]*)', re.IGNORECASE)
+
+CSS_TOKEN_PATTERN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|\s+', re.DOTALL)
+CSS_TIGHT_PATTERN = re.compile(r'\s*([{};,>])\s*')
+
+JS_IDENTIFIER_CHARS = re.compile(r'[\w$\\]|[^\x00-\x7f]')
+# After these a '/' starts a regular expression rather than a division
+JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new', 'delete', 'void',
+                     'throw', 'yield', 'await', 'of'}
+# A line break right after (or before) these can never end a statement, so it can go
+JS_JOIN_AFTER = set('{;,([')
+JS_JOIN_BEFORE = set('})],;.')
+
+SITE_ROOT = Path(__file__).parent
+
+
+def minify_css(css):
+    """`css` without comments and with whitespace reduced to what the grammar needs."""
+    out, position = [], 0
+
+    def tighten(text):
+        text = CSS_TIGHT_PATTERN.sub(r'\1', re.sub(r'\s+', ' ', text))
+        return re.sub(r':\s+', ':', text)
+
+    # Strings are copied as they are, comments become whitespace, the text between strings is tightened
+    text = ''
+    for match in CSS_TOKEN_PATTERN.finditer(css):
+        if match.group(1):
+            out += [tighten(text + css[position:match.start()]), match.group(1)]
+            text, position = '', match.end()
+        elif match.group(0).startswith('/*'):
+            text += css[position:match.start()] + ' '
+            position = match.end()
+    out.append(tighten(text + css[position:]))
+    return ''.join(out).replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """
+    `js` without comments or indentation. Line breaks that could end a statement
+    are kept (as a single newline), so automatic semicolon insertion is unaffected.
+    """
+    out = []
+    i, n = 0, len(js)
+    pending_space = pending_newline = False
+    # Open template literals' ${ } brace depths; a '}' at depth 0 of the innermost one resumes the literal
+    template_depths = []
+
+    def last_significant():
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ''
+
+    def emit(token):
+        nonlocal pending_space, pending_newline
+        previous = last_significant()
+        if previous:
+            if pending_newline and previous[-1] not in JS_JOIN_AFTER and token[0] not in JS_JOIN_BEFORE:
+                out.append('\n')
+            elif (pending_space or pending_newline) and _needs_space(previous[-1], token[0]):
+                out.append(' ')
+        out.append(token)
+        pending_space = pending_newline = False
+
+    while i < n:
+        char = js[i]
+        if char in ' \t\r\n\f\v\ufeff':
+            start = i
+            while i < n and js[i] in ' \t\r\n\f\v\ufeff':
+                i += 1
+            if '\n' in js[start:i]:
+                pending_newline = True
+            else:
+                pending_space = True
+            continue
+        if js.startswith('//', i):
+            end = js.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if '\n' in js[i:end]:
+                pending_newline = True
+            else:
+                pending_space = True
+            i = end
+            continue
+        if char in '"\'':
+            end = _string_end(js, i, char)
+            emit(js[i:end])
+            i = end
+            continue
+        if char == '`' or (char == '}' and template_depths and template_depths[-1] == 0):
+            if char == '}':
+                template_depths.pop()
+            end, opens_expression = _template_end(js, i + 1)
+            emit(js[i:end])
+            if opens_expression:
+                template_depths.append(0)
+            i = end
+            continue
+        if char == '/' and _regex_allowed(last_significant()):
+            end = _regex_end(js, i)
+            emit(js[i:end])
+            i = end
+            continue
+        if JS_IDENTIFIER_CHARS.match(char):
+            end = i + 1
+            while end < n and JS_IDENTIFIER_CHARS.match(js[end]):
+                end += 1
+            emit(js[i:end])
+            i = end
+            continue
+        if template_depths:
+            if char == '{':
+                template_depths[-1] += 1
+            elif char == '}':
+                template_depths[-1] -= 1
+        emit(char)
+        i += 1
+    return ''.join(out).strip()
+
+
+def _needs_space(before, after):
+    if JS_IDENTIFIER_CHARS.match(before) and JS_IDENTIFIER_CHARS.match(after):
+        return True
+    # a + +b, a - -b, a / /re/ must not fuse into ++, -- or a comment
+    return (before in '+-' and after == before) or (before == '/' and after in '/*')
+
+
+def _string_end(js, start, quote):
+    i = start + 1
+    while i < len(js) and js[i] != quote:
+        i += 2 if js[i] == '\\' else 1
+    return i + 1
+
+
+def _template_end(js, i):
+    """(index after the literal chunk starting at i, whether it stopped at a ${)."""
+    while i < len(js):
+        if js[i] == '\\':
+            i += 2
+        elif js[i] == '`':
+            return i + 1, False
+        elif js.startswith('${', i):
+            return i + 2, True
+        else:
+            i += 1
+    return i, False
+
+
+def _regex_allowed(previous):
+    if not previous:
+        return True
+    if previous[-1] in JS_REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[\w$]+$', previous)
+    return bool(word) and word.group(0) in JS_REGEX_KEYWORDS
+
+
+def _regex_end(js, start):
+    i, in_class = start + 1, False
+    while i < len(js):
+        char = js[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '\n':
+            break
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(js) and JS_IDENTIFIER_CHARS.match(js[i]):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def minify_json(text):
+    try:
+        return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+    except ValueError:
+        return text.strip()
+
+
+def _compact_tag(tag):
+    """A start or end tag with whitespace between attributes collapsed; quoted values are untouched."""
+    compact = QUOTED_OR_SPACE_PATTERN.sub(lambda m: m.group(1) or ' ', tag)
+    return re.sub(r'\s+(/?>)$', r'\1', compact)
+
+
+def _tag_name(token):
+    match = TAG_NAME_PATTERN.match(token)
+    return ('!doctype' if token[:2] == '<!' else match.group(1).lower()) if match else None
+
+
+def _minify_element(token, name):
+    """A whole <script>, <style>, <pre> or <textarea> element with its content minified where that is safe."""
+    open_end = token.index('>') + 1
+    close_start = token.lower().rindex('</')
+    open_tag, body, close_tag = _compact_tag(token[:open_end]), token[open_end:close_start], token[close_start:]
+    if name == 'style':
+        body = minify_css(body)
+    elif name == 'script' and body.strip():
+        script_type = TYPE_ATTRIBUTE_PATTERN.search(open_tag)
+        script_type = script_type.group(1).lower() if script_type else ''
+        if script_type in JS_TYPES:
+            body = minify_js(body)
+        elif script_type in JSON_TYPES:
+            body = minify_json(body)
+    return open_tag + body + close_tag.strip()
+
+
+def minify_html(html):
+    """`html` without comments and with insignificant whitespace removed."""
+    tokens = []  # (kind, text, tag name)
+    position = 0
+    for match in HTML_TOKEN_PATTERN.finditer(html):
+        if match.start() > position:
+            tokens.append(('text', html[position:match.start()], None))
+        token = match.group(0)
+        if token.startswith('<!--'):
+            # Conditional comments still mean something to old IE; other comments go
+            if token.startswith('<!--[if'):
+                tokens.append(('tag', token, None))
+        elif match.group(1):
+            name = match.group(1).lower()
+            tokens.append(('tag', _minify_element(token, name), name))
+        else:
+            tokens.append(('tag', _compact_tag(token), _tag_name(token)))
+        position = match.end()
+    if position < len(html):
+        tokens.append(('text', html[position:], None))
+
+    out = []
+    for i, (kind, text, name) in enumerate(tokens):
+        if kind == 'tag':
+            out.append(text)
+            continue
+        collapsed = re.sub(r'\s+', ' ', text)
+        if collapsed.strip():
+            out.append(collapsed)
+            continue
+        before = next((t[2] for t in reversed(tokens[:i]) if t[0] == 'tag'), None)
+        after = next((t[2] for t in tokens[i + 1:] if t[0] == 'tag'), None)
+        if before in BLOCK_TAGS or after in BLOCK_TAGS or before is None or after is None:
+            continue
+        out.append(' ')
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {'.html': minify_html, '.css': minify_css, '.js': minify_js, '.json': minify_json}
+
+
+def deploy_files(root=SITE_ROOT):
+    """Site-relative paths of every file that goes into the deployed site, sorted."""
+    root = Path(root)
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(('.', '_')) and d not in SKIP_DIRS]
+        rel_dir = Path(dirpath).relative_to(root)
+        for name in filenames:
+            if not (Path(name).suffix.lower() in DEPLOY_EXTENSIONS or name in DEPLOY_FILES):
+                continue
+            if any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDE_PATTERNS):
+                continue
+            if name.lower().endswith('.html') and any(fnmatch.fnmatch(name, pattern)
+                                                      for pattern in PAGE_EXCLUDE_PATTERNS):
+                continue
+            files.append((rel_dir / name).as_posix())
+    return sorted(files)
+
+
+def process_file(root, path):
+    """(path, output bytes, gzip bytes or None, brotli bytes or None, input size) for one file."""
+    source = (Path(root) / path).read_bytes()
+    suffix = Path(path).suffix.lower()
+    data = source
+    minifier = MINIFIERS.get(suffix)
+    if minifier:
+        minified = minifier(source.decode('utf-8')).encode('utf-8')
+        data = minified if len(minified) < len(source) else source
+    gz = br = None
+    if suffix in COMPRESS_EXTENSIONS:
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        gz = gz if len(gz) < len(data) else None
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            br = br if len(br) < len(data) else None
+    return path, data, gz, br, len(source)
+
+
+def build_dist(root=SITE_ROOT, out=None, jobs=1):
+    """Write the deployable site into `out`. Returns (per-file results, files written, stale files removed)."""
+    root = Path(root)
+    out = Path(out) if out is not None else root / OUTPUT_DIR
+    out.mkdir(parents=True, exist_ok=True)
+    files = deploy_files(root)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(process_file, [root] * len(files), files, chunksize=4))
+    else:
+        results = [process_file(root, path) for path in files]
+
+    expected = set()
+    with PageWriter(out) as writer:
+        for path, data, gz, br, _ in results:
+            for name, content in ((path, data), (path + '.gz', gz), (path + '.br', br)):
+                if content is not None:
+                    (out / name).parent.mkdir(parents=True, exist_ok=True)
+                    writer.write(name, content)
+                    expected.add(name)
+    stale = [p for p in out.rglob('*') if p.is_file() and p.relative_to(out).as_posix() not in expected]
+    for path in stale:
+        path.unlink()
+    return results, writer.written, stale
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a minified, precompressed copy of the site for deployment.")
+    parser.add_argument('--out', metavar='DIR', help=f"output directory (default: {OUTPUT_DIR})")
+    parser.add_argument('--jobs', type=int, default=0, help="worker processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    results, written, stale = build_dist(SITE_ROOT, args.out, jobs)
+
+    print(f"{'file':<52}{'original':>10}{'minified':>10}{'gzip':>10}{'brotli':>10}")
+    totals = [0, 0, 0, 0]
+    for path, data, gz, br, size in results:
+        if Path(path).suffix.lower() not in COMPRESS_EXTENSIONS:
+            continue
+        served = [size, len(data), len(gz or data), len(br or gz or data)]
+        totals = [t + s for t, s in zip(totals, served)]
+        print(f"{path:<52}" + ''.join(f"{s / 1024:>9.1f}K" for s in served[:3])
+              + (f"{served[3] / 1024:>9.1f}K" if brotli else f"{'-':>10}"))
+    print(f"{'total':<52}" + ''.join(f"{t / 1024:>9.1f}K" for t in totals[:3])
+          + (f"{totals[3] / 1024:>9.1f}K" if brotli else f"{'-':>10}"))
+    best = totals[3] if brotli else totals[2]
+    print(f"Text files: {totals[0] / 1024:.0f} KB -> {totals[1] / 1024:.0f} KB minified "
+          f"({1 - totals[1] / totals[0]:.0%} saved), {best / 1024:.0f} KB over the wire "
+          f"({1 - best / totals[0]:.0%} saved)")
+    print(f"  {len(results)} files in {args.out or OUTPUT_DIR}, {len(written)} written, {len(stale)} stale removed")
+    if brotli is None:
+        print("  brotli is not installed (pip install brotli): only .gz siblings were written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Atomic, batched writer shared by the page-writing scripts.
+Pages are staged in a temporary directory inside the site root and moved into
+place with atomic renames when the batch is committed, so a crash mid-run never
+leaves a truncated live page. Pages whose bytes are unchanged are not rewritten,
+which keeps their mtime (and CDN / service-worker caches) intact.
+
+fsync policy (ZAMTO_FSYNC, or the `fsync` argument):
+  none   never fsync (fastest; fine for local runs)
+  batch  fsync every staged file once, just before commit, then the directories (default)
+  each   fsync every file as soon as it is staged, then the directories at commit
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+FSYNC_POLICIES = ('none', 'batch', 'each')
+DEFAULT_FSYNC = 'batch'
+ENV_VAR = 'ZAMTO_FSYNC'
+
+
+def encode(content):
+    """Bytes for `content` exactly as a text-mode write would produce them."""
+    if isinstance(content, bytes):
+        return content
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8')
+
+
+def _fsync_file(path):
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path):
+    # Directories cannot be opened for fsync on Windows
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PageWriter:
+    """
+    Stage writes with write(), then commit() them all at once (or use it as a
+    context manager, which commits on success and discards the batch on error).
+    """
+
+    def __init__(self, root, fsync=None):
+        self.root = Path(root)
+        self.fsync = fsync or os.environ.get(ENV_VAR) or DEFAULT_FSYNC
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {self.fsync!r} (expected one of {', '.join(FSYNC_POLICIES)})")
+        self._staging_dir = None
+        self._staged = {}
+        self.written = []
+        self.unchanged = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def write(self, path, content):
+        """Stage `content` for `path`. Returns False if the file already holds exactly these bytes."""
+        target = Path(path)
+        if not target.is_absolute():
+            target = self.root / target
+        data = encode(content)
+
+        try:
+            if target.stat().st_size == len(data):
+                with open(target, 'rb') as f:
+                    if f.read() == data:
+                        self._staged.pop(target, None)
+                        self.unchanged.append(target)
+                        return False
+        except OSError:
+            pass
+
+        if self._staging_dir is None:
+            self._staging_dir = Path(tempfile.mkdtemp(prefix='.staging-', dir=self.root))
+        staged_path = self._staging_dir / f"{len(self._staged)}-{target.name}"
+        with open(staged_path, 'wb') as f:
+            f.write(data)
+            if self.fsync == 'each':
+                f.flush()
+                os.fsync(f.fileno())
+        self._staged[target] = staged_path
+        return True
+
+    def commit(self):
+        """Move every staged file into place. Returns the list of paths written."""
+        if self.fsync == 'batch':
+            for staged_path in self._staged.values():
+                _fsync_file(staged_path)
+
+        for target, staged_path in self._staged.items():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged_path, target)
+            self.written.append(target)
+
+        if self.fsync != 'none':
+            for directory in sorted({target.parent for target in self._staged}):
+                _fsync_dir(directory)
+
+        self._staged = {}
+        self._cleanup()
+        return self.written
+
+    def abort(self):
+        """Discard everything staged since the last commit."""
+        self._staged = {}
+        self._cleanup()
+
+    def _cleanup(self):
+        if self._staging_dir is not None:
+            shutil.rmtree(self._staging_dir, ignore_errors=True)
+            self._staging_dir = None
@@ -0,0 +1,36 @@
+"""
+HTML parser backend selection for the vehicle extraction code.
+Picks the fastest parser that is installed (selectolax, then lxml, then the
+built-in html.parser). Set ZAMTO_HTML_PARSER to force a specific backend.
+Run the tests in tests/test_parser_backends.py after changing extraction logic
+to confirm every backend still produces identical vehicle data.
+"""
+
+import importlib.util
+import os
+
+# Fastest first; html.parser ships with Python and is always available
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+ENV_VAR = 'ZAMTO_HTML_PARSER'
+
+
+def is_available(backend):
+    if backend == 'html.parser':
+        return True
+    return backend in BACKENDS and importlib.util.find_spec(backend) is not None
+
+
+def available_backends():
+    return [backend for backend in BACKENDS if is_available(backend)]
+
+
+def get_backend():
+    """The backend to use: ZAMTO_HTML_PARSER if set, otherwise the fastest installed one."""
+    requested = os.environ.get(ENV_VAR)
+    if requested:
+        if not is_available(requested):
+            raise ValueError(f"{ENV_VAR}={requested!r} is not an installed backend "
+                             f"(available: {', '.join(available_backends())})")
+        return requested
+    return available_backends()[0]
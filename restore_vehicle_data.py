@@ -1,12 +1,17 @@
 """
 Simplified script to restore original vehicle data with modern design.
+Backups are read from the backup store (see backup_store.py).
 No external dependencies required.
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
 
+import backup_store
+import page_writer
+
 # Files to restore
 FILES_TO_FIX = [
     "vehicle-bmw-5-series-2014.html",
@@ -54,59 +59,101 @@ def read_file(filepath):
         print(f"Error reading {filepath}: {e}")
         return None
 
-def write_file(filepath, content):
-    """Write content to file."""
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    except Exception as e:
-        print(f"Error writing {filepath}: {e}")
-        return False
+# Reference page with the modern header/footer design
+REFERENCE_FILE = "vehicle-toyota-alphard-2020-sale.html"
+
+SITE_ROOT = Path(__file__).parent
+
+TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+# The description meta in either attribute order, possibly across lines
+DESCRIPTION_PATTERN = re.compile(r'<meta\b(?=[^>]*\bname="description")[^>]*\bcontent="(.*?)"',
+                                 re.DOTALL | re.IGNORECASE)
+# The reference page's own vehicle JSON-LD (written by vehicle_schema.py) is not part of the layout
+VEHICLE_SCHEMA_PATTERN = re.compile(r'[ \t]*<script type="application/ld\+json" data-schema="vehicle">.*?</script>\n?',
+                                    re.DOTALL)
 
-def extract_header_footer_from_reference():
-    """Extract modern header and footer from reference file."""
-    script_dir = Path(__file__).parent
-    ref_path = script_dir / "vehicle-toyota-alphard-2020-sale.html"
+def extract_header_footer_from_reference(ref_path=None):
+    """Extract modern header and footer from reference file. Returns (header, footer), or (None, None)."""
+    if ref_path is None:
+        ref_path = SITE_ROOT / REFERENCE_FILE
     
     content = read_file(ref_path)
     if not content:
-        return None, None, None
+        return None, None
     
-    # Extract everything from start to end of </div> after Mobile Menu
-    # This includes <head>, header, and mobile menu
-    header_end = content.find('</div>\n  </div>\n\n    <!-- Breadcrumbs -->')
-    if header_end == -1:
-        header_end = content.find('<!-- Breadcrumbs -->')
-    
-    header = content[:header_end + len('</div>\n  </div>\n')] if header_end != -1 else None
+    # Everything before the Breadcrumbs comment: <head>, header and mobile menu,
+    # ending with the mobile menu's closing </div> line
+    breadcrumbs = content.find('<!-- Breadcrumbs -->')
+    if breadcrumbs == -1:
+        header = None
+    else:
+        line_start = content.rfind('\n', 0, breadcrumbs) + 1
+        header = content[:line_start].rstrip() + '\n'
     
     # Extract footer (from <!-- FOOTER to end)
     footer_start = content.find('  <!-- FOOTER')
     footer = content[footer_start:] if footer_start != -1 else None
     
+    if header is None or footer is None:
+        return None, None
     return header, footer
 
-def restore_file(backup_path, output_path):
+class ReferenceLayout:
+    """
+    The modern header and footer, read and sliced from the reference page once.
+    The header is pre-split around its <title> and meta description so each
+    restored page is composed with a single join.
+    """
+    
+    def __init__(self, header, footer):
+        header = VEHICLE_SCHEMA_PATTERN.sub('', header)
+        self.footer = footer
+        self._segments = []
+        self._slots = []
+        slot_pattern = re.compile(
+            r'(?P<title>(?is:<title>.*?</title>))'
+            r'|(?P<description>(?is:<meta\b[^>]*\bname="description"[^>]*>))'
+        )
+        position = 0
+        for match in slot_pattern.finditer(header):
+            self._segments.append(header[position:match.start()])
+            self._slots.append(match.lastgroup)
+            position = match.end()
+        self._segments.append(header[position:])
+    
+    @classmethod
+    def load(cls, ref_path=None):
+        header, footer = extract_header_footer_from_reference(ref_path)
+        if header is None:
+            return None
+        return cls(header, footer)
+    
+    def header_for(self, title, description):
+        values = {
+            'title': f'<title>{title}</title>',
+            'description': f'<meta name="description" content="{description}" />',
+        }
+        out = [self._segments[0]]
+        for slot, segment in zip(self._slots, self._segments[1:]):
+            out.append(values[slot])
+            out.append(segment)
+        return "".join(out)
+    
+    def compose(self, title, description, body):
+        # modern header + original content + modern footer
+        return self.header_for(title, description) + "\n" + body + "\n" + self.footer
+
+def restore_file(original, output_path, layout, writer):
     """Restore a file with original content but modern header/footer."""
     
-    # Read backup (original)
-    original = read_file(backup_path)
     if not original:
         return False
     
-    # Read reference for modern design
-    script_dir = Path(__file__).parent
-    ref_path = script_dir / "vehicle-toyota-alphard-2020-sale.html"
-    reference = read_file(ref_path)
-    if not reference:
-        return False
-    
     # Extract title and description from original
-    title_match = re.search(r'<title>(.*?)</title>', original, re.DOTALL | re.IGNORECASE)
+    title_match = TITLE_PATTERN.search(original)
     orig_title = title_match.group(1) if title_match else "Vehicle Details"
     
-    desc_match = re.search(r'<meta name="description" content="(.*?)"', original, re.IGNORECASE)
+    desc_match = DESCRIPTION_PATTERN.search(original)
     orig_desc = desc_match.group(1) if desc_match else ""
     
     # Extract main content from original (between </header> and <footer or <!-- Footer)
@@ -124,38 +171,26 @@ def restore_file(backup_path, output_path):
     
     original_content = original[content_start:content_end]
     
-    # Get modern header/footer from reference
-    ref_header_end = reference.find('</div>\n  </div>\n\n    <!-- Breadcrumbs -->')
-    ref_footer_start = reference.find('  <!-- FOOTER')
-    
-    if ref_header_end == -1 or ref_footer_start == -1:
-        print(f"    Could not extract reference design")
-        return False
-    
-    modern_header = reference[:ref_header_end + len('</div>\n  </div>\n')]
-    modern_footer = reference[ref_footer_start:]
-    
-    # Update header with original title and description
-    modern_header = re.sub(
-        r'<title>.*?</title>',
-        f'<title>{orig_title}</title>',
-        modern_header,
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    modern_header = re.sub(
-        r'<meta name="description" content=".*?"',
-        f'<meta name="description" content="{orig_desc}"',
-        modern_header,
-        flags=re.IGNORECASE
-    )
-    
-    # Combine: modern header + original content + modern footer
-    new_content = modern_header + "\n" + original_content + "\n" + modern_footer
-    
-    return write_file(output_path, new_content)
+    writer.write(output_path, layout.compose(orig_title, orig_desc, original_content))
+    return True
 
-def main():
-    script_dir = Path(__file__).parent
+def select_version(store, filename, at=None, latest=False):
+    """The backup of `filename` to restore: the newest at or before `at`, the newest, or by default the oldest."""
+    if at or latest:
+        return store.find(filename, at)
+    # The oldest backup holds the original vehicle data
+    return store.oldest(filename)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Restore original vehicle data with the modern design.")
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument('--at', metavar='TIMESTAMP',
+                       help="restore the newest backup taken at or before TIMESTAMP (YYYYmmdd_HHMMSS)")
+    which.add_argument('--latest', action='store_true',
+                       help="restore the newest backup instead of the oldest (original) one")
+    args = parser.parse_args(argv)
+    
+    script_dir = SITE_ROOT
     backup_dir = script_dir / "backups"
     
     print("=" * 70)
@@ -168,29 +203,48 @@ def main():
     success = 0
     failed = 0
     
+    # Read and slice the reference design once for all files
+    layout = ReferenceLayout.load(script_dir / REFERENCE_FILE)
+    if layout is None:
+        print(f"\nERROR: Could not extract reference design from {REFERENCE_FILE}")
+        return
+    
+    # Load the backup index once (importing any plain backup copies) and
+    # look every page up in it, rather than scanning backups/ per file
+    store = backup_store.BackupStore(script_dir)
+    if store.import_legacy(backup_dir):
+        store.save_index()
+    
+    if args.at:
+        print(f"\nSelecting the newest backup at or before {args.at}")
+    elif args.latest:
+        print("\nSelecting the newest backup of each file")
+    else:
+        print("\nSelecting the oldest (original) backup of each file")
+    
     print(f"\nProcessing {len(FILES_TO_FIX)} files...\n")
     
-    for filename in FILES_TO_FIX:
-        # Find backup
-        backup_files = list(backup_dir.glob(f"{Path(filename).stem}_backup_*.html"))
+    # Restored pages are staged and moved into place together once all succeed
+    with page_writer.PageWriter(script_dir) as writer:
+        for filename in FILES_TO_FIX:
+            version = select_version(store, filename, args.at, args.latest)
         
-        if not backup_files:
-            print(f"[SKIP] {filename} - No backup found")
-            failed += 1
-            continue
+            if version is None:
+                print(f"[SKIP] {filename} - No backup found")
+                failed += 1
+                continue
         
-        backup_path = backup_files[0]
-        output_path = script_dir / filename
+            output_path = script_dir / filename
         
-        print(f"Processing: {filename}")
-        print(f"  Restoring from: {backup_path.name}...", end=" ")
+            print(f"Processing: {filename}")
+            print(f"  Restoring from backup taken {version['timestamp']}...", end=" ")
         
-        if restore_file(backup_path, output_path):
-            print("[OK]")
-            success += 1
-        else:
-            print("[FAILED]")
-            failed += 1
+            if restore_file(store.read(version), output_path, layout, writer):
+                print("[OK]")
+                success += 1
+            else:
+                print("[FAILED]")
+                failed += 1
     
     print("\n" + "=" * 70)
     print("RESTORATION COMPLETE")
@@ -1,75 +1,282 @@
 // Service Worker for performance optimization and offline capability
-const CACHE_NAME = 'zamto-africa-v1';
-const urlsToCache = [
-  '/',
-  '/index.html',
-  '/inventory.html',
-  '/about.html',
-  '/services.html',
-  '/contact.html',
-  '/logo.png',
-  '/favicon.ico'
+
+// Precache manifest ([url, revision] for every page, script, stylesheet and small image)
+// and the runtime route table, regenerated by build_service_worker.py
+// @generated:precache-manifest
+const PRECACHE_VERSION = '1a79bfa6b260d7e6';
+const PRECACHE_MANIFEST = [
+  ['/Back-ground-image.jpg', 'fbe84fe3a6ce566e'],
+  ['/about.html', 'f0d0285d794077ef'],
+  ['/blog-choose-imported-vehicle.html', 'a27fde5745db8f4a'],
+  ['/blog-hybrid-vs-electric.html', 'ac68c274ef5be3df'],
+  ['/blog-import-regulations.html', '21b957144d690746'],
+  ['/blog-japanese-vehicles-2025.html', '7dc6abe3626da077'],
+  ['/blog-market-trends.html', 'd0877159f1ddb2a1'],
+  ['/blog-reliable-japanese-models.html', '285da6a7684c9f88'],
+  ['/blog-vehicle-financing.html', '69dd1dca0374c0d5'],
+  ['/blog-vehicle-maintenance.html', '26c56b34e8eb917a'],
+  ['/blog.html', 'dbfee81e49363c2f'],
+  ['/contact.html', '9f67ec9040f129a3'],
+  ['/favicon.ico', '5bb7474397a4abfd'],
+  ['/icons.c61fd14984.js', 'b225007140cf1f83'],
+  ['/icons.c61fd14984.svg', 'c61fd149846839a1'],
+  ['/image-gallery.js', '7cce8331ee7a9809'],
+  ['/index.html', 'a9dcf68281abcb37'],
+  ['/inventory.html', '16ca6b959690bc30'],
+  ['/logo.png', '529d2d6fb49f08c7'],
+  ['/responsive-framework.css', '120d2990eee0a363'],
+  ['/script.js', 'a608f444a9bfeec0'],
+  ['/services.html', '302496f7371d59fb'],
+  ['/site.b9cd5adb8c.css', 'b9cd5adb8c32d94b'],
+  ['/styles.css', '509e2a93af115e11'],
+  ['/testimonials.html', '4486f209b72f0563'],
+  ['/vehicle-bmw-5-series-2014.html', 'e85bea16c4e93b02'],
+  ['/vehicle-bmw-x1-2011.html', '4ed3b99c3ffb8398'],
+  ['/vehicle-data.json', '61205a4be11301c1'],
+  ['/vehicle-haojue-eg150-2024.html', 'c8d14b050aefaba2'],
+  ['/vehicle-haojue-express125-2024.html', '319cc15300c8bd22'],
+  ['/vehicle-honda-fit-2009.html', 'd9778b31f53433ad'],
+  ['/vehicle-honda-fit-2013.html', 'dfdd1f2e0a11e23c'],
+  ['/vehicle-honda-jazz-2016-silver.html', '1a10afd27b28f983'],
+  ['/vehicle-honda-vezel-2015-white.html', '9e0f21147d213581'],
+  ['/vehicle-isuzu-mux-2018.html', 'a5ecd7cb577d66f7'],
+  ['/vehicle-isuzu-van-2018.html', 'b407ba64589e9cf6'],
+  ['/vehicle-legend-2023.html', 'd4f0beacf975ebd6'],
+  ['/vehicle-lexus-lx570-2016-black.html', '2616c370f1ca805e'],
+  ['/vehicle-lexus-lx570-2016-gold.html', 'c2d7951b7d766d73'],
+  ['/vehicle-lexus-rx-300t-2020.html', '1b7d52a23a819870'],
+  ['/vehicle-lexus-rx200t-2016.html', 'bcb37ce5f94da050'],
+  ['/vehicle-lexus-rx270-2015.html', '34fa73846012ab77'],
+  ['/vehicle-mazda-cx-5-2012.html', 'fb4f2a0281a236e3'],
+  ['/vehicle-mazda-cx-8-2020.html', '70113bae3a199f92'],
+  ['/vehicle-mercedes-benz-c180-2015-black.html', '7daaeaa36d1d0577'],
+  ['/vehicle-mitsubishi-pajero-2011-pearl.html', '7a7b1aad5e60d812'],
+  ['/vehicle-mitsubishi-pajero-2012.html', '7396d4be49311d0b'],
+  ['/vehicle-mitsubishi-pajero-2014.html', 'c36302bbbda8addd'],
+  ['/vehicle-nissan-juke-2012.html', '2d4e1d52895ff35b'],
+  ['/vehicle-prado-2014.html', 'f479f2aed5f2615f'],
+  ['/vehicle-prado-2015.html', 'a5f05ad3040ded66'],
+  ['/vehicle-prado-2017-white.html', '4f2d8744d9aece95'],
+  ['/vehicle-prado-2017.html', '861df28690a32790'],
+  ['/vehicle-search.js', 'b8218edd0fe844fe'],
+  ['/vehicle-subaru-forester-2019.html', '7b0128366874700d'],
+  ['/vehicle-subaru-forester-2025.html', '46c996fd6eb09797'],
+  ['/vehicle-t21-electric-2024.html', '3024a21cf26c3b9b'],
+  ['/vehicle-toyota-allion-2015.html', 'b207c0ff898f9acb'],
+  ['/vehicle-toyota-alphard-2015.html', '983c8f1a7a10fe0b'],
+  ['/vehicle-toyota-alphard-2020-sale.html', 'ff94bf95a34aaadc'],
+  ['/vehicle-toyota-alphard-2020-white.html', 'fd3314f7a5b7cc14'],
+  ['/vehicle-toyota-alphard-2020.html', '2268c0bea94ab087'],
+  ['/vehicle-toyota-crown-2018.html', '22d4443fdfef37b9'],
+  ['/vehicle-toyota-crown-2024.html', 'e0e642fd5f5ed9c4'],
+  ['/vehicle-toyota-crown-athlete-2006.html', '6af35306550f2410'],
+  ['/vehicle-toyota-harrier-2016-black.html', '2bc401c877066c73'],
+  ['/vehicle-toyota-hilux-2018-black.html', '39b31a1f40bea129'],
+  ['/vehicle-toyota-hilux-2018-blue.html', '44dba0bc52c30878'],
+  ['/vehicle-toyota-hilux-2018.html', '91820ef22fde55e8'],
+  ['/vehicle-toyota-hilux-2020-white.html', 'c94b11f0c5c37564'],
+  ['/vehicle-toyota-hilux-2021-bronze.html', '4b7fba9a63964c2c'],
+  ['/vehicle-toyota-hilux-2021-white.html', 'fb335bb11cb11d83'],
+  ['/vehicle-toyota-hilux-2021.html', '7b8e98636ef08ca3'],
+  ['/vehicle-toyota-land-cruiser-prado-2017-black.html', 'b09800d8de1a31f7'],
+  ['/vehicle-toyota-land-cruiser-prado-2018-silver.html', '0f10d17e369619f2'],
+  ['/vehicle-toyota-land-cruiser-prado-2018-white.html', 'af0e0bcf340d0a83'],
+  ['/vehicle-toyota-passo-2012.html', '0a1cb24633563141'],
+  ['/vehicle-toyota-passo-blue-2012.html', 'e5b7d1b6532009d4'],
+  ['/vehicle-toyota-passo-brown-2014.html', '6d6aa5ed22e34737'],
+  ['/vehicle-toyota-passo-hire.html', 'c57b83e26a6567c5'],
+  ['/vehicle-toyota-passo-yellow-2013.html', '06319538ca795028'],
+  ['/vehicle-toyota-rav4-2020.html', 'fac42cba18f1c82d'],
+  ['/vehicle-toyota-vellfire-2010-black.html', '9b8e70754d9c5068'],
+  ['/vehicle-toyota-vellfire-2010-white.html', '6b26f485f917bd3d'],
+  ['/vehicle-velfire-2010.html', 'e33330b4c3fa6938'],
+  ['/vehicle-velfire-2011.html', '1a3901924618ed53'],
+  ['/zamto-africa-styles.css', 'ae0c75de866c8dbc'],
+];
+const ROUTES = [
+  {"pattern": "^/(?:vehicle-[^/]+|inventory)\\.html$", "strategy": "stale-while-revalidate", "cache": "pages"},
+  {"pattern": "^/contact\\.html$", "strategy": "network-first", "cache": "pages", "timeout": 4000},
+  {"pattern": "^/images/vehicles/", "strategy": "cache-first", "cache": "images", "maxEntries": 120, "maxBytes": 31457280},
 ];
+// @end:precache-manifest
+
+const CACHE_PREFIX = 'zamto-africa-';
+const PRECACHE_NAME = `${CACHE_PREFIX}precache-${PRECACHE_VERSION}`;
+const precacheRevisions = new Map(PRECACHE_MANIFEST);
+const routes = ROUTES.map(route => ({ ...route, regex: new RegExp(route.pattern), cacheName: CACHE_PREFIX + route.cache }));
+
+// Entries are stored under a revisioned key so an unchanged file can be found in the previous cache
+function precacheKey(url, revision) {
+  return `${url}?__rev=${revision}`;
+}
 
-// Install event - cache essential files
+function manifestPath(request) {
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    return null;
+  }
+  return url.pathname.endsWith('/') ? `${url.pathname}index.html` : url.pathname;
+}
+
+function matchPrecache(path) {
+  if (!precacheRevisions.has(path)) {
+    return Promise.resolve(undefined);
+  }
+  return caches.open(PRECACHE_NAME).then(cache => cache.match(precacheKey(path, precacheRevisions.get(path))));
+}
+
+// Install event - fill the precache, reusing unchanged entries from earlier versions
 self.addEventListener('install', event => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => {
-        console.log('Opened cache');
-        return cache.addAll(urlsToCache);
-      })
+    caches.open(PRECACHE_NAME)
+      .then(cache => Promise.all(PRECACHE_MANIFEST.map(([url, revision]) => {
+        const key = precacheKey(url, revision);
+        return caches.match(key).then(cached => {
+          if (cached) {
+            return cache.put(key, cached);
+          }
+          // Bypass the HTTP cache so a stale copy is never stored under the new revision
+          return fetch(url, { cache: 'no-cache' }).then(response => {
+            if (!response.ok) {
+              throw new Error(`Precache of ${url} failed with status ${response.status}`);
+            }
+            return cache.put(key, response);
+          });
+        });
+      })))
+      .then(() => self.skipWaiting())
   );
 });
 
-// Fetch event - serve cached content when available
+// ===== Route strategies =====
+// Runtime entries are keyed by path, so '/' and '/index.html' share one entry
+
+// Serve the cached copy at once (runtime cache, then precache) and refresh it in the background
+function staleWhileRevalidate(event, path, route) {
+  const cachePromise = caches.open(route.cacheName);
+  const networkPromise = fetch(event.request).then(response => {
+    if (response.ok) {
+      const copy = response.clone();
+      event.waitUntil(cachePromise.then(cache => cache.put(path, copy)));
+    }
+    return response;
+  });
+  event.waitUntil(networkPromise.catch(() => undefined));
+
+  return cachePromise
+    .then(cache => cache.match(path))
+    .then(cached => cached || matchPrecache(path))
+    .then(cached => cached || networkPromise);
+}
+
+// Try the network (giving up after route.timeout ms), fall back to the cached copy when offline or slow
+function networkFirst(event, path, route) {
+  const cachePromise = caches.open(route.cacheName);
+  const cachedCopy = () => cachePromise
+    .then(cache => cache.match(path))
+    .then(cached => cached || matchPrecache(path));
+
+  const networkPromise = fetch(event.request).then(response => {
+    if (response.ok) {
+      const copy = response.clone();
+      event.waitUntil(cachePromise.then(cache => cache.put(path, copy)));
+    }
+    return response;
+  });
+
+  const timeoutPromise = new Promise(resolve => setTimeout(resolve, route.timeout))
+    .then(cachedCopy);
+  return Promise.race([networkPromise.catch(cachedCopy), timeoutPromise.then(cached => cached || networkPromise)])
+    .then(response => response || networkPromise);
+}
+
+// Serve from cache when present, otherwise fetch and store; the cache is kept as an LRU bounded by
+// route.maxEntries and route.maxBytes. Cache.keys() returns entries in insertion order, and a put
+// re-appends, so re-putting on every hit keeps the least recently used entries first
+function cacheFirst(event, path, route) {
+  return caches.open(route.cacheName).then(cache => cache.match(path).then(cached => {
+    if (cached) {
+      event.waitUntil(cache.put(path, cached.clone()));
+      return cached;
+    }
+    return matchPrecache(path).then(precached => precached || fetch(event.request).then(response => {
+      if (response.ok && response.type === 'basic') {
+        event.waitUntil(storeSized(cache, path, response.clone())
+          .then(() => trimCache(cache, route.maxEntries, route.maxBytes)));
+      }
+      return response;
+    }));
+  }));
+}
+
+// Store a response with its body size recorded in a header, so trimming never has to read bodies
+function storeSized(cache, path, response) {
+  return response.blob().then(body => {
+    const headers = new Headers(response.headers);
+    headers.set('X-Cache-Bytes', String(body.size));
+    return cache.put(path, new Response(body, { status: response.status, statusText: response.statusText, headers }));
+  });
+}
+
+function trimCache(cache, maxEntries, maxBytes) {
+  return cache.keys().then(keys => Promise.all(keys.map(key => cache.match(key)))
+    .then(responses => {
+      let count = keys.length;
+      let bytes = 0;
+      const sizes = responses.map(response => Number(response && response.headers.get('X-Cache-Bytes')) || 0);
+      sizes.forEach(size => { bytes += size; });
+      const evictions = [];
+      for (let i = 0; i < keys.length && (count > maxEntries || bytes > maxBytes); i++) {
+        evictions.push(cache.delete(keys[i]));
+        count -= 1;
+        bytes -= sizes[i];
+      }
+      return Promise.all(evictions);
+    }));
+}
+
+const STRATEGIES = {
+  'stale-while-revalidate': staleWhileRevalidate,
+  'network-first': networkFirst,
+  'cache-first': cacheFirst
+};
+
+// Fetch event - routed requests use their strategy, other precached files are served from the precache,
+// anything else goes to the network uncached
 self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request)
-      .then(response => {
-        // Return cached version if available
-        if (response) {
-          return response;
-        }
-        
-        // Clone the request because it's a stream and can only be consumed once
-        const fetchRequest = event.request.clone();
-        
-        // Fetch from network
-        return fetch(fetchRequest).then(response => {
-          // Check if we received a valid response
-          if (!response || response.status !== 200 || response.type !== 'basic') {
-            return response;
-          }
-          
-          // Clone the response because it's a stream and can only be consumed once
-          const responseToCache = response.clone();
-          
-          // Cache the response for future use
-          caches.open(CACHE_NAME)
-            .then(cache => {
-              cache.put(event.request, responseToCache);
-            });
-            
-          return response;
-        });
-      })
-    );
+  if (event.request.method !== 'GET') {
+    return;
+  }
+
+  const path = manifestPath(event.request);
+  if (!path) {
+    return;
+  }
+
+  const route = routes.find(candidate => candidate.regex.test(path));
+  if (route) {
+    event.respondWith(STRATEGIES[route.strategy](event, path, route));
+    return;
+  }
+
+  if (precacheRevisions.has(path)) {
+    event.respondWith(matchPrecache(path).then(response => response || fetch(event.request)));
+  }
 });
 
-// Activate event - clean up old caches
+// Activate event - clean up old caches (earlier precache versions, retired routes and the pre-manifest caches)
 self.addEventListener('activate', event => {
-  const cacheWhitelist = [CACHE_NAME];
-  
+  const cacheWhitelist = [PRECACHE_NAME, ...routes.map(route => route.cacheName)];
+
   event.waitUntil(
     caches.keys().then(cacheNames => {
       return Promise.all(
         cacheNames.map(cacheName => {
-          if (cacheWhitelist.indexOf(cacheName) === -1) {
+          if (cacheName.startsWith(CACHE_PREFIX) && cacheWhitelist.indexOf(cacheName) === -1) {
             return caches.delete(cacheName);
           }
         })
       );
-    })
+    }).then(() => self.clients.claim())
   );
-});
\ No newline at end of file
+});
@@ -0,0 +1,287 @@
+"""
+"Similar Vehicles" recommendations for the vehicle pages.
+Each vehicle in inventory-listing.json that has a page is turned into a numeric
+feature vector from its quick specs and listing: model year, engine size, seats
+and price (log ZMW) as standardized numbers, and transmission, fuel, body type
+and sale/hire as one-hot groups. Every group is weighted (FEATURE_WEIGHTS) so a
+mismatch in it costs the same however many values it has. The k nearest
+available vehicles for every page come from one vectorized distance matrix,
+computed in row blocks so memory stays bounded for large inventories.
+
+The result replaces the section after each page's <!-- Similar Vehicles -->
+comment, between @generated:similar-vehicles markers; the first run wraps the
+hand-written section in them. standardize_to_subaru.py injects the same block
+into the pages it renders.
+
+Usage:
+  python similar_vehicles.py                   # rewrite the Similar Vehicles section of every vehicle page
+  python similar_vehicles.py --list            # also print every page's recommendations
+  python similar_vehicles.py --benchmark 5000  # time the neighbour search on N synthetic listings and exit
+"""
+
+import argparse
+import html
+import math
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+import generate_inventory
+import vehicle_catalog
+from page_writer import PageWriter
+
+SECTION_COMMENT = "<!-- Similar Vehicles -->"
+START_MARKER = "<!-- @generated:similar-vehicles -->"
+END_MARKER = "<!-- @end:similar-vehicles -->"
+
+# Cards per page; the grid shows three across
+NEIGHBOURS = 3
+# Rows of the distance matrix computed at a time
+BLOCK_ROWS = 1024
+
+# Relative importance of each feature group; a full mismatch in a group adds its weight squared to the distance
+FEATURE_WEIGHTS = {
+    'listing': 3.0,       # sale vs. hire: a daily hire rate is not comparable with a sale price
+    'body_type': 2.0,
+    'price': 1.5,
+    'year': 1.0,
+    'engine': 0.8,
+    'seats': 0.8,
+    'fuel': 0.6,
+    'transmission': 0.5,
+}
+NUMERIC_FEATURES = ('year', 'engine', 'seats', 'price')
+CATEGORICAL_FEATURES = ('listing', 'body_type', 'fuel', 'transmission')
+
+ENGINE_CC_PATTERN = re.compile(r'(\d{3,4})\s*cc', re.IGNORECASE)
+ENGINE_LITRES_PATTERN = re.compile(r'(\d(?:\.\d)?)\s*L\b')
+
+SECTION_TEMPLATE = """\
+<section class="py-16 bg-white">
+    <div class="container mx-auto px-6">
+      <div class="text-center mb-12">
+        <h2 class="text-3xl md:text-4xl font-black text-navy mb-4 font-heading">Similar Vehicles</h2>
+        <p class="text-xl text-gray-600 max-w-2xl mx-auto">{intro}</p>
+      </div>
+
+      <div class="similar-vehicles-grid grid grid-cols-1 md:grid-cols-3 gap-8">
+{cards}
+      </div>
+    </div>
+  </section>
+"""
+
+CARD_TEMPLATE = """\
+        <!-- {name} -->
+        <div
+          class="bg-gray-50 rounded-2xl overflow-hidden shadow-lg hover:shadow-xl transition-all duration-300 card-hover">
+          <div class="relative">
+            <img src="{image}" alt="{name}" class="w-full h-48 object-cover" loading="lazy">
+            <div class="absolute top-4 left-4 {badge_color} text-white px-3 py-1 rounded-full text-sm font-bold">
+              {badge}
+            </div>
+          </div>
+          <div class="p-6">
+            <h3 class="text-xl font-bold text-navy mb-2">{name}</h3>
+            <p class="text-gray-600 mb-4">{subtitle}</p>
+            <div class="text-2xl font-black text-red mb-4">{price}</div>
+            <a href="{page}"
+              class="bg-navy hover:bg-blue-900 text-white px-4 py-2 rounded-lg font-bold transition w-full block text-center">
+              View Details
+            </a>
+          </div>
+        </div>
+"""
+
+SITE_ROOT = Path(__file__).parent
+
+
+def engine_cc(engine):
+    """Engine displacement in cc from "1997cc Petrol" or "2.5L", or None (e.g. electric)."""
+    match = ENGINE_CC_PATTERN.search(engine or "")
+    if match:
+        return float(match.group(1))
+    match = ENGINE_LITRES_PATTERN.search(engine or "")
+    return float(match.group(1)) * 1000 if match else None
+
+
+def price_zmw(price):
+    currency, amount = generate_inventory.parse_price(price)
+    if amount is None:
+        return None
+    return float(amount) * (generate_inventory.ZMW_PER_USD if currency == 'USD' else 1)
+
+
+def load_vehicles(root=SITE_ROOT, catalog=None):
+    """
+    (vehicles, candidate flags): one dict per vehicle page, listing entries merged in,
+    and whether each may be recommended (listed, has a page, not sold). `catalog`
+    replaces the pages' catalog, e.g. with records of pages about to be written.
+    """
+    root = Path(root)
+    catalog = catalog if catalog is not None else vehicle_catalog.load_catalog(root)
+    listing = generate_inventory.load_listing(root / generate_inventory.LISTING_FILE)
+    listed = {entry['page']: entry for entry in listing if entry.get('page') in catalog}
+    vehicles, candidates = [], []
+    for page in sorted(catalog):
+        entry = listed.get(page, {'page': page, 'name': catalog[page].vehicle_name, 'body_type': ''})
+        vehicles.append(generate_inventory.build_vehicle(entry, catalog))
+        candidates.append(page in listed and not vehicles[-1]['sold'])
+    return vehicles, np.array(candidates, dtype=bool)
+
+
+def feature_matrix(vehicles):
+    """One weighted feature row per vehicle (float32)."""
+    columns = []
+    raw = {
+        'year': [generate_inventory._leading_int(str(v['year'])) for v in vehicles],
+        'engine': [engine_cc(v['engine']) for v in vehicles],
+        'seats': [generate_inventory._leading_int(v['seats']) for v in vehicles],
+        'price': [price_zmw(v['price']) for v in vehicles],
+    }
+    for name in NUMERIC_FEATURES:
+        values = np.array([np.nan if x is None else float(x) for x in raw[name]], dtype=np.float64)
+        if name == 'price':
+            # "K 0" is a missing price, not one infinitely far below every other
+            values = np.log(np.where(values > 0, values, np.nan))
+        known = values[~np.isnan(values)]
+        mean, std = (known.mean(), known.std()) if known.size else (0.0, 0.0)
+        # Missing values sit at the mean, so they neither attract nor repel
+        standardized = np.where(np.isnan(values), 0.0, (values - mean) / (std or 1.0))
+        columns.append(standardized[:, None] * FEATURE_WEIGHTS[name])
+    for name in CATEGORICAL_FEATURES:
+        values = [str(v[name] or '').strip().lower() for v in vehicles]
+        levels = sorted(set(values) - {''})
+        one_hot = np.array([[value == level for level in levels] for value in values], dtype=np.float64)
+        # Two one-hot rows that differ are sqrt(2) apart; scale so a mismatch costs the group's weight
+        columns.append(one_hot.reshape(len(vehicles), len(levels)) * FEATURE_WEIGHTS[name] / math.sqrt(2))
+    return np.hstack(columns).astype(np.float32)
+
+
+def nearest_neighbours(features, candidates, k=NEIGHBOURS, block_rows=BLOCK_ROWS):
+    """
+    Indices of the k nearest candidate rows for every row (nearest first, never the row
+    itself), as an (n, k) array padded with -1 when there are fewer candidates.
+    """
+    n = len(features)
+    # A candidate row's own column is masked below, so it gets at most one neighbour fewer than the others
+    k_eff = min(k, int(candidates.sum()))
+    result = np.full((n, k), -1, dtype=np.int64)
+    if k_eff == 0:
+        return result
+    squared = np.einsum('ij,ij->i', features, features)
+    for start in range(0, n, block_rows):
+        block = features[start:start + block_rows]
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b for the whole block at once
+        distances = squared[start:start + block_rows, None] + squared[None, :] - 2.0 * (block @ features.T)
+        distances[:, ~candidates] = np.inf
+        rows = np.arange(len(block))
+        distances[rows, start + rows] = np.inf
+        nearest = np.argpartition(distances, k_eff - 1, axis=1)[:, :k_eff]
+        # Order the k by distance, ties by row index so the output is stable across runs
+        order = np.lexsort((nearest, np.take_along_axis(distances, nearest, axis=1)), axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        finite = np.isfinite(np.take_along_axis(distances, nearest, axis=1))
+        result[start:start + len(block), :k_eff] = np.where(finite, nearest, -1)
+    return result
+
+
+def recommendations(vehicles, candidates, k=NEIGHBOURS):
+    """{page: [recommended vehicle, ...]} for every vehicle page."""
+    neighbours = nearest_neighbours(feature_matrix(vehicles), candidates, k)
+    return {vehicle['page']: [vehicles[j] for j in row if j >= 0] for vehicle, row in zip(vehicles, neighbours)}
+
+
+def render_section(vehicle, similar):
+    type_label = vehicle['type_label'] if vehicle.get('body_type') else ""
+    intro = (f"More {type_label} and comparable vehicles in our inventory" if type_label
+             else "Comparable vehicles in our inventory")
+    cards = []
+    for other in similar:
+        badge, badge_color, _ = generate_inventory.BADGES[generate_inventory._status(other)]
+        cards.append(CARD_TEMPLATE.format(
+            name=html.escape(other['name']), image=html.escape(other['image'], quote=True),
+            badge=badge, badge_color=badge_color, subtitle=html.escape(other['subtitle']),
+            price=html.escape(other['price'] or "Price on Request"), page=html.escape(other['page'], quote=True)))
+    return SECTION_TEMPLATE.format(intro=html.escape(intro), cards="\n".join(cards).rstrip("\n"))
+
+
+def inject_section(page_html, section):
+    """`page_html` with its Similar Vehicles section replaced, or unchanged if it has none."""
+    start = page_html.find(START_MARKER)
+    if start != -1:
+        end = page_html.find(END_MARKER, start)
+        if end == -1:
+            raise ValueError(f"{START_MARKER} without {END_MARKER}")
+        return page_html[:start + len(START_MARKER)] + "\n  " + section + "  " + page_html[end:]
+    # First run: wrap the hand-written <section> that follows the comment in the markers
+    comment = page_html.find(SECTION_COMMENT)
+    if comment == -1:
+        return page_html
+    section_start = page_html.find('<section', comment)
+    section_end = page_html.find('</section>', section_start)
+    if section_start == -1 or section_end == -1:
+        return page_html
+    section_end += len('</section>')
+    return (page_html[:section_start] + START_MARKER + "\n  " + section + "  " + END_MARKER
+            + page_html[section_end:])
+
+
+def build_sections(root=SITE_ROOT, k=NEIGHBOURS, catalog=None):
+    """({page: rendered Similar Vehicles section}, {page: recommended vehicles}, number of available listings)."""
+    vehicles, candidates = load_vehicles(root, catalog)
+    recommended = recommendations(vehicles, candidates, k)
+    sections = {vehicle['page']: render_section(vehicle, recommended[vehicle['page']]) for vehicle in vehicles}
+    return sections, recommended, int(candidates.sum())
+
+
+def benchmark(vehicles, candidates, rows):
+    """Time the neighbour search over `rows` listings made by jittering copies of the real ones."""
+    features = feature_matrix(vehicles)
+    rng = np.random.default_rng(0)
+    repeats = -(-rows // len(features))
+    synthetic = np.tile(features, (repeats, 1))[:rows]
+    synthetic = synthetic + rng.normal(scale=0.05, size=synthetic.shape).astype(np.float32)
+    synthetic_candidates = np.tile(candidates, repeats)[:rows]
+    start = time.perf_counter()
+    nearest_neighbours(synthetic, synthetic_candidates)
+    elapsed = time.perf_counter() - start
+    print(f"Nearest neighbours for {rows:,} listings ({synthetic.shape[1]} features, k={NEIGHBOURS}): "
+          f"{elapsed * 1000:.0f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute Similar Vehicles for every vehicle page.")
+    parser.add_argument('--list', action='store_true', help="print every page's recommendations")
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help="time the neighbour search on N synthetic listings and exit")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(*load_vehicles(SITE_ROOT), args.benchmark)
+        return
+    sections, recommended, available = build_sections(SITE_ROOT)
+
+    without_section = []
+    with PageWriter(SITE_ROOT) as writer:
+        for page, section in sections.items():
+            page_html = (SITE_ROOT / page).read_text(encoding='utf-8')
+            new_html = inject_section(page_html, section)
+            if new_html == page_html and START_MARKER not in page_html:
+                without_section.append(page)
+                continue
+            writer.write(page, new_html)
+
+    if args.list:
+        for page, similar in recommended.items():
+            print(f"  {page}: {', '.join(v['page'] for v in similar)}")
+    print(f"Similar vehicles for {len(recommended)} pages from {available} available listings")
+    print(f"  {len(writer.written)} pages written, {len(writer.unchanged)} unchanged")
+    if without_section:
+        print(f"  No {SECTION_COMMENT} section: {', '.join(without_section)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Pre-deploy linter for the site's HTML.
+Streams every page in the site root and backups/ through an incremental HTML
+tokenizer, CHUNK_SIZE bytes at a time, so memory per file stays constant
+however large the page. Pages are linted in parallel, and each is checked for:
+
+  broken-link       an internal href, src, srcset or poster whose target does not
+                    exist in the file tree (exact, case-sensitive match, as on the
+                    web server; a directory resolves to its index.html)
+  outside-root      an internal reference that climbs above the site root
+  bad-srcset        a srcset candidate whose URL contains an unescaped space, which
+                    browsers read as the end of the URL
+  missing-marker    a vehicle page without one of the TEMPLATE_MARKERS of the
+                    standard layout (header, breadcrumbs, tabs, Similar Vehicles)
+  unbalanced-marker an @generated:NAME comment without its @end:NAME, or the reverse
+
+External URLs (any scheme, or //host), fragments and data: URIs are not
+checked. Pages in backups/ are copies of root pages, so their references
+resolve against the site root.
+
+Problems in files that minify_site.py deploys are errors; problems in backups,
+drafts and other undeployed pages are warnings. The exit status is 1 when there
+are errors (with --strict, warnings too), so the linter can gate a deploy.
+
+Usage:
+  python site_lint.py                  # lint, print one line per problem
+  python site_lint.py --json PATH      # also write the report as JSON ("-" for stdout)
+  python site_lint.py --strict         # exit 1 on warnings as well as errors
+  python site_lint.py --jobs 4         # worker processes (default: one per CPU)
+"""
+
+import argparse
+import fnmatch
+import functools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote
+
+import minify_site
+
+BACKUP_DIR = "backups"
+VEHICLE_PAGE_PATTERNS = ('vehicle-*.html',)
+CHUNK_SIZE = 64 * 1024
+REPORT_VERSION = 1
+
+# Attributes that reference another file; srcset holds a comma-separated candidate list
+REFERENCE_ATTRIBUTES = ('href', 'src', 'srcset', 'poster')
+SCHEME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+# Placeholders filled in by page scripts ("${vehicle.page}", "{{ url }}") are not files
+PLACEHOLDER_PATTERN = re.compile(r'\$\{|\{\{')
+SRCSET_DESCRIPTOR_PATTERN = re.compile(r'^(\d+w|\d+(\.\d+)?x)$')
+GENERATED_MARKER_PATTERN = re.compile(r'^\s*@(generated|end):([\w-]+)\s*$')
+
+# marker -> strings any of which, found in a comment, attribute value or text, shows it is there
+TEMPLATE_MARKERS = {
+    'modern-header': ('HEADER - Modern Standard Design',),
+    'breadcrumbs': ('Breadcrumbs', 'breadcrumb'),
+    'tabs': ('tab-btn', 'showTab'),
+    'similar-vehicles': ('Similar Vehicles',),
+}
+
+# Directories that are never part of the site
+SKIP_DIRS = ('build', 'node_modules', '__pycache__')
+
+SITE_ROOT = Path(__file__).parent
+
+
+class LintParser(HTMLParser):
+    """Collects a page's internal references, template markers and @generated markers as it is fed."""
+
+    def __init__(self, markers=True):
+        super().__init__(convert_charrefs=True)
+        self.references = []
+        self.srcset_problems = []
+        self.markers = set()
+        self.marker_problems = []
+        self._check_markers = markers
+        self._open_markers = {}
+
+    def _find_markers(self, text):
+        if not self._check_markers or len(self.markers) == len(TEMPLATE_MARKERS):
+            return
+        for name, needles in TEMPLATE_MARKERS.items():
+            if name not in self.markers and any(needle in text for needle in needles):
+                self.markers.add(name)
+
+    def handle_starttag(self, tag, attrs):
+        line, column = self.getpos()
+        for name, value in attrs:
+            if not value:
+                continue
+            self._find_markers(value)
+            if name == 'srcset':
+                for candidate in value.split(','):
+                    url, *descriptors = candidate.split() or ['']
+                    if not url:
+                        continue
+                    if len(descriptors) > 1 or (descriptors and not SRCSET_DESCRIPTOR_PATTERN.match(descriptors[0])):
+                        self.srcset_problems.append((line, column + 1, candidate.strip()))
+                    else:
+                        self.references.append((line, column + 1, url))
+            elif name in REFERENCE_ATTRIBUTES:
+                self.references.append((line, column + 1, value.strip()))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_data(self, data):
+        self._find_markers(data)
+
+    def handle_comment(self, data):
+        self._find_markers(data)
+        match = GENERATED_MARKER_PATTERN.match(data)
+        if not match:
+            return
+        kind, name = match.groups()
+        line, column = self.getpos()
+        if kind == 'generated':
+            if name in self._open_markers:
+                self.marker_problems.append((line, column + 1, f"@generated:{name} opened again before its @end"))
+            self._open_markers[name] = (line, column + 1)
+        elif self._open_markers.pop(name, None) is None:
+            self.marker_problems.append((line, column + 1, f"@end:{name} without @generated:{name}"))
+
+    def close(self):
+        super().close()
+        for name, (line, column) in self._open_markers.items():
+            self.marker_problems.append((line, column, f"@generated:{name} is never closed by @end:{name}"))
+        self._open_markers = {}
+
+
+def scan_page(path, markers=True):
+    """A fed-and-closed LintParser for the file at `path`, read CHUNK_SIZE bytes at a time."""
+    parser = LintParser(markers)
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for chunk in iter(functools.partial(f.read, CHUNK_SIZE), ''):
+            parser.feed(chunk)
+    parser.close()
+    return parser
+
+
+def missing_markers(path):
+    """TEMPLATE_MARKERS the page at `path` lacks, in order; empty when it has the standard layout."""
+    found = scan_page(path).markers
+    return [name for name in TEMPLATE_MARKERS if name not in found]
+
+
+@functools.lru_cache(maxsize=None)
+def site_files(root):
+    """Every file under `root` as a site-relative POSIX path (cached once per process)."""
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS]
+        rel_dir = PurePosixPath(Path(dirpath).relative_to(root).as_posix())
+        files.update((rel_dir / name).as_posix() for name in filenames)
+    return frozenset(files)
+
+
+def resolve(page, reference):
+    """
+    Site-relative path a reference points at, or None when it is not an internal
+    file reference. Raises ValueError when it climbs above the site root.
+    """
+    if not reference or reference.startswith(('#', '//')) or SCHEME_PATTERN.match(reference) \
+            or PLACEHOLDER_PATTERN.search(reference):
+        return None
+    target = unquote(re.split(r'[?#]', reference, 1)[0])
+    if not target:
+        return None
+    page_dir = PurePosixPath(page).parent
+    base = PurePosixPath() if target.startswith('/') or page_dir.name == BACKUP_DIR else page_dir
+    parts = []
+    for part in (base / target.lstrip('/')).parts:
+        if part == '..':
+            if not parts:
+                raise ValueError(target)
+            parts.pop()
+        elif part != '.':
+            parts.append(part)
+    return '/'.join(parts)
+
+
+def lint_page(root, page):
+    """[(line, column, kind, message), ...] for one site-relative page."""
+    root = str(root)
+    files = site_files(root)
+    # Backups keep the page's name ("vehicle-x_backup_<timestamp>.html"), so they match too
+    is_vehicle_page = any(fnmatch.fnmatch(PurePosixPath(page).name, pattern) for pattern in VEHICLE_PAGE_PATTERNS)
+    parser = scan_page(Path(root) / page, markers=is_vehicle_page)
+
+    problems = []
+    for line, column, reference in parser.references:
+        try:
+            target = resolve(page, reference)
+        except ValueError:
+            problems.append((line, column, 'outside-root', f"{reference} is outside the site root"))
+            continue
+        if target is None or target in files or (target + '/index.html').lstrip('/') in files:
+            continue
+        problems.append((line, column, 'broken-link', f"{reference} does not exist"))
+    for line, column, candidate in parser.srcset_problems:
+        problems.append((line, column, 'bad-srcset', f"{candidate!r} has an unescaped space in its URL"))
+    for line, column, message in parser.marker_problems:
+        problems.append((line, column, 'unbalanced-marker', message))
+    if is_vehicle_page:
+        for marker, needles in TEMPLATE_MARKERS.items():
+            if marker not in parser.markers:
+                problems.append((1, 1, 'missing-marker', f"no {marker} marker ({' or '.join(map(repr, needles))})"))
+    return problems
+
+
+def lint_pages(root=SITE_ROOT):
+    """Site-relative paths of the pages to lint: the root's HTML and backups/*.html."""
+    root = Path(root)
+    pages = sorted(p.name for p in root.glob('*.html'))
+    if (root / BACKUP_DIR).is_dir():
+        pages += sorted(f"{BACKUP_DIR}/{p.name}" for p in (root / BACKUP_DIR).glob('*.html'))
+    return pages
+
+
+def _lint_one(args):
+    root, page = args
+    try:
+        return page, lint_page(root, page)
+    except (OSError, AssertionError) as e:
+        return page, [(1, 1, 'unreadable', f"{type(e).__name__}: {e}")]
+
+
+def lint_site(root=SITE_ROOT, jobs=1):
+    """{page: [issue dict, ...]} for every linted page, with severity from whether the page is deployed."""
+    root = Path(root).resolve()
+    pages = lint_pages(root)
+    deployed = set(minify_site.deploy_files(root))
+    tasks = [(str(root), page) for page in pages]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_lint_one, tasks, chunksize=8))
+    else:
+        results = [_lint_one(task) for task in tasks]
+
+    report = {}
+    for page, problems in results:
+        severity = 'error' if page in deployed else 'warning'
+        report[page] = [{'file': page, 'line': line, 'column': column, 'severity': severity,
+                         'kind': kind, 'message': message}
+                        for line, column, kind, message in problems]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lint the site's pages for broken internal links and template markers.")
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON to PATH ("-" for stdout)')
+    parser.add_argument('--strict', action='store_true', help="exit 1 on warnings as well as errors")
+    parser.add_argument('--jobs', type=int, default=0, help="worker processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    report = lint_site(SITE_ROOT, jobs)
+    issues = [issue for page in sorted(report) for issue in report[page]]
+    errors = sum(1 for issue in issues if issue['severity'] == 'error')
+    warnings = len(issues) - errors
+
+    summary = {'version': REPORT_VERSION, 'files': len(report), 'errors': errors, 'warnings': warnings,
+               'issues': issues}
+    if args.json:
+        text = json.dumps(summary, indent=1) + "\n"
+        if args.json == '-':
+            sys.stdout.write(text)
+        else:
+            Path(args.json).write_text(text, encoding='utf-8')
+    if args.json != '-':
+        for issue in issues:
+            print(f"{issue['file']}:{issue['line']}:{issue['column']}: {issue['severity']}: "
+                  f"{issue['kind']}: {issue['message']}")
+        print(f"Linted {len(report)} pages: {errors} errors, {warnings} warnings")
+
+    if errors or (args.strict and warnings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
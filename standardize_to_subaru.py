@@ -1,14 +1,33 @@
+import argparse
+import copy
+import functools
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Comment
+
+import build_manifest
+import critical_css
+import css_bundle
+import icon_sprite
+import image_pipeline
+import page_writer
+import similar_vehicles
+import template_drift
+import vehicle_catalog
+import vehicle_schema
 
 # The master template file
 TEMPLATE_FILE = "vehicle-subaru-forester-2019.html"
 
+# Hashes of what each page was last rendered from (see build_manifest.py)
+MANIFEST_FILE = "build/standardize-manifest.json"
+
 # Files to update (all vehicle detail pages)
 def get_all_vehicle_files():
-    files = [f for f in os.listdir('.') if f.startswith('vehicle-') and f.endswith('.html')]
+    files = sorted(f for f in os.listdir('.') if f.startswith('vehicle-') and f.endswith('.html'))
     if TEMPLATE_FILE in files:
         files.remove(TEMPLATE_FILE)
     return files
@@ -17,223 +36,435 @@ def read_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         return f.read()
 
-def write_file(filepath, content):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
 def extract_vehicle_data(html_content, filename):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    data = {}
-    
-    # 1. Title and Meta
-    data['title'] = soup.title.string if soup.title else ""
-    desc_meta = soup.find('meta', attrs={'name': 'description'})
-    data['description_meta'] = desc_meta['content'] if desc_meta else ""
-    
-    # 2. Vehicle Name and Price
-    # Look for H1 in the main content area
-    h1 = soup.find('h1')
-    data['vehicle_name'] = h1.get_text(strip=True) if h1 else filename.replace('vehicle-', '').replace('.html', '').replace('-', ' ').title()
-    
-    # Price
-    # Try to find price based on common classes or text patterns
-    price_div = soup.find('div', string=re.compile(r'\$|ZMW|USD', re.IGNORECASE))
-    if not price_div:
-        # Try a more broad search for price-like patterns
-        price_text = soup.find(string=re.compile(r'(\$\s?[\d,]+|ZMW\s?[\d,]+|USD\s?[\d,]+)'))
-        data['price'] = price_text.strip() if price_text else "Price on Request"
-    else:
-        data['price'] = price_div.get_text(strip=True)
-        
-    # Model/Spec line (e.g., "2019 Model • Premium AWD SUV")
-    model_line = soup.find('p', class_='text-lg text-gray-600 mb-4')
-    data['model_line'] = model_line.get_text(strip=True) if model_line else ""
-
-    # 3. Quick Specs (Year, Engine, Transmission, Seats, Doors, Fuel)
-    specs = {}
-    spec_cards = soup.find_all('div', class_='bg-gray-50 p-4 rounded-xl text-center')
-    for card in spec_cards:
-        label = card.find('p', class_='text-sm text-gray-600').get_text(strip=True)
-        value = card.find('p', class_='font-bold text-navy').get_text(strip=True)
-        specs[label] = value
-    data['quick_specs'] = specs
-
-    # 4. Description
-    desc_title = soup.find('h3', string=re.compile(r'Description', re.IGNORECASE))
-    if desc_title:
-        desc_p = desc_title.find_next('p')
-        data['description'] = desc_p.get_text(strip=True) if desc_p else ""
-    else:
-        data['description'] = ""
-
-    # 5. Images
-    main_img = soup.find('img', class_='main-vehicle-image')
-    data['main_image'] = main_img['src'] if main_img and main_img.has_attr('src') else ""
-    
-    thumbnails = []
-    thumb_imgs = soup.find_all('img', class_='thumbnail-image')
-    for img in thumb_imgs:
-        if img.has_attr('src'):
-            thumbnails.append(img['src'])
-    data['thumbnails'] = thumbnails
-
-    # 6. Detailed Specs (Tab 1)
-    spec_rows = []
-    spec_tab = soup.find('div', id='specifications-tab')
-    if spec_tab:
-        rows = spec_tab.find_all('div', class_='flex justify-between spec-row p-3 rounded-lg')
-        for row in rows:
-            label = row.find('span', class_='text-gray-600').get_text(strip=True)
-            value = row.find('span', class_='font-semibold text-navy').get_text(strip=True)
-            spec_rows.append((label, value))
-    data['detailed_specs'] = spec_rows
-
-    # 7. Features (Tab 2)
-    features = []
-    features_tab = soup.find('div', id='features-tab')
-    if features_tab:
-        items = features_tab.find_all('span', class_='text-gray-700')
-        for item in items:
-            features.append(item.get_text(strip=True))
-    data['features'] = features
+    return vehicle_catalog.parse_vehicle_page(html_content, filename)
 
-    return data
+def _set_string(element, value):
+    element.string = value
+    return str(element)
 
-def apply_template(template_html, data):
-    # This is where we inject the data into the Subaru template
-    # We'll use simple string replacements or BeautifulSoup to inject
-    soup = BeautifulSoup(template_html, 'html.parser')
-    
-    # 1. Update Title and Meta
+def _set_attr(element, name, value):
+    element[name] = value
+    return str(element)
+
+# `sizes` for the responsive gallery images (see the grid classes in the template)
+MAIN_IMAGE_SIZES = "(min-width: 1024px) 50vw, 100vw"
+THUMBNAIL_SIZES = "(min-width: 1024px) 12vw, 25vw"
+
+# Factory for tags created outside the template tree
+_tag_factory = BeautifulSoup('', 'html.parser')
+
+def _fill_picture(picture, img, src, data, sizes):
+    """Point an image (and its <picture> sources, if any) at `src`, using responsive variants when built."""
+    img['src'] = src
+    srcsets = data.get('image_srcsets', {}).get(src)
+    if picture is None:
+        return
+    if not srcsets:
+        # No variants: the template's <source> tags must still show this vehicle, not the Subaru
+        for source in picture.find_all('source'):
+            source['srcset'] = src
+        return
+    for source in picture.find_all('source'):
+        if source.next_sibling is not None and not str(source.next_sibling).strip():
+            source.next_sibling.extract()
+        source.decompose()
+    # Modern formats as typed sources, the resized JPEGs on the <img> itself
+    for mime, srcset in srcsets.items():
+        if mime == 'image/jpeg':
+            continue
+        source = _tag_factory.new_tag('source', attrs={'type': mime, 'srcset': srcset, 'sizes': sizes})
+        img.insert_before(source)
+    if 'image/jpeg' in srcsets:
+        img['srcset'] = srcsets['image/jpeg']
+        img['sizes'] = sizes
+
+def _fill_main_image(element, data):
+    # The slot is the <picture> around the main image when there is one, else the <img> alone
+    picture = element if element.name == 'picture' else None
+    img = element.find('img') if picture else element
+    _fill_picture(picture, img, data['main_image'], data, MAIN_IMAGE_SIZES)
+    # Also update data-gallery and onclick
+    img['data-gallery'] = ",".join(data['thumbnails'])
+    img['onclick'] = f"openLightbox([{', '.join([repr(t) for t in data['thumbnails']])}], 0)"
+    return str(element)
+
+def _thumbnail_filler(i):
+    def fill(container, data):
+        if i >= len(data['thumbnails']):
+            # Hide extra thumbs if not enough images
+            return ""
+        img = container.find('img')
+        if img:
+            _fill_picture(container.find('picture'), img, data['thumbnails'][i], data, THUMBNAIL_SIZES)
+        container['onclick'] = f"changeMainImage('{data['thumbnails'][i]}')"
+        return str(container)
+    return fill
+
+def _quick_spec_filler(label):
+    def fill(value_p, data):
+        if label in data['quick_specs']:
+            value_p.string = data['quick_specs'][label]
+        return str(value_p)
+    return fill
+
+def _spec_grid(data):
+    new_tag = _tag_factory.new_tag
+    new_grid = new_tag('div', attrs={'class': 'specifications-grid grid grid-cols-1 md:grid-cols-2 gap-6'})
+    left_col = new_tag('div', attrs={'class': 'space-y-4'})
+    right_col = new_tag('div', attrs={'class': 'space-y-4'})
+
+    # Column by column, the order the rows are read back in, so re-rendering keeps the order
+    left_rows = (len(data['detailed_specs']) + 1) // 2
+    for i, (label, value) in enumerate(data['detailed_specs']):
+        row = new_tag('div', attrs={'class': 'flex justify-between spec-row p-3 rounded-lg'})
+        l_span = new_tag('span', attrs={'class': 'text-gray-600'})
+        l_span.string = label
+        v_span = new_tag('span', attrs={'class': 'font-semibold text-navy'})
+        v_span.string = value
+        row.append(l_span)
+        row.append(v_span)
+
+        if i < left_rows:
+            left_col.append(row)
+        else:
+            right_col.append(row)
+
+    new_grid.append(left_col)
+    new_grid.append(right_col)
+    return new_grid
+
+def _features_grid(data):
+    new_tag = _tag_factory.new_tag
+    new_features = new_tag('div', attrs={'class': 'features-grid grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4'})
+    for feature in data['features']:
+        item = new_tag('div', attrs={'class': 'flex items-center gap-3 p-3 bg-gray-50 rounded-lg'})
+        icon = new_tag('i', attrs={'data-lucide': 'check-circle', 'class': 'w-5 h-5 text-green-600'})
+        span = new_tag('span', attrs={'class': 'text-gray-700'})
+        span.string = feature
+        item.append(icon)
+        item.append(span)
+        new_features.append(item)
+    return new_features
+
+def template_slots(soup):
+    """
+    Every place a vehicle overrides in the parsed template, in document order within each kind:
+    ('fill', element, fill(element, data) -> its HTML, "" to drop it) or
+    ('append', parent, build(data) -> a new last child). The old spec and feature grids are removed.
+    """
+    slots = []
+
+    # 1. Title and Meta
     if soup.title:
-        soup.title.string = data['title']
+        slots.append(('fill', soup.title, lambda el, data: _set_string(el, data['title'])))
     desc_meta = soup.find('meta', attrs={'name': 'description'})
     if desc_meta:
-        desc_meta['content'] = data['description_meta']
-        
-    # 2. Update Breadcrumbs (last item)
+        slots.append(('fill', desc_meta, lambda el, data: _set_attr(el, 'content', data['description_meta'])))
+
+    # 2. Breadcrumbs (last item)
     breadcrumb_span = soup.find('span', class_='text-navy font-medium')
     if breadcrumb_span:
-        breadcrumb_span.string = data['vehicle_name']
-        
-    # 3. Update Gallery
+        slots.append(('fill', breadcrumb_span, lambda el, data: _set_string(el, data['vehicle_name'])))
+
+    # 3. Gallery (Subaru has 4 thumb slots, the first 3 are images and the last is "View All")
     main_img = soup.find('img', class_='main-vehicle-image')
     if main_img:
-        main_img['src'] = data['main_image']
-        # Also update data-gallery and onclick
-        gallery_str = ",".join(data['thumbnails'])
-        main_img['data-gallery'] = gallery_str
-        main_img['onclick'] = f"openLightbox([{', '.join([repr(t) for t in data['thumbnails']])}], 0)"
-        
-    # Update thumbnails (Subaru has 4 thumb slots, one is "View All")
+        slots.append(('fill', main_img.parent if main_img.parent.name == 'picture' else main_img, _fill_main_image))
     thumb_containers = soup.find_all('div', class_=re.compile(r'bg-gray-100 rounded-lg h-20 overflow-hidden'))
-    for i, container in enumerate(thumb_containers[:3]): # Update first 3
-        if i < len(data['thumbnails']):
-            img = container.find('img')
-            if img:
-                img['src'] = data['thumbnails'][i]
-            container['onclick'] = f"changeMainImage('{data['thumbnails'][i]}')"
-        else:
-            # Hide extra thumbs if not enough images
-            container.decompose()
-            
-    # Update "View All" count
+    for i, container in enumerate(thumb_containers[:3]):
+        slots.append(('fill', container, _thumbnail_filler(i)))
     view_all_span = soup.find('span', string=re.compile(r'View All'))
     if view_all_span:
-        view_all_span.string = f"View All {len(data['thumbnails'])}"
+        slots.append(('fill', view_all_span, lambda el, data: _set_string(el, f"View All {len(data['thumbnails'])}")))
 
-    # 4. Update Header Info (H1, Model Line, Price)
+    # 4. Header Info (H1, Model Line, Price)
     h1 = soup.find('h1', class_=re.compile(r'text-navy.*font-heading'))
     if h1:
-        h1.string = data['vehicle_name']
-        
+        slots.append(('fill', h1, lambda el, data: _set_string(el, data['vehicle_name'])))
     model_p = soup.find('p', class_='text-lg text-gray-600 mb-4')
     if model_p:
-        model_p.string = data['model_line']
-        
+        slots.append(('fill', model_p, lambda el, data: _set_string(el, data['model_line'])))
     price_div = soup.find('div', class_='text-4xl sm:text-5xl font-black text-red')
     if price_div:
-        price_div.string = data['price']
+        slots.append(('fill', price_div, lambda el, data: _set_string(el, data['price'])))
 
-    # 5. Update Quick Specs
-    spec_cards = soup.find_all('div', class_='bg-gray-50 p-4 rounded-xl text-center')
-    # Loop through quick specs and update matching labels
-    for card in spec_cards:
+    # 5. Quick Specs, matched by label
+    for card in soup.find_all('div', class_='bg-gray-50 p-4 rounded-xl text-center'):
         label_p = card.find('p', class_='text-sm text-gray-600')
         value_p = card.find('p', class_='font-bold text-navy')
         if label_p and value_p:
-            label = label_p.get_text(strip=True)
-            if label in data['quick_specs']:
-                value_p.string = data['quick_specs'][label]
+            slots.append(('fill', value_p, _quick_spec_filler(label_p.get_text(strip=True))))
 
-    # 6. Update Description
-    desc_p = soup.find('h3', string=re.compile(r'Description')).find_next('p')
+    # 6. Description
+    desc_title = soup.find('h3', string=re.compile(r'Description'))
+    desc_p = desc_title.find_next('p') if desc_title else None
     if desc_p:
-        desc_p.string = data['description']
+        slots.append(('fill', desc_p, lambda el, data: _set_string(el, data['description'])))
 
-    # 7. Update Detailed Specs (Tab 1)
+    # 7. Detailed Specs (Tab 1): the old grid is dropped and a new one appended to the tab
     spec_grid = soup.find('div', class_='specifications-grid')
     if spec_grid:
-        # Clear existing rows and rebuild
         spec_grid.decompose()
-        # Re-create the grid structure
-        new_grid = soup.new_tag('div', attrs={'class': 'specifications-grid grid grid-cols-1 md:grid-cols-2 gap-6'})
-        left_col = soup.new_tag('div', attrs={'class': 'space-y-4'})
-        right_col = soup.new_tag('div', attrs={'class': 'space-y-4'})
-        
-        for i, (label, value) in enumerate(data['detailed_specs']):
-            row = soup.new_tag('div', attrs={'class': 'flex justify-between spec-row p-3 rounded-lg'})
-            l_span = soup.new_tag('span', attrs={'class': 'text-gray-600'})
-            l_span.string = label
-            v_span = soup.new_tag('span', attrs={'class': 'font-semibold text-navy'})
-            v_span.string = value
-            row.append(l_span)
-            row.append(v_span)
-            
-            if i % 2 == 0:
-                left_col.append(row)
-            else:
-                right_col.append(row)
-        
-        new_grid.append(left_col)
-        new_grid.append(right_col)
-        soup.find('div', id='specifications-tab').append(new_grid)
+        slots.append(('append', soup.find('div', id='specifications-tab'), _spec_grid))
 
-    # 8. Update Features (Tab 2)
+    # 8. Features (Tab 2)
     features_grid = soup.find('div', class_='features-grid')
     if features_grid:
         features_grid.decompose()
-        new_features = soup.new_tag('div', attrs={'class': 'features-grid grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4'})
-        for feature in data['features']:
-            item = soup.new_tag('div', attrs={'class': 'flex items-center gap-3 p-3 bg-gray-50 rounded-lg'})
-            icon = soup.new_tag('i', attrs={'data-lucide': 'check-circle', 'class': 'w-5 h-5 text-green-600'})
-            span = soup.new_tag('span', attrs={'class': 'text-gray-700'})
-            span.string = feature
-            item.append(icon)
-            item.append(span)
-            new_features.append(item)
-        soup.find('div', id='features-tab').append(new_features)
+        slots.append(('append', soup.find('div', id='features-tab'), _features_grid))
 
     # Note: Tab 3 (Condition Report) remains as Subaru's placeholder text for now or we could customize it
     # CTAs (WhatsApp, Call) are already standardized in the template
+    return slots
+
+class CompiledTemplate:
+    """
+    The template parsed once, with every element that a vehicle overrides cut out
+    as a numbered slot. Rendering copies only those small slot elements, fills
+    them in and joins them back between the static segments of the page.
+    """
+    SLOT_MARKER = re.compile(r'<!--@slot:(\d+)-->')
+
+    def __init__(self, template_html):
+        # Always html.parser here, whatever parser_backend picks for extraction: the
+        # template is parsed once per run and its serialisation is the page output
+        soup = BeautifulSoup(template_html, 'html.parser')
+        self._slots = []
+        for kind, element, fill in template_slots(soup):
+            if kind == 'fill':
+                self._cut(element, fill)
+            else:
+                self._append(element, lambda _, data, build=fill: str(build(data)))
+
+        parts = self.SLOT_MARKER.split(str(soup))
+        self._segments = parts[0::2]
+        self._slot_order = [int(i) for i in parts[1::2]]
 
+    def _cut(self, element, fill):
+        self._slots.append((fill, copy.copy(element)))
+        element.replace_with(Comment(f"@slot:{len(self._slots) - 1}"))
+
+    def _append(self, parent, fill):
+        self._slots.append((fill, None))
+        parent.append(Comment(f"@slot:{len(self._slots) - 1}"))
+
+    def render(self, data):
+        out = [self._segments[0]]
+        for index, segment in zip(self._slot_order, self._segments[1:]):
+            fill, element = self._slots[index]
+            out.append(fill(copy.copy(element) if element is not None else None, data))
+            out.append(segment)
+        return "".join(out)
+
+def render_in_tree(template_html, data):
+    """
+    The page as rendered before CompiledTemplate: the whole template parsed for
+    this page and filled in place. Same output, kept as the benchmark's baseline.
+    """
+    soup = BeautifulSoup(template_html, 'html.parser')
+    for kind, element, fill in template_slots(soup):
+        if kind == 'append':
+            element.append(fill(data))
+        elif fill(element, data) == "":
+            element.decompose()
     return str(soup)
 
-def main():
+@functools.lru_cache(maxsize=4)
+def compile_template(template_html):
+    return CompiledTemplate(template_html)
+
+def apply_template(template_html, data):
+    # The template is compiled once per distinct template_html; each call only fills its slots
+    return compile_template(template_html).render(data)
+
+def page_data(record, image_manifest=None):
+    """The record's template data, plus the srcsets of its images when responsive variants are built."""
+    data = record.template_data()
+    if image_manifest:
+        images = [data['main_image']] + data['thumbnails']
+        data['image_srcsets'] = {src: image_pipeline.srcsets(image_manifest, src) for src in images}
+    return data
+
+# Template HTML for pool workers, handed over once by the pool initializer
+_worker_template = None
+
+def _init_worker(template_html):
+    global _worker_template
+    _worker_template = template_html
+    compile_template(template_html)
+
+def _render_in_worker(data):
+    return apply_template(_worker_template, data)
+
+def render_pages(template_html, catalog, filenames, jobs=1, image_manifest=None):
+    """Yield (filename, new_content, error) for each page, always in the order given."""
+    if jobs <= 1:
+        for filename in filenames:
+            try:
+                yield filename, apply_template(template_html, page_data(catalog[filename], image_manifest)), None
+            except Exception as e:
+                yield filename, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(template_html,)) as pool:
+        futures = {filename: pool.submit(_render_in_worker, page_data(catalog[filename], image_manifest))
+                   for filename in filenames}
+        for filename in filenames:
+            try:
+                yield filename, futures[filename].result(), None
+            except Exception as e:
+                yield filename, None, e
+
+def template_deps_hash():
+    """Hash of everything besides the page itself that affects the rendered output."""
+    image_manifest = Path(image_pipeline.MANIFEST_FILE)
+    return build_manifest.combine_hashes(
+        build_manifest.hash_file(TEMPLATE_FILE),
+        build_manifest.hash_file(__file__),
+        build_manifest.hash_file(vehicle_catalog.__file__),
+        build_manifest.hash_file(critical_css.__file__),
+        build_manifest.hash_file(similar_vehicles.__file__),
+        build_manifest.hash_file(vehicle_schema.__file__),
+        build_manifest.hash_file(image_manifest) if image_manifest.exists() else "",
+        css_bundle.current_bundle('.') or "",
+        (icon_sprite.current_sprite('.') or ("",))[0],
+    )
+
+def benchmark(template_html, catalog, rounds=3):
+    """Print per-page render time with the template parsed and filled in place per page vs. compiled once."""
+    pages = [catalog[f].template_data() for f in sorted(catalog)]
+    if not pages:
+        print("No vehicle pages to benchmark")
+        return
+
+    def best_of(render):
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for data in pages:
+                render(data)
+            timings.append(time.perf_counter() - start)
+        return min(timings) / len(pages) * 1000
+
+    compiled = CompiledTemplate(template_html)
+    reparse_ms = best_of(lambda data: render_in_tree(template_html, data))
+    compiled_ms = best_of(compiled.render)
+
+    print(f"Render benchmark over {len(pages)} pages (best of {rounds} rounds)")
+    print(f"  {'mode':<28}{'ms/page':>10}")
+    print(f"  {'template parsed per page':<28}{reparse_ms:>10.2f}")
+    print(f"  {'template compiled once':<28}{compiled_ms:>10.2f}")
+    print(f"  speedup: {reparse_ms / compiled_ms:.1f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Standardize vehicle pages to the Subaru design.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-render pages whose content, template or script changed since the last run")
+    parser.add_argument('--drifted', action='store_true',
+                        help="only re-render pages whose structure has drifted from the template (see template_drift.py)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="number of worker processes for parsing and rendering (0 = one per CPU)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time template rendering for every page and exit without writing anything")
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
     template_html = read_file(TEMPLATE_FILE)
+    # Link the built CSS bundle in place of the Tailwind CDN script, if css_bundle.py has been run
+    bundle = css_bundle.current_bundle('.')
+    if bundle:
+        template_html = css_bundle.link_stylesheet(template_html, bundle)
+        # The pages share the template's first screen, so they share its critical CSS
+        template_html = critical_css.inline_critical(template_html, critical_css.critical_css(template_html)[0])
+    # Icons (including the generated feature-row icons) point at the sprite, if icon_sprite.py has been run
+    sprite = icon_sprite.current_sprite('.')
     vehicle_files = get_all_vehicle_files()
+
+    if args.benchmark:
+        benchmark(template_html, vehicle_catalog.load_catalog('.', vehicle_files, jobs=jobs))
+        return
+    deps_hash = template_deps_hash()
+    manifest = build_manifest.load_manifest(MANIFEST_FILE)
+    # Every page's record as it stands; rendered pages replace theirs below
+    catalog = vehicle_catalog.load_catalog('.', jobs=jobs)
+
+    # Similar Vehicles draw on the whole inventory, and the JSON-LD on the listing's price and
+    # status, so a page also depends on its own section and script. Both are built from the
+    # records of the pages as they are written, which is what the next run reads back: a page
+    # written here is up to date on the next run.
+    def page_inputs():
+        return (similar_vehicles.build_sections('.', catalog=catalog)[0],
+                *vehicle_schema.build_scripts('.', catalog))
+
+    similar_sections, schema_scripts, schema_failures = page_inputs()
+
+    def page_deps(filename):
+        return build_manifest.combine_hashes(deps_hash, build_manifest.hash_bytes(similar_sections.get(filename, "")),
+                                             build_manifest.hash_bytes(schema_scripts.get(filename, "")))
+
+    if args.incremental:
+        up_to_date = [f for f in vehicle_files
+                      if build_manifest.is_up_to_date(manifest, f, build_manifest.hash_file(f), page_deps(f))]
+        vehicle_files = [f for f in vehicle_files if f not in up_to_date]
+        print(f"Skipping {len(up_to_date)} unchanged files")
+    if args.drifted:
+        template = template_drift.template_regions('.')
+        matching = [f for f in vehicle_files if not template_drift.drifted_regions(f, template)]
+        vehicle_files = [f for f in vehicle_files if f not in matching]
+        print(f"Skipping {len(matching)} files that match the template's structure")
     
     print(f"Standardizing {len(vehicle_files)} files to Subaru design...")
     
-    for filename in vehicle_files:
-        print(f"Processing {filename}...")
-        try:
-            content = read_file(filename)
-            data = extract_vehicle_data(content, filename)
-            new_content = apply_template(template_html, data)
-            write_file(filename, new_content)
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
+    # Responsive variants from image_pipeline.py, if it has been run
+    image_manifest = image_pipeline.load_manifest('.')
+
+    errors = []
+    rendered = {}
+    processed = []
+    pending = vehicle_files
+    # A rendered page's new record can change other pages' sections or scripts; those pages
+    # are rendered too, until nothing else changes
+    while pending:
+        before = (similar_sections, schema_scripts)
+        for filename, new_content, error in render_pages(template_html, catalog, pending, jobs, image_manifest):
+            print(f"Processing {filename}...")
+            processed.append(filename)
+            if error is not None:
+                print(f"Error processing {filename}: {error}")
+                errors.append((filename, error))
+                continue
+            rendered[filename] = new_content
+            catalog[filename] = vehicle_catalog.build_record(new_content, filename)
+        similar_sections, schema_scripts, schema_failures = page_inputs()
+        pending = [f for f in get_all_vehicle_files() if f not in processed and f in catalog
+                   and (similar_sections.get(f), schema_scripts.get(f)) != (before[0].get(f), before[1].get(f))]
+
+    # Pages are staged and only moved into place once every page has rendered
+    with page_writer.PageWriter('.') as writer:
+        for filename, new_content in rendered.items():
+            try:
+                if filename in schema_failures:
+                    raise ValueError(f"invalid vehicle JSON-LD: {'; '.join(schema_failures[filename])}")
+                if filename in schema_scripts:
+                    new_content = vehicle_schema.inject_schema(new_content, schema_scripts[filename])
+                if filename in similar_sections:
+                    new_content = similar_vehicles.inject_section(new_content, similar_sections[filename])
+                if sprite:
+                    new_content = icon_sprite.link_icons(new_content, *sprite)
+                writer.write(filename, new_content)
+                build_manifest.record_output(manifest, filename, page_deps(filename),
+                                             build_manifest.hash_bytes(page_writer.encode(new_content)))
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
+                errors.append((filename, e))
+
+    build_manifest.save_manifest(MANIFEST_FILE, manifest)
+
+    print(f"\nStandardized {len(processed) - len(errors)} files, {len(errors)} failed "
+          f"({len(writer.written)} written, {len(writer.unchanged)} already up to date)")
+    for filename, e in errors:
+        print(f"  [FAILED] {filename}: {type(e).__name__}: {e}")
 
 if __name__ == "__main__":
     main()
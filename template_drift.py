@@ -0,0 +1,229 @@
+"""
+Structural drift of the vehicle pages from the template.
+Each page is fingerprinted region by region (REGIONS: header, gallery, spec
+tabs, footer) with a hash of the region's tag/class skeleton. Text and every
+attribute but class are ignored, and a run of identical consecutive siblings
+counts once, so a page with five thumbnails, twenty spec rows or no features
+still matches the template's skeleton. The template's fingerprint is computed
+once per run and every page is compared against it.
+
+When the hashes differ the two skeletons are walked to find where they part.
+An element that is empty on the page where the template has a list (children
+all alike) is not drift: that is a vehicle without spec rows or features, and
+re-templating would not give it any.
+
+A region is:
+  missing   the page has no element where the region starts
+  differs   its skeleton is not the template's; the report shows the first
+            element where the two part
+
+Only drifted pages need standardize_to_subaru.py again (its --drifted option
+picks them), and only the regions listed for them have moved.
+
+Usage:
+  python template_drift.py               # list the drifted pages and their regions
+  python template_drift.py --all         # also list the pages that match
+  python template_drift.py --check       # exit 1 if any page has drifted
+  python template_drift.py --json PATH   # also write the report as JSON ("-" for stdout)
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+
+import build_manifest
+import critical_css
+
+TEMPLATE_FILE = "vehicle-subaru-forester-2019.html"
+PAGE_PATTERN = "vehicle-*.html"
+CHUNK_SIZE = 64 * 1024
+
+# region -> where it starts: the first <tag> element, or the first element after a comment
+REGIONS = {
+    'header': ('tag', 'header'),
+    'gallery': ('comment', 'Enhanced Image Gallery'),
+    'spec-tabs': ('comment', 'Vehicle Tabs'),
+    'footer': ('tag', 'footer'),
+}
+
+SITE_ROOT = Path(__file__).parent
+
+
+@dataclass(frozen=True)
+class Node:
+    hash: str
+    label: str
+    children: tuple
+    # More than one child, all alike: a list whose length is content, not structure
+    is_list: bool = False
+
+
+class SkeletonParser(HTMLParser):
+    """
+    Builds the tag/class skeleton of each region as it is fed. Every closed
+    element becomes a Node: the hash of its label (tag and sorted classes) and
+    its children's hashes, consecutive repeats collapsed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # region -> Node of its root element
+        self.regions = {}
+        # open elements: [tag, label, child Nodes, region started here]
+        self._stack = [[None, None, [], None]]
+        self._pending_comments = set()
+
+    def _region_starting(self, tag):
+        for name, (kind, anchor) in REGIONS.items():
+            if name in self.regions or any(frame[3] == name for frame in self._stack):
+                continue
+            if (kind == 'tag' and tag == anchor) or (kind == 'comment' and name in self._pending_comments):
+                return name
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        classes = ' '.join(sorted((dict(attrs).get('class') or '').split()))
+        label = f'<{tag} class="{classes}">' if classes else f'<{tag}>'
+        region = self._region_starting(tag)
+        self._pending_comments.clear()
+        self._stack.append([tag, label, [], region])
+        if tag in critical_css.VOID_ELEMENTS:
+            self._close()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in critical_css.VOID_ELEMENTS:
+            self._close()
+
+    def handle_endtag(self, tag):
+        # Like a browser: close up to the matching open element, ignore a stray end tag
+        if not any(frame[0] == tag for frame in self._stack[1:]):
+            return
+        while self._stack[-1][0] != tag:
+            self._close()
+        self._close()
+
+    def handle_comment(self, data):
+        for name, (kind, anchor) in REGIONS.items():
+            if kind == 'comment' and anchor in data:
+                self._pending_comments.add(name)
+
+    def _close(self):
+        _, label, children, region = self._stack.pop()
+        collapsed = tuple(child for i, child in enumerate(children) if i == 0 or child.hash != children[i - 1].hash)
+        node = Node(build_manifest.hash_bytes(label + ''.join(child.hash for child in collapsed)), label, collapsed,
+                    is_list=len(children) > 1 and len(collapsed) == 1)
+        self._stack[-1][2].append(node)
+        if region:
+            self.regions[region] = node
+
+    def close(self):
+        super().close()
+        while len(self._stack) > 1:
+            self._close()
+
+
+def fingerprint(path):
+    """{region: Node} for the regions found in the page at `path`."""
+    parser = SkeletonParser()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            parser.feed(chunk)
+    parser.close()
+    return parser.regions
+
+
+def first_difference(page, template):
+    """Where the skeleton `page` parts from `template`, or None where it is the template's."""
+    if page.hash == template.hash:
+        return None
+    if page.label != template.label:
+        return f"{page.label}, template has {template.label}"
+    if not page.children and template.is_list:
+        return None
+    for ours, theirs in zip(page.children, template.children):
+        difference = first_difference(ours, theirs)
+        if difference:
+            return difference
+    shared = min(len(page.children), len(template.children))
+    if len(page.children) > shared:
+        return f"{page.children[shared].label} inside {page.label}, not in the template"
+    if len(template.children) > shared:
+        return f"{page.label} lacks the template's {template.children[shared].label}"
+    return None
+
+
+def compare(page_regions, template_regions):
+    """{region: description} for every region that is missing from the page or differs from the template."""
+    drift = {}
+    for name in REGIONS:
+        if name not in template_regions:
+            continue
+        if name not in page_regions:
+            drift[name] = "missing"
+            continue
+        difference = first_difference(page_regions[name], template_regions[name])
+        if difference:
+            drift[name] = f"differs at {difference}"
+    return drift
+
+
+def template_regions(root=SITE_ROOT):
+    regions = fingerprint(Path(root) / TEMPLATE_FILE)
+    missing = [name for name in REGIONS if name not in regions]
+    if missing:
+        raise ValueError(f"{TEMPLATE_FILE} has no {', '.join(missing)} region")
+    return regions
+
+
+def drifted_regions(path, template=None):
+    """{region: description} of where the page at `path` has drifted from the template; empty if it has not."""
+    template = template or template_regions(Path(path).parent)
+    return compare(fingerprint(path), template)
+
+
+def drift_report(root=SITE_ROOT):
+    """{page: {region: description}} for every vehicle page other than the template."""
+    root = Path(root)
+    template = template_regions(root)
+    return {page.name: drifted_regions(page, template)
+            for page in sorted(root.glob(PAGE_PATTERN)) if page.name != TEMPLATE_FILE}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report vehicle pages whose structure has drifted from the template.")
+    parser.add_argument('--all', action='store_true', help="also list the pages that match the template")
+    parser.add_argument('--check', action='store_true', help="exit 1 if any page has drifted")
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON to PATH ("-" for stdout)')
+    args = parser.parse_args(argv)
+
+    report = drift_report(SITE_ROOT)
+    drifted = {page: regions for page, regions in report.items() if regions}
+    if args.json:
+        text = json.dumps({'template': TEMPLATE_FILE, 'pages': report}, indent=1) + "\n"
+        if args.json == '-':
+            sys.stdout.write(text)
+        else:
+            Path(args.json).write_text(text, encoding='utf-8')
+    if args.json != '-':
+        print(f"Template drift from {TEMPLATE_FILE}: {len(drifted)} of {len(report)} pages")
+        for name in REGIONS:
+            count = sum(1 for regions in drifted.values() if name in regions)
+            print(f"  {name:<12}{count:>4} pages")
+        for page, regions in report.items():
+            if regions:
+                print(f"  [DRIFT] {page}")
+                for name, description in regions.items():
+                    print(f"      {name}: {description}")
+            elif args.all:
+                print(f"  [OK]    {page}")
+
+    if args.check and drifted:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
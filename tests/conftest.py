@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The build scripts are top-level modules in the site root
+SITE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SITE_ROOT))
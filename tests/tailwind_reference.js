@@ -0,0 +1,26 @@
+// Tailwind's CSS for the class names on stdin (one per line), from the Play CDN build
+// given as the argument, run against a stub of the DOM it reads the class names from.
+// Usage: node tests/tailwind_reference.js vendor/tailwindcss/tailwindcss-play-3.4.5.js < classes.txt
+const fs = require('fs');
+
+const classes = fs.readFileSync(0, 'utf8').split('\n').filter(Boolean);
+const observers = [];
+let sheet = null;
+
+globalThis.window = globalThis;
+globalThis.self = globalThis;
+globalThis.document = {
+  documentElement: {},
+  body: {},
+  head: { append(element) { sheet = element; } },
+  createElement: () => ({ textContent: '', isConnected: true }),
+  querySelectorAll: selector => selector === '[class]' ? [{ classList: classes }] : [],
+};
+globalThis.MutationObserver = class {
+  constructor(callback) { observers.push(callback); }
+  observe() {}
+};
+
+(0, eval)(fs.readFileSync(process.argv[2], 'utf8'));
+// The first observer rebuilds the stylesheet from every class in the document
+observers[0]([]).then(() => process.stdout.write(sheet.textContent));
@@ -0,0 +1,32 @@
+import re
+
+import pytest
+
+import batch_update_vehicles
+from conftest import SITE_ROOT
+
+INFO = {'vehicle_name': "Nissan Juke 2012", 'model': "Nissan Juke"}
+
+
+def reference():
+    return (SITE_ROOT / batch_update_vehicles.REFERENCE_FILE).read_text(encoding='utf-8')
+
+
+def test_every_slot_of_the_reference_page_is_filled():
+    page = batch_update_vehicles.ReferenceTemplate(reference()).render(INFO)
+
+    assert "<title>Nissan Juke 2012 - Zamto Africa" in page
+    # The reference writes content= before name=
+    assert re.search(r'<meta content="Nissan Juke 2012 available at Zamto Africa Company Ltd\."\s+name="description">',
+                     page)
+    assert '<span class="text-navy font-medium">Nissan Juke 2012</span>' in page
+    assert re.search(r'<h1 class="[^"]*\bmb-2\b[^"]*">Nissan Juke</h1>', page)
+    # The logo's h1 is not the vehicle title
+    assert "ZAMTO AFRICA</h1>" in page
+
+
+def test_reference_page_without_a_slot_is_rejected():
+    without_heading = re.sub(r'<h1\b[^>]*\bmb-2\b[^>]*>.*?</h1>', '', reference(), flags=re.DOTALL)
+
+    with pytest.raises(ValueError, match="heading"):
+        batch_update_vehicles.ReferenceTemplate(without_heading)
@@ -0,0 +1,52 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import build_sitemap
+
+PAGE = '<html><head><title>Market trends</title>{head}</head><body><p>{text}</p></body></html>\n'
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+
+def commit(root, date, head='', text='Prices are up'):
+    (root / 'blog.html').write_text(PAGE.format(head=head, text=text), encoding='utf-8')
+    env = dict(os.environ, GIT_AUTHOR_DATE=f"{date}T12:00:00", GIT_COMMITTER_DATE=f"{date}T12:00:00")
+    subprocess.run(['git', 'add', 'blog.html'], cwd=root, check=True)
+    subprocess.run(['git', '-c', 'user.name=site', '-c', 'user.email=site@example.com', 'commit', '-q', '-m', date],
+                   cwd=root, env=env, check=True)
+
+
+@pytest.fixture
+def site(tmp_path):
+    """A checkout whose page got its text in 2025-03-01; later commits only changed its stylesheet link."""
+    subprocess.run(['git', 'init', '-q'], cwd=tmp_path, check=True)
+    commit(tmp_path, '2024-01-01', text='Prices were down')
+    commit(tmp_path, '2025-03-01')
+    commit(tmp_path, '2025-09-01', head='<link rel="stylesheet" href="site.1111111111.css">')
+    commit(tmp_path, '2026-02-01', head='<link rel="stylesheet" href="site.2222222222.css">')
+    return tmp_path
+
+
+def lastmods(root):
+    entries, _ = build_sitemap.collect_entries(root, {'version': build_sitemap.STATE_VERSION, 'pages': {}},
+                                               today='2026-10-18')
+    return {name: lastmod for name, _, lastmod, _, _ in entries}
+
+
+def test_page_without_state_is_dated_from_its_last_content_change(site):
+    assert lastmods(site) == {'blog.html': '2025-03-01'}
+
+
+def test_uncommitted_content_is_dated_today(site):
+    (site / 'blog.html').write_text(PAGE.format(head='', text='Prices are flat'), encoding='utf-8')
+
+    assert lastmods(site) == {'blog.html': '2026-10-18'}
+
+
+def test_page_outside_a_checkout_is_dated_today(site):
+    shutil.rmtree(site / '.git')
+
+    assert lastmods(site) == {'blog.html': '2026-10-18'}
@@ -0,0 +1,88 @@
+import re
+import shutil
+import subprocess
+
+import css_bundle
+import pytest
+from conftest import SITE_ROOT
+
+TAILWIND = SITE_ROOT / 'vendor' / 'tailwindcss' / 'tailwindcss-play-3.4.5.js'
+REFERENCE_SCRIPT = SITE_ROOT / 'tests' / 'tailwind_reference.js'
+
+# The Play CDN runs autoprefixer after Tailwind; its prefixed copies are not Tailwind's rules
+VENDOR_PREFIX_PATTERN = re.compile(r'^-(webkit|moz|ms)-')
+
+
+def used_classes():
+    classes = set()
+    for path in css_bundle.content_files(SITE_ROOT):
+        classes |= css_bundle.candidates(path.read_text(encoding='utf-8', errors='replace'))
+    return classes
+
+
+def declarations(body):
+    """{property: value} as the browser resolves it: later declarations win, vendor prefixes ignored."""
+    resolved = {}
+    for declaration in body.split(';'):
+        name, _, value = declaration.partition(':')
+        name = name.strip()
+        if not name or VENDOR_PREFIX_PATTERN.match(name):
+            continue
+        items = re.split(r'\s*,\s*', ' '.join(value.split()))
+        resolved[name] = ', '.join(item for item in items if not VENDOR_PREFIX_PATTERN.match(item))
+    return resolved
+
+
+def parse_rules(css, media=None):
+    """[((media, selector), declarations or keyframes text), ...] in stylesheet order."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    rules = []
+    position = 0
+    while (brace := css.find('{', position)) != -1:
+        depth, end = 1, brace + 1
+        while depth:
+            depth += {'{': 1, '}': -1}.get(css[end], 0)
+            end += 1
+        prelude = ' '.join(css[position:brace].split())
+        body = css[brace + 1:end - 1]
+        if prelude.startswith('@media'):
+            rules += parse_rules(body, prelude.replace(' ', ''))
+        elif prelude.startswith('@keyframes'):
+            rules.append(((media, prelude), ''.join(body.split())))
+        else:
+            rules.append(((media, re.sub(r'\s*,\s*', ',', prelude)), declarations(body)))
+        position = end
+    return rules
+
+
+@pytest.fixture(scope='module')
+def stylesheets():
+    """(css_bundle's rules, Tailwind's rules) for every class the site uses."""
+    if shutil.which('node') is None:
+        pytest.skip("node is not installed")
+    classes = sorted(used_classes())
+    tailwind = subprocess.run(['node', str(REFERENCE_SCRIPT), str(TAILWIND)], input='\n'.join(classes),
+                              capture_output=True, text=True, check=True, timeout=120).stdout
+    css, _ = css_bundle.generate_css(classes)
+    return parse_rules(css), parse_rules(tailwind)
+
+
+def test_bundle_has_tailwinds_rules_for_every_used_class(stylesheets):
+    ours, tailwind = (dict(rules) for rules in stylesheets)
+
+    assert sorted(set(tailwind) - set(ours), key=str) == []
+    assert sorted(set(ours) - set(tailwind), key=str) == []
+    assert [key for key in tailwind if ours[key] != tailwind[key]] == []
+
+
+def test_bundle_orders_rules_like_tailwind(stylesheets):
+    # Keyframes may go anywhere; the order of everything else decides which utility wins
+    ours, tailwind = ([key for key, _ in rules if not key[1].startswith('@')] for rules in stylesheets)
+
+    assert ours == tailwind
+
+
+def test_committed_bundle_is_current():
+    bundle, _, _ = css_bundle.build_bundle(SITE_ROOT)
+
+    assert css_bundle.current_bundle(SITE_ROOT) == bundle
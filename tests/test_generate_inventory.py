@@ -0,0 +1,51 @@
+import json
+
+import generate_inventory
+from bs4 import BeautifulSoup
+from conftest import SITE_ROOT
+
+
+def committed_cards():
+    html = (SITE_ROOT / generate_inventory.INVENTORY_FILE).read_text(encoding='utf-8')
+    return BeautifulSoup(html, 'html.parser').select('.vehicle-card')
+
+
+def committed_index():
+    return json.loads((SITE_ROOT / generate_inventory.DATA_FILE).read_text(encoding='utf-8'))['index']
+
+
+def rows_of(index, token):
+    return index['postings'][index['tokens'].index(token)]
+
+
+def test_index_rows_are_the_inventory_cards():
+    # inventory.html filters card i through row i of the index
+    cards = committed_cards()
+    index = committed_index()
+
+    assert len(cards) == len(index['year'])
+    for row, card in enumerate(cards):
+        assert row in rows_of(index, f"category:{card['data-type'].lower()}")
+        assert row in rows_of(index, f"type:{card['data-category']}")
+
+
+def test_index_covers_every_card_search_word():
+    index = committed_index()
+
+    for row, card in enumerate(committed_cards()):
+        for word in generate_inventory._tokens(card['data-search']):
+            assert row in rows_of(index, word), (card['data-name'], word)
+
+
+def test_cards_only_carry_transmissions_and_fuels():
+    for card in committed_cards():
+        assert generate_inventory.spec_term(card['data-transmission'], generate_inventory.TRANSMISSIONS), \
+            card['data-name']
+        assert generate_inventory.spec_term(card['data-fuel'], generate_inventory.FUEL_TYPES), card['data-name']
+
+
+def test_spec_term_names_the_term_in_any_wording():
+    assert generate_inventory.spec_term("6-Speed Manual", generate_inventory.TRANSMISSIONS) == "Manual"
+    assert generate_inventory.spec_term("Driver & Insurance ✓", generate_inventory.TRANSMISSIONS) is None
+    assert generate_inventory.spec_term("Gasoline", generate_inventory.FUEL_TYPES) == "Petrol"
+    assert generate_inventory.spec_term("Petrol Hybrid", generate_inventory.FUEL_TYPES) == "Hybrid"
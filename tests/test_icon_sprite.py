@@ -0,0 +1,38 @@
+import build_manifest
+import icon_sprite
+from conftest import SITE_ROOT
+
+# Names used on the pages that Lucide has never had; the runtime rendered nothing for them either
+NOT_IN_LUCIDE = {'blog', 'motorcycle', 'road', 'van'}
+
+
+def test_every_used_icon_is_vendored():
+    _, included, missing = icon_sprite.build_sprite(icon_sprite.used_icons(SITE_ROOT), root=SITE_ROOT)
+
+    assert set(missing) == NOT_IN_LUCIDE
+    assert included
+
+
+def test_committed_sprite_is_built_from_the_vendored_icons():
+    sprite, included, _ = icon_sprite.build_sprite(icon_sprite.used_icons(SITE_ROOT), root=SITE_ROOT)
+    sprite_name, names = icon_sprite.current_sprite(SITE_ROOT)
+
+    assert sprite_name == f"icons.{build_manifest.hash_bytes(sprite)[:10]}.svg"
+    assert names == set(included)
+
+
+def test_no_page_loads_the_lucide_runtime():
+    for page in SITE_ROOT.glob('*.html'):
+        assert not icon_sprite.LUCIDE_SCRIPT_PATTERN.search(page.read_text(encoding='utf-8')), page.name
+
+
+def test_link_icons_leaves_script_markup_for_the_shim():
+    html = ('<i data-lucide="car" class="w-4 h-4"></i>'
+            '<script>el.innerHTML = \'<i data-lucide="car"></i>\';</script>')
+
+    linked = icon_sprite.link_icons(html, 'icons.0123456789.svg', {'car'})
+
+    assert linked.startswith('<svg ')
+    assert 'class="lucide lucide-car w-4 h-4"' in linked
+    assert '<use href="icons.0123456789.svg#car"></use>' in linked
+    assert linked.endswith('<script>el.innerHTML = \'<i data-lucide="car"></i>\';</script>')
@@ -0,0 +1,45 @@
+import pytest
+
+import image_pipeline
+from conftest import SITE_ROOT
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def site(tmp_path):
+    """A site with two good photos, one truncated photo and a variant left over by an interrupted run."""
+    source_dir = tmp_path / image_pipeline.SOURCE_DIR
+    source_dir.mkdir(parents=True)
+    for name in ('good one.jpg', 'good-two.jpg'):
+        Image.new('RGB', (400, 300), 'navy').save(source_dir / name, 'JPEG')
+    photo = (SITE_ROOT / image_pipeline.SOURCE_DIR / 'mercedes benz c180 2015-6.jpg').read_bytes()
+    (source_dir / 'truncated.jpg').write_bytes(photo[:len(photo) // 2])
+    (tmp_path / image_pipeline.VARIANT_DIR).mkdir()
+    (tmp_path / image_pipeline.VARIANT_DIR / 'orphan-12345678-160w.webp').write_bytes(b'')
+    return tmp_path
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_undecodable_source_is_skipped_and_the_rest_saved(site, jobs):
+    manifest, rebuilt, skipped, removed, failed = image_pipeline.build_images(site, jobs)
+
+    source = f"{image_pipeline.SOURCE_DIR}/truncated.jpg"
+    assert list(failed) == [source] and 'truncated' in failed[source]
+    assert (rebuilt, skipped, removed) == (2, 0, 1)
+    assert image_pipeline.load_manifest(site) == manifest
+    assert sorted(manifest['images']) == [f"{image_pipeline.SOURCE_DIR}/good one.jpg",
+                                          f"{image_pipeline.SOURCE_DIR}/good-two.jpg"]
+
+
+def test_next_run_keeps_the_saved_images(site):
+    image_pipeline.build_images(site)
+
+    _, rebuilt, skipped, removed, failed = image_pipeline.build_images(site)
+
+    assert (rebuilt, skipped, removed, len(failed)) == (0, 2, 0, 1)
+    written = {path.name for path in (site / image_pipeline.VARIANT_DIR).iterdir()}
+    listed = {variant['path'] for entry in image_pipeline.load_manifest(site)['images'].values()
+              for variant in entry['variants']}
+    assert {f"{image_pipeline.VARIANT_DIR}/{name}" for name in written} == \
+        {path for path in listed if path.startswith(image_pipeline.VARIANT_DIR + '/')} | {image_pipeline.MANIFEST_FILE}
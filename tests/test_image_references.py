@@ -0,0 +1,21 @@
+import image_pipeline
+import image_references
+
+VARIANT = f"{image_pipeline.VARIANT_DIR}/jazz-0123abcd-320w.webp"
+
+
+def test_manifest_variants_are_not_dangling(tmp_path):
+    (tmp_path / 'images/vehicles').mkdir(parents=True)
+    (tmp_path / 'images/vehicles/jazz.jpg').write_bytes(b'jpeg')
+    image_pipeline.save_manifest({'version': image_pipeline.MANIFEST_VERSION, 'images': {
+        'images/vehicles/jazz.jpg': {'sha256': '0123abcd', 'width': 640, 'height': 480, 'variants': [
+            {'width': 320, 'type': 'image/webp', 'path': VARIANT},
+            {'width': 640, 'type': 'image/jpeg', 'path': 'images/vehicles/jazz.jpg'}]}}}, tmp_path)
+    (tmp_path / 'vehicle-jazz.html').write_text(
+        f'<img src="images/vehicles/jazz.jpg" srcset="{VARIANT} 320w, images/vehicles/jazz.jpg 640w">\n'
+        f'<img src="{image_pipeline.VARIANT_DIR}/gone-89abcdef-320w.webp">\n', encoding='utf-8')
+
+    index = image_references.build_index(tmp_path)
+
+    assert index.dangling() == [f"{image_pipeline.VARIANT_DIR}/gone-89abcdef-320w.webp"]
+    assert index.orphaned() == []
@@ -0,0 +1,119 @@
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import build_service_worker
+import build_sitemap
+import minify_site
+from conftest import SITE_ROOT
+
+DRAFTS = ('temp_grid.html', 'test-gallery.html', 'test-images.html', 'vehicle-details-old.html',
+          'vehicle-details.html')
+
+
+def test_deployed_pages_are_the_sitemap_pages():
+    deployed = {path for path in minify_site.deploy_files(SITE_ROOT) if '/' not in path and path.endswith('.html')}
+
+    assert deployed == set(build_sitemap.sitemap_pages(SITE_ROOT))
+    assert not deployed & set(DRAFTS)
+
+
+def test_htaccess_is_deployed():
+    assert '.htaccess' in minify_site.deploy_files(SITE_ROOT)
+
+
+def test_htaccess_serves_every_precompressed_type():
+    htaccess = (SITE_ROOT / '.htaccess').read_text(encoding='utf-8')
+    rules = re.findall(r'RewriteRule \^\(\.\+\\\.\(([\w|]+)\)\)\$ \$1\.(br|gz)', htaccess)
+
+    assert sorted(encoding for _, encoding in rules) == ['br', 'gz']
+    for extensions, _ in rules:
+        assert {f'.{extension}' for extension in extensions.split('|')} == set(minify_site.COMPRESS_EXTENSIONS)
+    assert 'AddEncoding br .br' in htaccess and 'AddEncoding gzip .gz' in htaccess
+    assert 'Vary Accept-Encoding' in htaccess
+
+
+def test_build_dist_leaves_drafts_behind(tmp_path):
+    site = tmp_path / 'site'
+    site.mkdir()
+    (site / 'index.html').write_text('<!DOCTYPE html>\n<html>\n  <body>\n    <p>Home</p>\n  </body>\n</html>\n' * 20)
+    (site / 'temp_grid.html').write_text('<p>draft</p>\n')
+    (site / '.htaccess').write_text('RewriteEngine On\n')
+
+    results, _, _ = minify_site.build_dist(site, tmp_path / 'dist')
+    written = {path.relative_to(tmp_path / 'dist').as_posix() for path in (tmp_path / 'dist').rglob('*')}
+
+    assert [path for path, *_ in results] == ['.htaccess', 'index.html']
+    assert {'.htaccess', 'index.html', 'index.html.gz'} <= written
+    assert not any(name.startswith(('temp_grid', '.htaccess.')) for name in written)
+
+
+def test_tooling_is_not_deployed():
+    assert not [path for path in minify_site.deploy_files(SITE_ROOT) if path.startswith(('tests/', 'vendor/'))]
+
+
+def test_every_precached_file_is_deployed():
+    deployed = set(minify_site.deploy_files(SITE_ROOT))
+
+    assert [path for path in build_service_worker.precache_files(SITE_ROOT) if path not in deployed] == []
+
+
+@pytest.mark.parametrize('js, minified', [
+    # A line break that does not end the statement is kept, so ASI reads it the same way
+    ('a\n(b)', 'a\n(b)'),
+    ('a = b\n++c', 'a=b\n++c'),
+    # ...and one that does: return\n{ returns undefined
+    ('return\n{\n  x: 1\n}', 'return\n{x:1}'),
+    ('if (ok) {\n  go();\n}\ndone()', 'if(ok){go();}\ndone()'),
+    ('x = a / b / c', 'x=a/b/c'),
+    ('path = url.replace(/\\/+ $/g, "/") // trailing slashes', 'path=url.replace(/\\/+ $/g,"/")'),
+    ('return /  x/.test(s)', 'return/  x/.test(s)'),
+    ('a = b - -c; d = e + +f', 'a=b- -c;d=e+ +f'),
+    ('s = `a  ${ {b: 1}.b }  c ${`n ${ d }`}`;\nf()', 's=`a  ${{b:1}.b}  c ${`n ${d}`}`;f()'),
+    ('s = "  //  not a comment  "', 's="  //  not a comment  "'),
+    ('/* block\n comment */ x = 1', 'x=1'),
+])
+def test_minify_js(js, minified):
+    assert minify_site.minify_js(js) == minified
+
+
+@pytest.mark.parametrize('html, minified', [
+    ('<div>\n  <p>One</p>\n  <p>Two</p>\n</div>\n', '<div><p>One</p><p>Two</p></div>\n'),
+    # Between inline elements whitespace is a space
+    ('<p><b>a</b>\n   <i>b</i></p>', '<p><b>a</b> <i>b</i></p>\n'),
+    # <pre> and <textarea> keep their whitespace
+    ('<pre>  a\n    b  </pre>\n<p>x</p>', '<pre>  a\n    b  </pre><p>x</p>\n'),
+    ('<p><textarea>  t\n  </textarea></p>', '<p><textarea>  t\n  </textarea></p>\n'),
+    ('<!-- note --><p>x</p><!--[if IE]><p>ie</p><![endif]-->', '<p>x</p><!--[if IE]><p>ie</p><![endif]-->\n'),
+    ('<a  href="x  y"\n   class="c" >z</a>', '<a href="x  y" class="c">z</a>\n'),
+    ('<script>\n  let x = 1;\n</script><style>\n  a { color: red; }\n</style>',
+     '<script>let x=1;</script><style>a{color:red}</style>\n'),
+    ('<script type="application/ld+json">\n{ "a": [1, 2] }\n</script>',
+     '<script type="application/ld+json">{"a":[1,2]}</script>\n'),
+])
+def test_minify_html(html, minified):
+    assert minify_site.minify_html(html) == minified
+
+
+@pytest.mark.parametrize('css, minified', [
+    ('a  >  b {\n  color: red;\n  margin: 0 auto;\n}\n', 'a>b{color:red;margin:0 auto}'),
+    ('a { color: red; /* note */ }', 'a{color:red}'),
+    ('a::before { content: "  x ; { y }  " ; }', 'a::before{content:"  x ; { y }  "}'),
+    # The space is a descendant combinator here
+    ('nav :hover { x: 1 }', 'nav :hover{x:1}'),
+])
+def test_minify_css(css, minified):
+    assert minify_site.minify_css(css) == minified
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+@pytest.mark.parametrize('script', [path for path in minify_site.deploy_files(SITE_ROOT) if path.endswith('.js')])
+def test_minified_site_scripts_parse(script, tmp_path):
+    minified = tmp_path / script
+    minified.write_text(minify_site.minify_js((SITE_ROOT / script).read_text(encoding='utf-8')), encoding='utf-8')
+
+    result = subprocess.run(['node', '--check', str(minified)], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
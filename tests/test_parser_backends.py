@@ -0,0 +1,46 @@
+import functools
+
+import parser_backend
+import pytest
+import vehicle_catalog
+from conftest import SITE_ROOT
+
+# Every backend must reproduce what the reference backend extracts
+REFERENCE_BACKEND = 'html.parser'
+
+PAGES = vehicle_catalog.get_vehicle_files(SITE_ROOT) + sorted(
+    f"backups/{page.name}" for page in (SITE_ROOT / 'backups').glob('*.html'))
+OTHER_BACKENDS = [backend for backend in parser_backend.BACKENDS if backend != REFERENCE_BACKEND]
+
+
+@functools.lru_cache(maxsize=None)
+def extract(page, backend):
+    content = (SITE_ROOT / page).read_text(encoding='utf-8')
+    return vehicle_catalog.parse_vehicle_page(content, page.rsplit('/', 1)[-1], backend)
+
+
+def test_there_are_pages_to_compare():
+    assert vehicle_catalog.get_vehicle_files(SITE_ROOT)
+    assert any(page.startswith('backups/') for page in PAGES)
+
+
+@pytest.mark.parametrize('backend', OTHER_BACKENDS)
+@pytest.mark.parametrize('page', PAGES)
+def test_backend_extracts_what_html_parser_does(page, backend):
+    if not parser_backend.is_available(backend):
+        pytest.skip(f"{backend} is not installed")
+
+    assert extract(page, backend) == extract(page, REFERENCE_BACKEND)
+
+
+def test_default_backend_is_the_fastest_installed(monkeypatch):
+    monkeypatch.delenv(parser_backend.ENV_VAR, raising=False)
+
+    assert parser_backend.get_backend() == parser_backend.available_backends()[0]
+
+
+def test_forced_backend_must_be_installed(monkeypatch):
+    monkeypatch.setenv(parser_backend.ENV_VAR, 'no-such-parser')
+
+    with pytest.raises(ValueError):
+        parser_backend.get_backend()
@@ -0,0 +1,98 @@
+import shutil
+
+import pytest
+
+import backup_store
+import restore_vehicle_data
+from conftest import SITE_ROOT
+
+PAGE = 'vehicle-toyota-passo-2012.html'
+
+
+def original_page(title, description="Original description", body="<main>Original vehicle data</main>"):
+    return (f'<!DOCTYPE html>\n<html>\n<head>\n  <title>{title}</title>\n'
+            f'  <meta name="description" content="{description}" />\n</head>\n<body>\n'
+            f'  <header><nav>Old header</nav></header>\n{body}\n  <!-- Footer -->\n'
+            f'  <footer>Old footer</footer>\n</body>\n</html>\n')
+
+
+def test_reference_header_ends_before_the_breadcrumbs():
+    reference = (SITE_ROOT / restore_vehicle_data.REFERENCE_FILE).read_text(encoding='utf-8')
+
+    header, footer = restore_vehicle_data.extract_header_footer_from_reference()
+
+    assert reference.startswith(header)
+    assert '<!-- Breadcrumbs' not in header
+    assert '</header>' in header
+    assert header.rstrip().endswith('</div>')
+    assert reference[len(header):].lstrip().startswith('<!-- Breadcrumbs -->')
+    assert footer.startswith('  <!-- FOOTER')
+    assert reference.endswith(footer)
+
+
+def test_reference_without_breadcrumbs_is_rejected(tmp_path):
+    reference = tmp_path / 'reference.html'
+    reference.write_text("<html><header></header>\n  <!-- FOOTER -->\n<footer></footer></html>\n", encoding='utf-8')
+
+    assert restore_vehicle_data.extract_header_footer_from_reference(reference) == (None, None)
+    assert restore_vehicle_data.ReferenceLayout.load(reference) is None
+
+
+def test_compose_puts_the_pages_title_and_description_in_the_reference_header():
+    layout = restore_vehicle_data.ReferenceLayout.load()
+    header, footer = restore_vehicle_data.extract_header_footer_from_reference()
+
+    page = layout.compose("Toyota Passo 2012", "A compact hatchback", "<main>body</main>")
+
+    assert page.count('<title>') == 1
+    assert '<title>Toyota Passo 2012</title>' in page
+    assert '<meta name="description" content="A compact hatchback" />' in page
+    # Nothing about the reference's own vehicle is carried over
+    assert 'Alphard' not in page
+    assert page.endswith("\n<main>body</main>\n" + footer)
+    assert page.startswith(header[:header.index('<title>')])
+
+
+def test_restore_file_keeps_the_original_content():
+    layout = restore_vehicle_data.ReferenceLayout.load()
+    written = {}
+
+    class Writer:
+        def write(self, path, content):
+            written[path] = content
+
+    assert restore_vehicle_data.restore_file(original_page("Passo"), PAGE, layout, Writer())
+    assert '<title>Passo</title>' in written[PAGE]
+    assert '<main>Original vehicle data</main>' in written[PAGE]
+    assert 'Old footer' not in written[PAGE]
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A site with the reference page and three backups of PAGE."""
+    shutil.copy(SITE_ROOT / restore_vehicle_data.REFERENCE_FILE, tmp_path)
+    store = backup_store.BackupStore(tmp_path)
+    for timestamp in ('20250101_000000', '20250601_000000', '20251201_000000'):
+        store.save(PAGE, original_page(f"Passo {timestamp}").encode('utf-8'), timestamp)
+    store.save_index()
+    monkeypatch.setattr(restore_vehicle_data, 'SITE_ROOT', tmp_path)
+    monkeypatch.setattr(restore_vehicle_data, 'FILES_TO_FIX', [PAGE])
+    return tmp_path
+
+
+@pytest.mark.parametrize('argv, timestamp', [
+    ([], '20250101_000000'),
+    (['--latest'], '20251201_000000'),
+    (['--at', '20250701_000000'], '20250601_000000'),
+    (['--at', '20250601_000000'], '20250601_000000'),
+])
+def test_version_selection(site, argv, timestamp):
+    restore_vehicle_data.main(argv)
+
+    assert f'<title>Passo {timestamp}</title>' in (site / PAGE).read_text(encoding='utf-8')
+
+
+def test_at_before_every_backup_restores_nothing(site):
+    restore_vehicle_data.main(['--at', '20240101_000000'])
+
+    assert not (site / PAGE).exists()
@@ -0,0 +1,70 @@
+import dataclasses
+import shutil
+
+import numpy as np
+import pytest
+
+import generate_inventory
+import similar_vehicles
+import vehicle_catalog
+from conftest import SITE_ROOT
+
+
+@pytest.fixture(scope='module')
+def site(tmp_path_factory):
+    """A copy of the vehicle pages and listing, so the catalog cache is built outside the repo."""
+    root = tmp_path_factory.mktemp('site')
+    for page in SITE_ROOT.glob('vehicle-*.html'):
+        shutil.copy(page, root)
+    shutil.copy(SITE_ROOT / generate_inventory.LISTING_FILE, root)
+    return root
+
+
+def test_injected_section_does_not_feed_back_into_the_catalog(site):
+    sections, recommended, _ = similar_vehicles.build_sections(site)
+    before = {page: dataclasses.asdict(record) for page, record in vehicle_catalog.load_catalog(site).items()}
+
+    for page, section in sections.items():
+        path = site / page
+        # Reverse the cards so every section's text changes
+        other = similar_vehicles.render_section(generate_inventory.build_vehicle(
+            {'page': page, 'name': before[page]['vehicle_name'], 'body_type': ''}, {}), recommended[page][::-1])
+        path.write_text(similar_vehicles.inject_section(path.read_text(encoding='utf-8'), other), encoding='utf-8')
+    after = {page: dataclasses.asdict(record) for page, record in vehicle_catalog.load_catalog(site).items()}
+
+    for record in (*before.values(), *after.values()):
+        record.pop('source_hash')
+    assert after == before
+
+
+def test_sections_are_a_fixed_point(site):
+    sections, _, _ = similar_vehicles.build_sections(site)
+    for page, section in sections.items():
+        path = site / page
+        path.write_text(similar_vehicles.inject_section(path.read_text(encoding='utf-8'), section), encoding='utf-8')
+
+    assert similar_vehicles.build_sections(site)[0] == sections
+
+
+def vehicle(year, price, body_type='suv'):
+    return {'year': year, 'engine': '2000cc Petrol', 'seats': '5', 'price': price, 'listing': 'sale',
+            'body_type': body_type, 'fuel': 'Petrol', 'transmission': 'Automatic'}
+
+
+def test_zero_price_counts_as_missing():
+    vehicles = [vehicle(2015, 'K 0'), vehicle(2016, 'K 250,000'), vehicle(2018, 'K 300,000'), vehicle(2019, 'K 400,000')]
+
+    features = similar_vehicles.feature_matrix(vehicles)
+    neighbours = similar_vehicles.nearest_neighbours(features, np.ones(len(vehicles), dtype=bool), k=2)
+
+    assert np.isfinite(features).all()
+    assert (neighbours >= 0).all()
+
+
+def test_non_candidates_get_every_candidate_as_a_neighbour():
+    vehicles = [vehicle(2015 + i, f'K {100_000 * (i + 1)}') for i in range(4)]
+    candidates = np.array([True, True, False, False])
+
+    neighbours = similar_vehicles.nearest_neighbours(similar_vehicles.feature_matrix(vehicles), candidates, k=3)
+
+    assert neighbours.tolist() == [[1, -1, -1], [0, -1, -1], [1, 0, -1], [1, 0, -1]]
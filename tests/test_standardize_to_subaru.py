@@ -0,0 +1,63 @@
+import json
+import re
+import shutil
+
+import pytest
+
+import standardize_to_subaru
+import vehicle_catalog
+from conftest import SITE_ROOT
+
+# What the script reads besides the vehicle pages and the build/ state it keeps
+SITE_INPUTS = ('*.html', '*.css', '*.json', 'CNAME')
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    for pattern in SITE_INPUTS:
+        for path in SITE_ROOT.glob(pattern):
+            shutil.copy(path, tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run(capsys, *argv):
+    """Number of pages written by one run."""
+    standardize_to_subaru.main(list(argv))
+    return int(re.search(r'\((\d+) written', capsys.readouterr().out).group(1))
+
+
+def test_incremental_run_after_a_clean_build_writes_nothing(site, capsys):
+    run(capsys)
+
+    assert run(capsys, '--incremental') == 0
+
+
+def test_full_rebuild_is_a_fixed_point(site, capsys):
+    run(capsys)
+
+    assert run(capsys) == 0
+
+
+def test_listing_change_settles_in_one_run(site, capsys):
+    run(capsys)
+    listing = site / 'inventory-listing.json'
+    # Marking a vehicle sold changes its own JSON-LD and the Similar Vehicles of the pages that showed it
+    entries = json.loads(listing.read_text(encoding='utf-8'))
+    for entry in entries:
+        if entry.get('page') == 'vehicle-toyota-passo-blue-2012.html':
+            entry['sold'] = True
+    listing.write_text(json.dumps(entries, indent=2), encoding='utf-8')
+
+    assert run(capsys, '--incremental') > 0
+    assert run(capsys, '--incremental') == 0
+
+
+def test_compiled_template_renders_what_filling_the_tree_does():
+    # render_in_tree is the benchmark's baseline, so it must do the same work
+    template_html = (SITE_ROOT / standardize_to_subaru.TEMPLATE_FILE).read_text(encoding='utf-8')
+    compiled = standardize_to_subaru.CompiledTemplate(template_html)
+
+    for path in sorted(SITE_ROOT.glob('vehicle-*.html')):
+        data = vehicle_catalog.build_record(path.read_bytes().decode('utf-8'), path.name).template_data()
+        assert compiled.render(data) == standardize_to_subaru.render_in_tree(template_html, data), path.name
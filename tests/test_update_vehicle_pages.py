@@ -0,0 +1,13 @@
+import template_drift
+import update_vehicle_pages
+
+
+def test_template_is_fingerprinted_once(monkeypatch, capsys):
+    calls = []
+    template_regions = template_drift.template_regions
+    monkeypatch.setattr(template_drift, 'template_regions', lambda *args: calls.append(args) or template_regions(*args))
+
+    update_vehicle_pages.main()
+
+    assert len(calls) == 1
+    assert "Needs update" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import dataclasses
+import re
+
+import pytest
+
+import vehicle_catalog
+from conftest import SITE_ROOT
+
+PAGES = ('vehicle-bmw-x1-2011.html', 'vehicle-honda-fit-2009.html', 'vehicle-toyota-passo-hire.html')
+
+
+def read_page(name):
+    return (SITE_ROOT / name).read_bytes().decode('utf-8')
+
+
+def record_fields(html_content, filename):
+    record = dataclasses.asdict(vehicle_catalog.build_record(html_content, filename))
+    record.pop('source_hash')
+    return record
+
+
+def related_section(html_content):
+    start = html_content.index('<!-- Similar Vehicles -->')
+    return start, html_content.index('</section>', start)
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_related_cards_do_not_change_the_record(page):
+    html_content = read_page(page)
+    start, end = related_section(html_content)
+    cards = html_content[start:end]
+    changed = re.sub(r'[\d,]+\s*km', '999,999 km', cards)
+    changed = re.sub(r'images/vehicles/[^"\']+', 'images/vehicles/other-car.jpg', changed)
+    assert changed != cards
+
+    assert record_fields(html_content[:start] + changed + html_content[end:], page) == record_fields(html_content, page)
+
+
+def test_mileage_is_not_taken_from_a_related_card():
+    html_content = read_page('vehicle-bmw-x1-2011.html')
+    start, _ = related_section(html_content)
+    assert not re.search(r'[\d,]+\s*km', html_content[:start])
+
+    assert vehicle_catalog.build_record(html_content, 'vehicle-bmw-x1-2011.html').mileage == ""
+
+
+def test_own_mileage_comes_from_the_model_line():
+    record = vehicle_catalog.build_record(read_page('vehicle-honda-fit-2009.html'), 'vehicle-honda-fit-2009.html')
+
+    assert record.mileage == "131,410"
+
+
+def test_json_ld_does_not_feed_back_into_the_record():
+    page = 'vehicle-honda-fit-2009.html'
+    html_content = read_page(page)
+    script = ('<script type="application/ld+json">{"@type": "Vehicle", "description": "12,345 km", '
+              '"image": ["https://example.com/images/vehicles/other-car.jpg"]}</script>\n')
+    with_json_ld = html_content.replace('</head>', script + '</head>', 1)
+
+    assert record_fields(with_json_ld, page) == record_fields(html_content, page)
@@ -0,0 +1,65 @@
+import pytest
+
+import generate_inventory
+import vehicle_catalog
+import vehicle_schema
+from conftest import SITE_ROOT
+
+BASE_URL = "https://www.zamtoafrica.com"
+
+
+def json_ld(page):
+    record = vehicle_catalog.build_record((SITE_ROOT / page).read_bytes().decode('utf-8'), page)
+    vehicle = generate_inventory.build_vehicle({'page': page, 'name': vehicle_schema.vehicle_name(record)},
+                                               {page: record})
+    return vehicle_schema.vehicle_json_ld(record, vehicle, BASE_URL)
+
+
+@pytest.mark.parametrize('page, mileage', [
+    # Mileage spec row, which disagrees with the model line
+    ('vehicle-velfire-2010.html', 175723),
+    # "Mileage: 31,898 km" in an older layout
+    ('vehicle-honda-jazz-2016-silver.html', 31898),
+    # The model line, not the "76,542 km" in the page's meta description
+    ('vehicle-toyota-crown-athlete-2006.html', 135000),
+])
+def test_mileage_comes_from_the_pages_spec_data(page, mileage):
+    assert json_ld(page)['mileageFromOdometer']['value'] == mileage
+
+
+@pytest.mark.parametrize('page', [
+    # Its only "km" is the battery range
+    'vehicle-t21-electric-2024.html',
+    # Its only "km" was in a Similar Vehicles card
+    'vehicle-bmw-x1-2011.html',
+])
+def test_mileage_is_left_out_without_spec_data(page):
+    assert 'mileageFromOdometer' not in json_ld(page)
+
+
+def test_pages_without_the_gallery_use_their_own_images():
+    data = json_ld('vehicle-toyota-rav4-2020.html')
+
+    assert data['image'][0] == f"{BASE_URL}/images/vehicles/Honda-rav-4-1.jpg"
+    assert vehicle_schema.validate(data) == []
+
+
+def test_every_vehicle_page_is_valid():
+    for page in vehicle_catalog.get_vehicle_files(SITE_ROOT):
+        assert vehicle_schema.validate(json_ld(page)) == [], page
+
+
+def test_transmission_slot_holding_something_else_is_left_out():
+    # Its Transmission quick spec reads "Driver & Insurance ✓"
+    data = json_ld('vehicle-isuzu-mux-2018.html')
+
+    assert 'vehicleTransmission' not in data
+    assert data['fuelType'] == "Petrol"
+
+
+def test_unknown_transmission_or_fuel_fails_validation():
+    data = dict(json_ld('vehicle-isuzu-mux-2018.html'), vehicleTransmission="Driver & Insurance ✓", fuelType="Gas")
+
+    assert vehicle_schema.validate(data) == [
+        "vehicleTransmission 'Driver & Insurance ✓' is not one of Automatic, Manual, CVT",
+        "fuelType 'Gas' is not one of Hybrid, Electric, Diesel, Petrol"]
@@ -7,6 +7,8 @@ import os
 import re
 from pathlib import Path
 
+import template_drift
+
 # Reference file
 REFERENCE_FILE = "vehicle-toyota-alphard-2020-sale.html"
 
@@ -62,21 +64,20 @@ VEHICLE_FILES = [
     "vehicle-details.html",
 ]
 
-def check_if_already_updated(filepath):
+def check_if_already_updated(filepath, template=None):
     """Check if a file already has the updated design."""
+    return not drifted_regions(filepath, template)
+
+def drifted_regions(filepath, template=None):
+    """
+    Regions of the page that differ from the template's structure (see template_drift.py).
+    Pass the template's fingerprint (template_drift.template_regions()) when checking many pages.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Check for key indicators of the updated design
-            has_breadcrumbs = 'Breadcrumbs' in content or 'breadcrumb' in content.lower()
-            has_tabs = 'tab-btn' in content or 'showTab' in content
-            has_modern_header = 'HEADER - Modern Standard Design' in content
-            has_similar_vehicles = 'Similar Vehicles' in content
-            
-            return has_breadcrumbs and has_tabs and has_modern_header and has_similar_vehicles
+        return template_drift.drifted_regions(filepath, template)
     except Exception as e:
         print(f"Error checking {filepath}: {e}")
-        return False
+        return {'page': f"unreadable: {e}"}
 
 def main():
     script_dir = Path(__file__).parent
@@ -86,6 +87,12 @@ def main():
     
     needs_update = []
     already_updated = []
+    # The template is fingerprinted once; every page is compared against it
+    try:
+        template = template_drift.template_regions(script_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error reading the template {template_drift.TEMPLATE_FILE}: {e}")
+        return
     
     for filename in VEHICLE_FILES:
         filepath = script_dir / filename
@@ -93,12 +100,13 @@ def main():
             print(f"[WARN] File not found: {filename}")
             continue
             
-        if check_if_already_updated(filepath):
+        regions = drifted_regions(filepath, template)
+        if not regions:
             already_updated.append(filename)
             print(f"[OK] Already updated: {filename}")
         else:
             needs_update.append(filename)
-            print(f"[UPDATE] Needs update: {filename}")
+            print(f"[UPDATE] Needs update: {filename} ({', '.join(regions)})")
     
     print("\n" + "=" * 60)
     print(f"\nSummary:")
@@ -0,0 +1,98 @@
+// ===== Zamto Africa Vehicle Search =====
+// Index lookups for inventory.html (zamto-africa-script.js uses them too, but no page loads it)
+
+// ===== Vehicle Data =====
+// Generated from the vehicle pages by generate_inventory.py: `vehicles` are the
+// listing rows, `index` a sorted token list with posting lists (row numbers) and
+// numeric year/priceZmw columns aligned with the rows
+let vehicleData = [];
+let searchIndex = null;
+
+function loadVehicleData() {
+    return fetch('vehicle-data.json')
+        .then(response => response.ok ? response.json() : null)
+        .then(data => {
+            if (data) {
+                vehicleData = data.vehicles;
+                searchIndex = data.index;
+            }
+            return vehicleData;
+        })
+        .catch(() => vehicleData);
+}
+
+// Position of the first token >= key in the sorted token list
+function lowerBound(key) {
+    const tokens = searchIndex.tokens;
+    let low = 0;
+    let high = tokens.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (tokens[mid] < key) {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
+    }
+    return low;
+}
+
+// Rows containing a token that starts with `prefix` (field keys like "type:sale" excluded)
+function lookupPrefix(prefix) {
+    const tokens = searchIndex.tokens;
+    const rows = new Set();
+    for (let i = lowerBound(prefix); i < tokens.length && tokens[i].startsWith(prefix); i++) {
+        if (tokens[i].indexOf(':') === -1) {
+            searchIndex.postings[i].forEach(row => rows.add(row));
+        }
+    }
+    return rows;
+}
+
+function lookupExact(key) {
+    const position = lowerBound(key);
+    return new Set(searchIndex.tokens[position] === key ? searchIndex.postings[position] : []);
+}
+
+function intersectRows(a, b) {
+    if (a === null) return b;
+    const [small, large] = a.size <= b.size ? [a, b] : [b, a];
+    return new Set([...small].filter(row => large.has(row)));
+}
+
+// Row numbers (ascending) matching the text query, dropdowns and numeric ranges;
+// rows are positions in vehicleData, and the inventory cards are rendered in the same order
+function queryIndex({ query = '', category = '', type = '', minYear = null, maxYear = null,
+                      minPrice = null, maxPrice = null }) {
+    if (!searchIndex) return [];
+    let rows = null;
+    (query.toLowerCase().match(/[a-z0-9]+/g) || []).forEach(token => {
+        rows = intersectRows(rows, lookupPrefix(token));
+    });
+    // One category, or a list of them (any may match)
+    const categories = [].concat(category).filter(name => name && name !== 'All Categories');
+    if (categories.length) {
+        const matches = new Set();
+        categories.forEach(name => lookupExact(`category:${name.toLowerCase()}`).forEach(row => matches.add(row)));
+        rows = intersectRows(rows, matches);
+    }
+    if (type && type !== 'All Types') {
+        rows = intersectRows(rows, lookupExact(`type:${type.toLowerCase()}`));
+    }
+    let result = rows === null ? vehicleData.map((_, row) => row) : [...rows].sort((a, b) => a - b);
+
+    const inRange = (value, min, max) => value !== null && (min === null || value >= min) && (max === null || value <= max);
+    if (minYear !== null || maxYear !== null) {
+        result = result.filter(row => inRange(searchIndex.year[row], minYear, maxYear));
+    }
+    if (minPrice !== null || maxPrice !== null) {
+        result = result.filter(row => inRange(searchIndex.priceZmw[row], minPrice, maxPrice));
+    }
+    return result;
+}
+
+// ===== Search Functionality =====
+function searchVehicles(query, category, type) {
+    return queryIndex({ query: query || '', category: category || '', type: type || '' })
+        .map(row => vehicleData[row]);
+}
@@ -0,0 +1,411 @@
+"""
+Shared vehicle catalog for the vehicle detail pages.
+Every vehicle-*.html page is parsed once into a VehicleRecord and cached in
+build/vehicle-catalog.json, keyed by the page's content hash. The other
+scripts read vehicle data from here instead of re-parsing every page.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from bs4 import BeautifulSoup
+
+import parser_backend
+
+# Where the parsed catalog is stored (relative to the site root)
+CATALOG_FILE = "build/vehicle-catalog.json"
+
+# Bump when the extraction logic changes so cached records are re-parsed
+CATALOG_VERSION = 3
+
+SITE_ROOT = Path(__file__).parent
+
+# Raw-text fields found in a single sweep over the page's own content: every image
+# path, the first "<digits> km" for the mileage, and the first "<digits> km" labelled
+# Mileage (a spec row, or "Mileage: 31,898 km" in older layouts) for the spec mileage
+RAW_FIELDS_PATTERN = re.compile(
+    r'(?P<image>images/vehicles/[^"\'<>]+?\.(?:jpg|jpeg|png|webp))'
+    r'|Mileage\s*:?\s*(?:<[^>]*>\s*)*(?P<spec_mileage>\d[\d,]*)\s*km'
+    r'|(?P<mileage>[\d,]+)\s*km',
+    re.IGNORECASE,
+)
+# Where the page stops describing its own vehicle: the Similar Vehicles cards carry other
+# cars' mileage and photos. Whichever of these comes first ends the raw-field scan.
+RELATED_SECTION_MARKERS = ('<!-- Similar Vehicles -->', '<!-- @generated:similar-vehicles -->')
+# Structured data generated from the record itself (vehicle_schema.py) must not feed back into it
+JSON_LD_PATTERN = re.compile(r'<script\b[^>]*application/ld\+json[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+
+
+@dataclass
+class VehicleRecord:
+    """Everything the scripts need to know about one vehicle page."""
+    filename: str
+    source_hash: str
+    title: str = ""
+    description_meta: str = ""
+    vehicle_name: str = ""
+    price: str = ""
+    model_line: str = ""
+    mileage: str = ""
+    spec_mileage: str = ""
+    quick_specs: dict = field(default_factory=dict)
+    description: str = ""
+    main_image: str = ""
+    thumbnails: list = field(default_factory=list)
+    images: list = field(default_factory=list)
+    detailed_specs: list = field(default_factory=list)
+    features: list = field(default_factory=list)
+
+    def template_data(self):
+        """Return the dict shape consumed by standardize_to_subaru.apply_template."""
+        return {
+            'title': self.title,
+            'description_meta': self.description_meta,
+            'vehicle_name': self.vehicle_name,
+            'price': self.price,
+            'model_line': self.model_line,
+            'quick_specs': dict(self.quick_specs),
+            'description': self.description,
+            'main_image': self.main_image,
+            'thumbnails': list(self.thumbnails),
+            'detailed_specs': [tuple(row) for row in self.detailed_specs],
+            'features': list(self.features),
+        }
+
+    @classmethod
+    def from_dict(cls, raw):
+        record = cls(**raw)
+        record.detailed_specs = [tuple(row) for row in record.detailed_specs]
+        return record
+
+
+def get_vehicle_files(root=SITE_ROOT):
+    """All vehicle detail pages in the site root, in a stable order."""
+    return sorted(f for f in os.listdir(root) if f.startswith('vehicle-') and f.endswith('.html'))
+
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def _text(tag):
+    return tag.get_text(strip=True) if tag else ""
+
+
+def _name_from_filename(filename):
+    return filename.replace('vehicle-', '').replace('.html', '').replace('-', ' ').title()
+
+
+def parse_vehicle_page(html_content, filename, backend=None):
+    """Parse a vehicle page into the template data dict using the given (or default) parser backend."""
+    backend = backend or parser_backend.get_backend()
+    if backend == 'selectolax':
+        return _parse_with_selectolax(html_content, filename)
+    return _parse_with_soup(BeautifulSoup(html_content, backend), filename)
+
+
+def _parse_with_soup(soup, filename):
+    data = {}
+
+    # 1. Title and Meta
+    data['title'] = str(soup.title.string) if soup.title and soup.title.string else ""
+    desc_meta = soup.find('meta', attrs={'name': 'description'})
+    data['description_meta'] = desc_meta.get('content', "") if desc_meta else ""
+
+    # 2. Vehicle Name and Price
+    h1 = soup.find('h1')
+    data['vehicle_name'] = h1.get_text(strip=True) if h1 else _name_from_filename(filename)
+
+    price_div = soup.find('div', string=re.compile(r'\$|ZMW|USD', re.IGNORECASE))
+    if not price_div:
+        # Try a more broad search for price-like patterns
+        price_text = soup.find(string=re.compile(r'(\$\s?[\d,]+|ZMW\s?[\d,]+|USD\s?[\d,]+)'))
+        data['price'] = price_text.strip() if price_text else "Price on Request"
+    else:
+        data['price'] = price_div.get_text(strip=True)
+
+    # Model/Spec line (e.g., "2019 Model • Premium AWD SUV")
+    data['model_line'] = _text(soup.find('p', class_='text-lg text-gray-600 mb-4'))
+
+    # 3. Quick Specs (Year, Engine, Transmission, Seats, Doors, Fuel)
+    specs = {}
+    for card in soup.find_all('div', class_='bg-gray-50 p-4 rounded-xl text-center'):
+        label = card.find('p', class_='text-sm text-gray-600')
+        value = card.find('p', class_='font-bold text-navy')
+        if label and value:
+            specs[label.get_text(strip=True)] = value.get_text(strip=True)
+    data['quick_specs'] = specs
+
+    # 4. Description
+    desc_title = soup.find('h3', string=re.compile(r'Description', re.IGNORECASE))
+    data['description'] = _text(desc_title.find_next('p')) if desc_title else ""
+
+    # 5. Images
+    main_img = soup.find('img', class_='main-vehicle-image')
+    data['main_image'] = main_img['src'] if main_img and main_img.has_attr('src') else ""
+    data['thumbnails'] = [img['src'] for img in soup.find_all('img', class_='thumbnail-image') if img.has_attr('src')]
+
+    # 6. Detailed Specs (Tab 1)
+    spec_rows = []
+    spec_tab = soup.find('div', id='specifications-tab')
+    if spec_tab:
+        for row in spec_tab.find_all('div', class_='flex justify-between spec-row p-3 rounded-lg'):
+            label = row.find('span', class_='text-gray-600')
+            value = row.find('span', class_='font-semibold text-navy')
+            if label and value:
+                spec_rows.append((label.get_text(strip=True), value.get_text(strip=True)))
+    data['detailed_specs'] = spec_rows
+
+    # 7. Features (Tab 2)
+    features_tab = soup.find('div', id='features-tab')
+    data['features'] = [_text(item) for item in features_tab.find_all('span', class_='text-gray-700')] if features_tab else []
+
+    return data
+
+
+# selectolax has no BeautifulSoup tree, so the lookups above are mirrored here with
+# the same matching rules (bs4's .string, multi-valued class and find_next semantics).
+# tests/test_parser_backends.py verifies both produce identical data on every page.
+
+def _sx_string(node):
+    """Equivalent of bs4 Tag.string: follow single-child chains down to one text node."""
+    while True:
+        children = list(node.iter(include_text=True))
+        if len(children) != 1:
+            return None
+        node = children[0]
+        if node.is_text_node:
+            return node.text(deep=False)
+        if node.is_comment_node:
+            return node.comment_content
+
+
+def _sx_has_class(node, wanted):
+    classes = (node.attributes.get('class') or '').split()
+    return wanted in classes or wanted == ' '.join(classes)
+
+
+def _sx_text(node):
+    return node.text(deep=True, separator='', strip=True) if node is not None else ""
+
+
+def _sx_find(nodes, tag, cls=None, predicate=None):
+    for node in nodes:
+        if node.tag == tag and (cls is None or _sx_has_class(node, cls)) and (predicate is None or predicate(node)):
+            return node
+    return None
+
+
+def _sx_find_all(nodes, tag, cls):
+    return [node for node in nodes if node.tag == tag and _sx_has_class(node, cls)]
+
+
+def _sx_descendants(node):
+    return [n for n in node.traverse() if n.mem_id != node.mem_id]
+
+
+def _sx_matches_string(pattern):
+    def predicate(node):
+        string = _sx_string(node)
+        return string is not None and pattern.search(string) is not None
+    return predicate
+
+
+def _parse_with_selectolax(html_content, filename):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html_content)
+    nodes = list(tree.root.traverse()) if tree.root is not None else []
+    data = {}
+
+    # 1. Title and Meta
+    title = _sx_find(nodes, 'title')
+    title_string = _sx_string(title) if title is not None else None
+    data['title'] = title_string or ""
+    desc_meta = _sx_find(nodes, 'meta', predicate=lambda n: n.attributes.get('name') == 'description')
+    data['description_meta'] = (desc_meta.attributes.get('content') or "") if desc_meta is not None else ""
+
+    # 2. Vehicle Name and Price
+    h1 = _sx_find(nodes, 'h1')
+    data['vehicle_name'] = _sx_text(h1) if h1 is not None else _name_from_filename(filename)
+
+    price_div = _sx_find(nodes, 'div', predicate=_sx_matches_string(re.compile(r'\$|ZMW|USD', re.IGNORECASE)))
+    if price_div is None:
+        price_pattern = re.compile(r'(\$\s?[\d,]+|ZMW\s?[\d,]+|USD\s?[\d,]+)')
+        price_text = None
+        for node in tree.root.traverse(include_text=True):
+            if node.is_text_node:
+                text = node.text(deep=False)
+            elif node.is_comment_node:
+                text = node.comment_content
+            else:
+                continue
+            if text and price_pattern.search(text):
+                price_text = text
+                break
+        data['price'] = price_text.strip() if price_text else "Price on Request"
+    else:
+        data['price'] = _sx_text(price_div)
+
+    data['model_line'] = _sx_text(_sx_find(nodes, 'p', 'text-lg text-gray-600 mb-4'))
+
+    # 3. Quick Specs
+    specs = {}
+    for card in _sx_find_all(nodes, 'div', 'bg-gray-50 p-4 rounded-xl text-center'):
+        inner = _sx_descendants(card)
+        label = _sx_find(inner, 'p', 'text-sm text-gray-600')
+        value = _sx_find(inner, 'p', 'font-bold text-navy')
+        if label is not None and value is not None:
+            specs[_sx_text(label)] = _sx_text(value)
+    data['quick_specs'] = specs
+
+    # 4. Description (first <p> after the heading, in document order)
+    description = ""
+    for i, node in enumerate(nodes):
+        if node.tag == 'h3' and _sx_matches_string(re.compile(r'Description', re.IGNORECASE))(node):
+            description = _sx_text(_sx_find(nodes[i + 1:], 'p'))
+            break
+    data['description'] = description
+
+    # 5. Images
+    main_img = _sx_find(nodes, 'img', 'main-vehicle-image')
+    data['main_image'] = (main_img.attributes.get('src') or "") if main_img is not None and 'src' in main_img.attributes else ""
+    data['thumbnails'] = [img.attributes.get('src') or "" for img in _sx_find_all(nodes, 'img', 'thumbnail-image')
+                          if 'src' in img.attributes]
+
+    # 6. Detailed Specs (Tab 1)
+    spec_rows = []
+    spec_tab = _sx_find(nodes, 'div', predicate=lambda n: n.attributes.get('id') == 'specifications-tab')
+    if spec_tab is not None:
+        for row in _sx_find_all(_sx_descendants(spec_tab), 'div', 'flex justify-between spec-row p-3 rounded-lg'):
+            inner = _sx_descendants(row)
+            label = _sx_find(inner, 'span', 'text-gray-600')
+            value = _sx_find(inner, 'span', 'font-semibold text-navy')
+            if label is not None and value is not None:
+                spec_rows.append((_sx_text(label), _sx_text(value)))
+    data['detailed_specs'] = spec_rows
+
+    # 7. Features (Tab 2)
+    features_tab = _sx_find(nodes, 'div', predicate=lambda n: n.attributes.get('id') == 'features-tab')
+    data['features'] = ([_sx_text(item) for item in _sx_find_all(_sx_descendants(features_tab), 'span', 'text-gray-700')]
+                        if features_tab is not None else [])
+
+    return data
+
+
+def own_content(html_content):
+    """The part of a page about its own vehicle: up to the related-vehicle cards, without JSON-LD."""
+    ends = [i for i in (html_content.find(marker) for marker in RELATED_SECTION_MARKERS) if i != -1]
+    return JSON_LD_PATTERN.sub('', html_content[:min(ends)] if ends else html_content)
+
+
+def build_record(html_content, filename):
+    """Parse a page into a VehicleRecord."""
+    # The page's related cards and generated JSON-LD are left out of every field, so they
+    # cannot lend it another car's data or feed the record's own output back into it
+    own = own_content(html_content)
+    data = parse_vehicle_page(own, filename)
+
+    mileage = spec_mileage = ""
+    images = {}
+    for match in RAW_FIELDS_PATTERN.finditer(own):
+        if match.lastgroup == 'image':
+            images.setdefault(match.group('image'), None)
+            continue
+        spec_mileage = spec_mileage or (match.group('spec_mileage') or "")
+        mileage = mileage or match.group(match.lastgroup)
+
+    return VehicleRecord(
+        filename=filename,
+        source_hash=content_hash(html_content),
+        mileage=mileage,
+        spec_mileage=spec_mileage,
+        images=list(images),
+        **data,
+    )
+
+
+def _read_catalog(catalog_path):
+    try:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if raw.get('version') != CATALOG_VERSION:
+        return {}
+    return {name: VehicleRecord.from_dict(rec) for name, rec in raw.get('vehicles', {}).items()}
+
+
+def save_catalog(records, root=SITE_ROOT):
+    catalog_path = Path(root) / CATALOG_FILE
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'version': CATALOG_VERSION,
+        'vehicles': {name: asdict(records[name]) for name in sorted(records)},
+    }
+    tmp_path = catalog_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, catalog_path)
+
+
+def _parse_file(path, name):
+    # Decode the raw bytes (no newline translation) so source_hash matches the file on disk
+    with open(path, 'rb') as f:
+        return build_record(f.read().decode('utf-8'), name)
+
+
+def load_catalog(root=SITE_ROOT, files=None, jobs=1):
+    """
+    Return {filename: VehicleRecord} for the given pages (default: all vehicle pages).
+    Cached records are reused when the page's content hash is unchanged; only new or
+    edited pages are parsed (across `jobs` processes when jobs > 1), and the catalog
+    file is rewritten if anything changed.
+    """
+    root = Path(root)
+    cached = _read_catalog(root / CATALOG_FILE)
+    names = get_vehicle_files(root) if files is None else list(files)
+
+    records = {}
+    stale = []
+    for name in names:
+        path = root / name
+        if not path.exists():
+            continue
+        with open(path, 'rb') as f:
+            page_hash = content_hash(f.read())
+        record = cached.get(name)
+        if record is None or record.source_hash != page_hash:
+            stale.append(name)
+        else:
+            records[name] = record
+
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parsed = pool.map(_parse_file, [root / name for name in stale], stale)
+            records.update(zip(stale, parsed))
+    else:
+        for name in stale:
+            records[name] = _parse_file(root / name, name)
+
+    records = {name: records[name] for name in names if name in records}
+    if stale or (files is None and set(cached) != set(records)):
+        save_catalog(records if files is None else {**cached, **records}, root)
+    return records
+
+
+def main():
+    records = load_catalog()
+    print(f"Catalogued {len(records)} vehicle pages in {CATALOG_FILE}")
+    for name, record in records.items():
+        print(f"  {name}: {record.vehicle_name} | {record.price} | {len(record.images)} images")
+
+
+if __name__ == "__main__":
+    main()
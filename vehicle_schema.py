@@ -0,0 +1,293 @@
+"""
+Schema.org Vehicle + Offer structured data for the vehicle pages.
+Builds one JSON-LD block per page from its catalog record, merged with its
+inventory-listing.json entry when it has one:
+  name          the page <title> up to " - " or " | "
+  modelDate     the Year quick spec, else the year in "2014 Model ..." or the title
+  brand/model   when the name starts with a known make
+  images        the gallery's main image and thumbnails; pages in an older layout
+                without that gallery use the vehicle images in their own content
+  mileage       kilometres as a QuantitativeValue (unitCode KMT), only from the
+                page's own spec data: its labelled Mileage, else a "<n> km" model line
+  engine        displacement in cc (unitCode CMQ) when the Engine spec states it
+  transmission, fuel
+                Automatic/Manual/CVT and Petrol/Diesel/Hybrid/Electric, named from the
+                quick specs ("6-Speed Manual" -> Manual); left out when the slot holds
+                anything else
+  offers        the first price on the page, normalized to a number with ZMW or USD,
+                InStock/SoldOut, and a per-day LeaseOut offer for hire vehicles
+
+Every block is validated before it is written. A missing or malformed required
+field (REQUIRED_FIELDS), or a malformed optional one, fails the page: this
+script then exits 1, and standardize_to_subaru.py reports the page as failed
+instead of writing it.
+
+The block goes before </head> as <script type="application/ld+json" data-schema="vehicle">,
+replacing any earlier vehicle block, including hand-written Product or Car
+JSON-LD. Other JSON-LD on the page is left alone.
+
+Usage:
+  python vehicle_schema.py            # write the JSON-LD into every vehicle page
+  python vehicle_schema.py --check    # validate only; exit 1 if any page fails
+"""
+
+import argparse
+import datetime
+import json
+import re
+import sys
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import build_sitemap
+import generate_inventory
+import similar_vehicles
+import vehicle_catalog
+from page_writer import PageWriter
+
+SELLER = {'@type': 'AutoDealer', 'name': "Zamto Africa Company Ltd"}
+
+# Makes recognised at the start of a vehicle name, longest first where one prefixes another
+KNOWN_BRANDS = ('Mercedes-Benz', 'Mercedes Benz', 'Land Rover', 'Toyota', 'Lexus', 'Honda', 'Nissan', 'Mazda',
+                'Mitsubishi', 'Subaru', 'BMW', 'Isuzu', 'Haojue', 'Suzuki', 'Volkswagen', 'Ford', 'Hyundai', 'Kia')
+BRAND_NAMES = {'Mercedes Benz': 'Mercedes-Benz'}
+CURRENCIES = ('ZMW', 'USD')
+AVAILABILITY = {'sale': "https://schema.org/InStock", 'hire': "https://schema.org/InStock",
+                'sold': "https://schema.org/SoldOut"}
+LEASE_OUT = "http://purl.org/goodrelations/v1#LeaseOut"
+# inventory body type -> schema.org bodyType (the inventory's category labels are plural)
+BODY_TYPE_NAMES = {'HATCHBACKS': "Hatchback", 'SEDANS': "Sedan", 'SUV': "SUV", 'PICKUP TRUCKS': "Pickup truck",
+                   'VANS & MPVS': "Van"}
+
+# field path -> description, checked on every block
+REQUIRED_FIELDS = {
+    'name': "vehicle name",
+    'url': "absolute page URL",
+    'image': "at least one absolute image URL",
+    'vehicleModelDate': "four-digit model year",
+    'offers.price': "positive price",
+    'offers.priceCurrency': "ZMW or USD",
+    'offers.availability': "schema.org availability",
+}
+EARLIEST_MODEL_YEAR = 1950
+# field -> the quick-spec terms it may hold
+SPEC_TERMS = {'vehicleTransmission': generate_inventory.TRANSMISSIONS, 'fuelType': generate_inventory.FUEL_TYPES}
+
+SCHEMA_SCRIPT_PATTERN = re.compile(r'[ \t]*<script\b[^>]*application/ld\+json[^>]*>(.*?)</script>[ \t]*\n?',
+                                   re.DOTALL | re.IGNORECASE)
+VEHICLE_TYPES = ('Vehicle', 'Car', 'Product', 'Motorcycle')
+TITLE_SPLIT_PATTERN = re.compile(r'\s+[-|]\s+')
+YEAR_PATTERN = re.compile(r'\b(19[5-9]\d|20\d\d)\b')
+# "2014 Model • 68,000 km"
+MODEL_LINE_MILEAGE_PATTERN = re.compile(r'\b(\d[\d,]*)\s*km\b', re.IGNORECASE)
+
+SITE_ROOT = Path(__file__).parent
+
+
+def vehicle_name(record):
+    """The name from the page title ("BMW X1 2011 - Zamto Africa | ..." -> "BMW X1 2011")."""
+    return TITLE_SPLIT_PATTERN.split(record.title.strip())[0].strip() if record.title else ""
+
+
+def model_year(record, name):
+    for text in (record.quick_specs.get('Year', ''), record.model_line, name):
+        match = YEAR_PATTERN.search(text or "")
+        if match:
+            return match.group(1)
+    return None
+
+
+def brand_and_model(name):
+    """(brand, model) when the name starts with a known make ("2016 Lexus LX570 Black" -> Lexus, "LX570 Black")."""
+    words = ' '.join(YEAR_PATTERN.sub('', name).split())
+    for brand in KNOWN_BRANDS:
+        if words.lower().startswith(brand.lower() + ' '):
+            return BRAND_NAMES.get(brand, brand), words[len(brand):].strip()
+    return None, None
+
+
+def odometer(record):
+    """Kilometres from the page's labelled Mileage spec, else from its model line; None when neither states it."""
+    if record.spec_mileage:
+        return generate_inventory._leading_int(record.spec_mileage)
+    match = MODEL_LINE_MILEAGE_PATTERN.search(record.model_line or "")
+    return generate_inventory._leading_int(match.group(1)) if match else None
+
+
+def images(record):
+    """The gallery's images, or the vehicle images in the page's own content when it has no gallery."""
+    gallery = [src for src in dict.fromkeys([record.main_image] + record.thumbnails) if src]
+    return gallery or list(record.images)
+
+
+def absolute_url(base_url, path):
+    # Some pages already percent-encode their image paths ("2016%20TOYOTA..."); encode each path exactly once
+    return path if re.match(r'https?://', path) else f"{base_url}/{quote(unquote(path.lstrip('/')))}"
+
+
+def vehicle_json_ld(record, vehicle, base_url):
+    """The JSON-LD dict for one page. `vehicle` is its generate_inventory.build_vehicle() dict."""
+    name = vehicle_name(record)
+    year = model_year(record, name)
+    brand, model = brand_and_model(name)
+    currency, amount = generate_inventory.parse_price(vehicle['price'])
+    status = generate_inventory._status(vehicle)
+    page_url = absolute_url(base_url, build_sitemap.page_path(record.filename))
+
+    offer = {'@type': 'Offer', 'url': page_url,
+             'price': str(amount) if amount is not None else None, 'priceCurrency': currency,
+             'availability': AVAILABILITY[status], 'seller': dict(SELLER, url=base_url + "/")}
+    if vehicle['listing'] == 'hire':
+        offer['businessFunction'] = LEASE_OUT
+        offer['priceSpecification'] = {'@type': 'UnitPriceSpecification', 'price': offer['price'],
+                                       'priceCurrency': currency, 'unitCode': 'DAY'}
+
+    data = {'@context': "https://schema.org", '@type': 'Vehicle', 'name': name, 'url': page_url,
+            'description': record.description_meta or record.description or None,
+            'image': [absolute_url(base_url, src) for src in images(record)],
+            'vehicleModelDate': year}
+    if brand:
+        data['brand'] = {'@type': 'Brand', 'name': brand}
+        if model:
+            data['model'] = model
+    if vehicle['body_type'] in BODY_TYPE_NAMES:
+        data['bodyType'] = BODY_TYPE_NAMES[vehicle['body_type']]
+    # Not record.mileage: that is the first "<n> km" anywhere in the page's text
+    mileage = odometer(record)
+    if mileage is not None:
+        data['mileageFromOdometer'] = {'@type': 'QuantitativeValue', 'value': mileage, 'unitCode': 'KMT'}
+    engine = similar_vehicles.engine_cc(vehicle['engine'])
+    if engine:
+        data['vehicleEngine'] = {'@type': 'EngineSpecification', 'engineDisplacement': {
+            '@type': 'QuantitativeValue', 'value': int(engine), 'unitCode': 'CMQ'}}
+    for key, spec in (('vehicleTransmission', 'transmission'), ('fuelType', 'fuel')):
+        term = generate_inventory.spec_term(vehicle[spec], SPEC_TERMS[key])
+        if term:
+            data[key] = term
+    for key, spec in (('seatingCapacity', 'seats'), ('numberOfDoors', 'doors')):
+        count = generate_inventory._leading_int(vehicle[spec])
+        if count:
+            data[key] = count
+    data['offers'] = offer
+    return {key: value for key, value in data.items() if value is not None or key in REQUIRED_FIELDS}
+
+
+def _field(data, path):
+    for key in path.split('.'):
+        data = data.get(key) if isinstance(data, dict) else None
+    return data
+
+
+def validate(data, today=None):
+    """List of problems with a JSON-LD dict; empty when it is valid."""
+    latest_year = (today or datetime.date.today()).year + 1
+    problems = [f"missing {path} ({description})" for path, description in REQUIRED_FIELDS.items()
+                if _field(data, path) in (None, "", [])]
+
+    def check(condition, message):
+        if not condition:
+            problems.append(message)
+
+    if data.get('url'):
+        check(data['url'].startswith('https://'), f"url is not absolute: {data['url']}")
+    for image in data.get('image') or []:
+        check(image.startswith('https://'), f"image is not absolute: {image}")
+    year = data.get('vehicleModelDate')
+    if year:
+        check(re.fullmatch(r'\d{4}', year) and EARLIEST_MODEL_YEAR <= int(year) <= latest_year,
+              f"vehicleModelDate {year!r} is not a model year")
+    offer = data.get('offers') or {}
+    if offer.get('price'):
+        check(re.fullmatch(r'\d+(\.\d+)?', offer['price']) and float(offer['price']) > 0,
+              f"offers.price {offer['price']!r} is not a positive number")
+    if offer.get('priceCurrency'):
+        check(offer['priceCurrency'] in CURRENCIES, f"offers.priceCurrency {offer['priceCurrency']!r}")
+    if offer.get('availability'):
+        check(offer['availability'] in AVAILABILITY.values(), f"offers.availability {offer['availability']!r}")
+    if 'brand' in data:
+        check(bool(_field(data, 'brand.name')), "brand without a name")
+    mileage = _field(data, 'mileageFromOdometer.value')
+    if 'mileageFromOdometer' in data:
+        check(isinstance(mileage, int) and mileage >= 0, f"mileageFromOdometer {mileage!r} is not a distance")
+    for key, terms in SPEC_TERMS.items():
+        if key in data:
+            names = ', '.join(dict.fromkeys(terms.values()))
+            check(data[key] in terms.values(), f"{key} {data[key]!r} is not one of {names}")
+    for key in ('seatingCapacity', 'numberOfDoors'):
+        if key in data:
+            check(isinstance(data[key], int) and 0 < data[key] < 100, f"{key} {data[key]!r}")
+    return problems
+
+
+def render_script(data):
+    # "</" inside a string would end the <script> element early
+    body = json.dumps(data, indent=2, ensure_ascii=False).replace('</', '<\\/')
+    return f'<script type="application/ld+json" data-schema="vehicle">\n{body}\n</script>'
+
+
+def _is_vehicle_block(match):
+    try:
+        data = json.loads(match.group(1))
+    except ValueError:
+        return False
+    types = data.get('@type') if isinstance(data, dict) else None
+    types = types if isinstance(types, list) else [types]
+    return any(t in VEHICLE_TYPES for t in types)
+
+
+def inject_schema(page_html, script):
+    """`page_html` with its vehicle JSON-LD replaced by `script`, placed at the end of <head>."""
+    page_html = SCHEMA_SCRIPT_PATTERN.sub(lambda m: '' if _is_vehicle_block(m) else m.group(0), page_html)
+    head_end = page_html.find('</head>')
+    if head_end == -1:
+        return page_html
+    return page_html[:head_end] + script + "\n" + page_html[head_end:]
+
+
+def load_vehicles(root=SITE_ROOT, catalog=None):
+    """{page: (catalog record, build_vehicle dict)} for every vehicle page, or every page in `catalog`."""
+    root = Path(root)
+    catalog = catalog if catalog is not None else vehicle_catalog.load_catalog(root)
+    listing = generate_inventory.load_listing(root / generate_inventory.LISTING_FILE)
+    listed = {entry['page']: entry for entry in listing if entry.get('page') in catalog}
+    return {page: (record, generate_inventory.build_vehicle(
+                listed.get(page, {'page': page, 'name': vehicle_name(record), 'body_type': ''}), catalog))
+            for page, record in sorted(catalog.items())}
+
+
+def build_scripts(root=SITE_ROOT, catalog=None):
+    """({page: rendered <script>}, {page: [problems]}) for every vehicle page; failed pages get no script."""
+    base_url = build_sitemap.site_url(root)
+    scripts, failures = {}, {}
+    for page, (record, vehicle) in load_vehicles(root, catalog).items():
+        data = vehicle_json_ld(record, vehicle, base_url)
+        problems = validate(data)
+        if problems:
+            failures[page] = problems
+        else:
+            scripts[page] = render_script(data)
+    return scripts, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write schema.org Vehicle/Offer JSON-LD into the vehicle pages.")
+    parser.add_argument('--check', action='store_true', help="validate only; exit 1 if any page fails")
+    args = parser.parse_args(argv)
+
+    scripts, failures = build_scripts(SITE_ROOT)
+    if not args.check:
+        with PageWriter(SITE_ROOT) as writer:
+            for page, script in scripts.items():
+                page_html = (SITE_ROOT / page).read_text(encoding='utf-8')
+                writer.write(page, inject_schema(page_html, script))
+        print(f"Vehicle JSON-LD: {len(scripts)} pages valid, {len(writer.written)} written")
+    else:
+        print(f"Vehicle JSON-LD: {len(scripts)} pages valid")
+    for page, problems in sorted(failures.items()):
+        print(f"  [INVALID] {page}: {'; '.join(problems)}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
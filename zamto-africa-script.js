@@ -1,4 +1,7 @@
 // ===== Zamto Africa Clone JavaScript =====
+// No page loads this file, so it is neither deployed nor precached (minify_site.py,
+// build_service_worker.py). A page that loads it must load vehicle-search.js first:
+// the vehicle data and the search index (queryIndex) come from there
 
 // ===== DOM Content Loaded =====
 document.addEventListener('DOMContentLoaded', function() {
@@ -12,10 +15,14 @@ function initializeAdvancedFiltering() {
     const typeSelect = filterForm.querySelectorAll('select')[1];
     const searchInput = filterForm.querySelector('input[type="text"]');
     
-    // Add filter event listeners
-    [categorySelect, typeSelect, searchInput].forEach(element => {
+    // Add filter event listeners (typing is debounced; the index lookup runs once per pause)
+    [categorySelect, typeSelect].forEach(element => {
         element.addEventListener('change', applyFilters);
-        element.addEventListener('input', applyFilters);
+    });
+    let searchTimeout;
+    searchInput.addEventListener('input', () => {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(applyFilters, 150);
     });
     
     // Add price range slider
@@ -26,22 +33,35 @@ function initializeAdvancedFiltering() {
 }
 
 function applyFilters() {
-    const searchQuery = document.querySelector('.search-form input[type="text"]').value.toLowerCase();
+    const searchQuery = document.querySelector('.search-form input[type="text"]').value;
     const category = document.querySelector('.search-form select').value;
     const type = document.querySelector('.search-form select:nth-child(2)').value;
     
-    let filteredVehicles = vehicleData.filter(vehicle => {
-        const matchesSearch = vehicle.name.toLowerCase().includes(searchQuery);
-        const matchesCategory = !category || category === 'All Categories' || vehicle.category === category;
-        const matchesType = !type || type === 'All Types' || vehicle.type === type;
-        
-        return matchesSearch && matchesCategory && matchesType;
-    });
+    const filteredVehicles = queryIndex({
+        query: searchQuery,
+        category: category,
+        type: type,
+        ...readRangeFilters()
+    }).map(row => vehicleData[row]);
     
     displayFilteredVehicles(filteredVehicles);
     updateVehicleCount(filteredVehicles.length);
 }
 
+// Bounds from the price/year range controls; a slider at its end (or an empty select) is no bound
+function readRangeFilters() {
+    const bounds = { minYear: null, maxYear: null, minPrice: null, maxPrice: null };
+    const minPrice = document.getElementById('minPrice');
+    const maxPrice = document.getElementById('maxPrice');
+    const minYear = document.getElementById('minYear');
+    const maxYear = document.getElementById('maxYear');
+    if (minPrice && parseInt(minPrice.value) > parseInt(minPrice.min)) bounds.minPrice = parseInt(minPrice.value);
+    if (maxPrice && parseInt(maxPrice.value) < parseInt(maxPrice.max)) bounds.maxPrice = parseInt(maxPrice.value);
+    if (minYear && minYear.value) bounds.minYear = parseInt(minYear.value);
+    if (maxYear && maxYear.value) bounds.maxYear = parseInt(maxYear.value);
+    return bounds;
+}
+
 function displayFilteredVehicles(vehicles) {
     const vehiclesGrid = document.querySelector('.vehicles-grid');
     vehiclesGrid.innerHTML = '';
@@ -716,6 +736,7 @@ function addEnhancedStyles() {
 
 // ===== Update Initialize App =====
 function initializeApp() {
+    loadVehicleData();
     initializeNavigation();
     initializeForms();
     initializeScrollEffects();
@@ -1037,116 +1058,6 @@ function showNotification(message, type = 'info') {
     }, 3000);
 }
 
-// ===== Vehicle Data (for future enhancement) =====
-const vehicleData = [
-    {
-        id: 1,
-        name: 'BMW 320i',
-        category: 'SMALL CARS',
-        type: 'hire',
-        year: 2011,
-        fuel: 'Petrol',
-        transmission: 'Automatic',
-        seats: 5,
-        doors: 4,
-        price: 'ZMW 2,500',
-        note: 'Includes driver & insurance'
-    },
-    {
-        id: 2,
-        name: 'BMW X1',
-        category: 'SMALL CARS',
-        type: 'sale',
-        year: 2011,
-        fuel: 'Petrol',
-        transmission: 'Automatic',
-        seats: 5,
-        doors: 5,
-        price: 'ZMW 200,000',
-        note: 'Inclusive of documentation'
-    },
-    {
-        id: 3,
-        name: 'HONDA FIT',
-        category: 'SMALL CARS',
-        type: 'sale',
-        year: 2013,
-        mileage: '131,410 km',
-        fuel: 'Petrol',
-        transmission: 'Automatic',
-        seats: 5,
-        doors: 4,
-        price: 'C&F USD 3,358 UPTO DAR PORT',
-        note: 'Inclusive of documentation'
-    },
-    {
-        id: 4,
-        name: 'Isuzu mux',
-        category: 'SUV',
-        type: 'hire',
-        year: 2018,
-        fuel: 'Petrol',
-        transmission: 'Automatic',
-        seats: 5,
-        doors: 4,
-        price: 'ZMW 2,500',
-        note: 'Includes driver & insurance'
-    },
-    {
-        id: 5,
-        name: 'Isuzu Van',
-        category: 'PICKUP TRUCKS',
-        type: 'sale',
-        year: 2018,
-        mileage: '321866 km',
-        fuel: 'Diesel',
-        transmission: 'Manual',
-        seats: 5,
-        doors: 4,
-        price: 'USD 15800 - ZMW 350000',
-        note: 'Inclusive of documentation'
-    },
-    {
-        id: 6,
-        name: 'Lexus RX 300t F-Sport (AGL20W)',
-        category: 'SUV',
-        type: 'sale',
-        year: 2020,
-        mileage: '41,000 km',
-        fuel: 'Petrol',
-        transmission: 'Automatic',
-        seats: 5,
-        doors: 4,
-        price: 'ZMW 895,000',
-        note: 'Inclusive of documentation'
-    }
-];
-
-// ===== Search Functionality =====
-function searchVehicles(query, category, type) {
-    let filteredVehicles = vehicleData;
-    
-    if (query) {
-        filteredVehicles = filteredVehicles.filter(vehicle => 
-            vehicle.name.toLowerCase().includes(query.toLowerCase())
-        );
-    }
-    
-    if (category && category !== 'All Categories') {
-        filteredVehicles = filteredVehicles.filter(vehicle => 
-            vehicle.category === category
-        );
-    }
-    
-    if (type && type !== 'All Types') {
-        filteredVehicles = filteredVehicles.filter(vehicle => 
-            vehicle.type === type
-        );
-    }
-    
-    return filteredVehicles;
-}
-
 // ===== WhatsApp Integration =====
 function openWhatsApp(message) {
     const phoneNumber = '260572213038';